@@ -0,0 +1,94 @@
+"""
+패키지 import 시간 벤치마크 (시작 시간 예산 검사)
+시나리오마다 새 인터프리터에서 import 시간을 재고, 예산을 넘거나 불러오면 안 되는 무거운 모듈이 올라오면 실패(exit 1)
+
+실행 : python -m benchmarks.bench_import
+       python -m benchmarks.bench_import --profile   (시나리오별 -X importtime 누적 상위 모듈 출력)
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+# 무거운 의존성 : 처음 사용할 때만 import 되어야 함
+HEAVY_MODULES = ('pm4py', 'google.cloud.bigquery', 'plotly', 'pyvis', 'networkx', 'sklearn', 'matplotlib')
+
+# (이름, 실행할 import 문, 예산(초, 인터프리터 시작 시간 제외), 불러오면 안 되는 모듈)
+SCENARIOS = [
+    ('import mining', 'import mining', 0.05, HEAVY_MODULES + ('pandas',)),
+    ('import clustering', 'import clustering', 0.05, HEAVY_MODULES + ('pandas', 'scipy')),
+    ('csv job', 'from mining import one_step_EDA_from_csv, ProcessEDA', 1.5, HEAVY_MODULES),
+    ('clustering job', 'from clustering import ClusteredTraces, sweep_clusters, clara', 2.0, HEAVY_MODULES),
+]
+
+
+def _run(statement, repeat):
+    """새 인터프리터에서 statement 실행 시간 (repeat회 중앙값)"""
+    elapsed = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed.append(time.perf_counter() - started)
+    return statistics.median(elapsed)
+
+
+def _loaded(statement, modules):
+    """statement 실행 후 sys.modules에 올라온 모듈 중 modules에 해당하는 것"""
+    check = f"{statement}\nimport sys\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', check], check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def _importtime(statement, top=10):
+    """-X importtime 누적 시간 상위 모듈 (초, 모듈명)"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        rows.append((int(cumulative) / 1e6, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def bench(repeat=5, profile=False):
+    """
+    Returns:
+        list: 시나리오별 (이름, 시간, 예산, 불러온 무거운 모듈, 통과 여부)
+    """
+    startup = _run('pass', repeat)
+    print(f"interpreter startup : {startup * 1e3:7.1f} ms (아래 시간에서 제외)")
+
+    results = []
+    for name, statement, budget, forbidden in SCENARIOS:
+        seconds = max(_run(statement, repeat) - startup, 0.0)
+        loaded = _loaded(statement, forbidden)
+        passed = seconds <= budget and not loaded
+
+        results.append((name, seconds, budget, loaded, passed))
+        print(f"{'ok  ' if passed else 'FAIL'} {name:<18s} {seconds * 1e3:8.1f} ms  (budget {budget * 1e3:6.0f} ms)"
+              + (f"  loaded: {', '.join(loaded)}" if loaded else ""))
+
+        if profile:
+            for cumulative, module in _importtime(statement):
+                print(f"       {cumulative * 1e3:8.1f} ms  {module}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="패키지 import 시간 예산 검사")
+    parser.add_argument('--repeat', type=int, default=5, help="시나리오별 측정 횟수 (중앙값 사용)")
+    parser.add_argument('--profile', action='store_true', help="-X importtime 상위 모듈 출력")
+    args = parser.parse_args()
+
+    results = bench(repeat=args.repeat, profile=args.profile)
+    sys.exit(0 if all(passed for *_, passed in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Variant 편집 거리 색인(SequenceIndex) 벤치마크
+variant 수를 늘려가며 색인 생성 시간과 질의 1회당 시간(평균 / 중앙값 / 상위 10%)을 측정
+knn은 긴 variant에서 거리 2 밖까지 탐색하므로 평균과 상위 10%가 중앙값보다 크게 나옴 (SequenceIndex.knn 참고)
+
+실행 : python -m benchmarks.bench_index
+"""
+import time
+
+import numpy as np
+
+from clustering.index import SequenceIndex
+
+
+def make_variants(n_variants, n_pitch_types=8, mean_length=5, seed=42):
+    """start/end 사이에 구종 코드가 이어지는 서로 다른 variant n_variants개 생성 (구종 빈도는 치우친 분포)"""
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, n_pitch_types + 1)
+    weights /= weights.sum()
+
+    seen, variants = set(), []
+    while len(variants) < n_variants:
+        pitches = rng.choice(np.arange(2, n_pitch_types + 2), rng.geometric(1 / mean_length), p=weights)
+        variant = (0, *pitches.tolist(), 1)
+        if variant not in seen:
+            seen.add(variant)
+            variants.append(list(variant))
+
+    activities = ['start', 'end'] + [f"P{i}" for i in range(n_pitch_types)]
+    return activities, variants
+
+
+def bench(sizes=(10_000, 100_000), n_queries=300, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+
+    for n_variants in sizes:
+        activities, variants = make_variants(n_variants)
+
+        started = time.perf_counter()
+        index = SequenceIndex(activities, variants)
+        build = time.perf_counter() - started
+
+        queries = [variants[i] for i in rng.integers(0, n_variants, n_queries)]
+        timings = {}
+        for name, query in [('radius_1', lambda q: index.radius(q, 1)),
+                            ('radius_2', lambda q: index.radius(q, 2)),
+                            ('knn_1', lambda q: index.knn(q, 1)),
+                            ('knn_5', lambda q: index.knn(q, 5))]:
+            seconds = []
+            for q in queries:
+                started = time.perf_counter()
+                query(q)
+                seconds.append(time.perf_counter() - started)
+            seconds = np.array(seconds) * 1e3
+            timings[name] = {'mean': seconds.mean(), 'median': np.median(seconds), 'p90': np.percentile(seconds, 90)}
+
+        results.append((n_variants, build, timings))
+        print(f"variants={n_variants:>8,d}  build={build:6.2f} s")
+        for name, ms in timings.items():
+            print(f"  {name:<9s} mean={ms['mean']:7.3f} ms  median={ms['median']:7.3f} ms  p90={ms['p90']:7.3f} ms")
+
+    return results
+
+
+if __name__ == '__main__':
+    bench()
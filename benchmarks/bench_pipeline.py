@@ -0,0 +1,202 @@
+"""
+파이프라인 단계별 벤치마크
+합성 Statcast 데이터(benchmarks.synthetic)로 단계마다 실행 시간과 최대 메모리를 측정하여 JSON으로 저장
+커밋마다 결과 파일을 남기고 --compare로 이전 결과와 비교
+
+단계 : define_at_bat_cases → add_node_and_preprocess → BasedTraces → ProcessEDA → ClusteredTraces
+
+실행 : python -m benchmarks.bench_pipeline
+       python -m benchmarks.bench_pipeline --sizes 10000 100000 --output after.json --compare before.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_statcast
+from clustering import ClusteredTraces
+from mining.exploratory import ProcessEDA
+from mining.preprocessing import add_node_and_preprocess
+from mining.preprocessing import define_at_bat_cases
+from mining.preprocessing import one_way_filter
+from mining.probability import BasedTraces
+
+
+def measure(func, repeat=3, memory=True):
+    """
+    func 실행 시간(repeat회 중 최소/평균)과 최대 메모리
+
+    메모리는 tracemalloc을 켠 별도 1회 실행에서 측정 (tracemalloc 오버헤드가 시간 측정에 섞이지 않음)
+    numpy / pandas 버퍼도 tracemalloc에 잡히므로 단계 안에서 새로 할당한 최대 바이트에 해당
+
+    Returns:
+        tuple: (func 반환값, {'seconds', 'mean_seconds', 'peak_bytes'})
+    """
+    elapsed = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        output = func()
+        elapsed.append(time.perf_counter() - started)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return output, {'seconds': min(elapsed), 'mean_seconds': float(np.mean(elapsed)), 'peak_bytes': peak}
+
+
+def _eda_views(result):
+    """ProcessEDA의 모든 전이 View 계산 (View는 처음 접근할 때 계산되므로 모두 접근)"""
+    eda = ProcessEDA(result)
+    probability, frequency = eda.Transition.Probability, eda.Transition.Frequency
+    return (probability.all_probs, probability.len_probs, probability.layer_probs, probability.len_layer_probs,
+            frequency.all_cnts, frequency.len_cnts)
+
+
+def bench_size(n_pitches, repeat=3, memory=True, n_clusters=8, engine='hierarchical', seed=42):
+    """한 데이터 크기에서 모든 단계 측정 → 단계별 결과 dict list"""
+    df = make_statcast(n_pitches, seed=seed)
+    rows = []
+
+    def record(stage, func):
+        output, stats = measure(func, repeat=repeat, memory=memory)
+        rows.append({'n_pitches': n_pitches, 'rows': len(df), 'stage': stage, **stats})
+        print(f"pitches={n_pitches:>10,d}  {stage:<24s} best={stats['seconds']:9.3f} s"
+              + (f"  peak={stats['peak_bytes'] / 1024 ** 2:9.1f} MiB" if stats['peak_bytes'] is not None else ""))
+        return output
+
+    df_grouped = record('define_at_bat_cases', lambda: define_at_bat_cases(df))
+
+    # preprocessing_df와 같이 pitch_type 결측 케이스는 제외 (측정 대상 아님)
+    missing = df_grouped.loc[df_grouped['pitch_type'].isna(), 'processID'].unique()
+    df_valid = df_grouped[~df_grouped['processID'].isin(missing)]
+    df_added = record('add_node_and_preprocess', lambda: add_node_and_preprocess(df_valid, 'start', 'end'))
+
+    df_filtered = one_way_filter(df_added, 'events', ['strikeout'])
+    result = record('BasedTraces', lambda: BasedTraces(df_filtered)())
+    record('ProcessEDA', lambda: _eda_views(result))
+    clustered = record('ClusteredTraces', lambda: ClusteredTraces(df_filtered, engine=engine)(n_clusters=n_clusters))
+
+    for row in rows:
+        row.update({'n_cases': int(df_filtered['processID'].nunique()), 'n_variants': len(clustered['sequences']),
+                    'engine': engine})
+    return rows
+
+
+def _commit():
+    """현재 git 커밋 (git이 없거나 저장소가 아니면 None)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _default_output(commit):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', f"pipeline-{commit or 'unknown'}.json")
+
+
+def _environment():
+    import scipy
+    import rapidfuzz
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {'numpy': np.__version__, 'pandas': pd.__version__, 'scipy': scipy.__version__,
+                     'rapidfuzz': rapidfuzz.__version__},
+    }
+
+
+def bench(sizes=(10_000, 100_000, 1_000_000), repeat=3, memory=True, n_clusters=8, engine='hierarchical', seed=42,
+          output=None):
+    """
+    모든 크기 × 단계 측정 후 JSON 저장
+
+    Args:
+        output: 결과 JSON 경로 (None이면 benchmarks/results/pipeline-<commit>.json)
+
+    Returns:
+        dict: 저장한 결과 (commit, created, environment, parameters, results)
+    """
+    commit = _commit()
+    report = {
+        'commit': commit,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'parameters': {'sizes': list(sizes), 'repeat': repeat, 'memory': memory, 'n_clusters': n_clusters,
+                       'engine': engine, 'seed': seed},
+        'results': [],
+    }
+    for n_pitches in sizes:
+        report['results'] += bench_size(n_pitches, repeat=repeat, memory=memory, n_clusters=n_clusters,
+                                        engine=engine, seed=seed)
+
+    if output is None:
+        output = _default_output(commit)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"saved : {output}")
+
+    return report
+
+
+def compare(baseline, current):
+    """
+    두 결과 JSON 비교 (같은 n_pitches, stage끼리 현재 / 기준 비율)
+
+    Returns:
+        DataFrame: n_pitches, stage, 기준/현재 시간과 메모리, 비율 (1보다 크면 느려짐/늘어남)
+    """
+    frames = []
+    for path in (baseline, current):
+        with open(path, encoding='utf-8') as f:
+            frames.append(pd.DataFrame(json.load(f)['results'])[['n_pitches', 'stage', 'seconds', 'peak_bytes']])
+
+    merged = frames[0].merge(frames[1], on=['n_pitches', 'stage'], suffixes=('_baseline', '_current'))
+    merged['time_ratio'] = merged['seconds_current'] / merged['seconds_baseline']
+    merged['memory_ratio'] = merged['peak_bytes_current'] / merged['peak_bytes_baseline']
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 시간/메모리 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="투구 수 목록")
+    parser.add_argument('--repeat', type=int, default=3, help="시간 측정 반복 횟수 (최소값 기록)")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 메모리 측정 생략")
+    parser.add_argument('--n-clusters', type=int, default=8)
+    parser.add_argument('--engine', choices=ClusteredTraces.engines, default='hierarchical')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="결과 JSON 경로")
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    report = bench(args.sizes, repeat=args.repeat, memory=not args.no_memory, n_clusters=args.n_clusters,
+                   engine=args.engine, seed=args.seed, output=args.output)
+
+    if args.compare:
+        current = args.output or _default_output(report['commit'])
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(compare(args.compare, current).round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
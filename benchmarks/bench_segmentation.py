@@ -0,0 +1,41 @@
+"""
+케이스 세그먼트(segment_runs) 벤치마크
+행 수를 늘려가며 실행 시간을 측정하여 선형(O(n))으로 증가하는지 확인
+
+실행 : python -m benchmarks.bench_segmentation
+"""
+import time
+
+import numpy as np
+
+from mining.preprocessing import segment_runs
+
+
+def make_case_ids(n_rows, mean_length=4, seed=42):
+    """평균 길이 mean_length인 연속 run으로 구성된 case_id 배열 생성"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.geometric(1 / mean_length, size=n_rows // mean_length + 1)
+    case_ids = np.repeat(np.arange(len(lengths)), lengths)[:n_rows]
+    return case_ids.astype(str)
+
+
+def bench(sizes=(10_000, 100_000, 1_000_000, 5_000_000), repeat=3):
+    results = []
+    for n_rows in sizes:
+        case_ids = make_case_ids(n_rows)
+
+        elapsed = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            segment_runs(case_ids)
+            elapsed.append(time.perf_counter() - started)
+
+        best = min(elapsed)
+        results.append((n_rows, best))
+        print(f"rows={n_rows:>10,d}  best={best * 1e3:9.2f} ms  per_row={best / n_rows * 1e9:7.1f} ns")
+
+    return results
+
+
+if __name__ == '__main__':
+    bench()
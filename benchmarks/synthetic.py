@@ -0,0 +1,235 @@
+"""
+합성 Statcast 투구 데이터 생성 모듈
+load_data_from_bigquery와 같은 컬럼의 투구 단위 DataFrame을 seed로 재현 가능하게 생성 (BigQuery 없이 벤치마크)
+
+- 투수마다 3~5개 구종과 구종 비율 (Dirichlet)
+- 볼카운트를 따라 타석 진행 : ball / strike / foul / 인플레이 → 볼넷, 삼진, 인플레이 결과 (타석 평균 약 3.5구, 삼진 약 24%)
+- 구종별 구속, 투수별 릴리스 포인트, 인플레이 타구의 속도/각도
+- Statcast 테이블처럼 최신 경기가 위, 타석 안에서는 마지막 투구가 위
+
+실행 : python -m benchmarks.synthetic 100000 (행 수와 컬럼별 요약 출력)
+"""
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ['game_date', 'game_pk', 'at_bat_number', 'pitch_number', 'inning', 'pitcher', 'batter', 'stand', 'p_throws',
+           'outs_when_up', 'on_1b', 'on_2b', 'on_3b', 'balls', 'strikes', 'type',
+           'hit_location', 'launch_speed', 'launch_angle', 'babip_value',
+           'pitch_type', 'release_speed', 'release_pos_x', 'release_pos_z', 'release_pos_y',
+           'plate_x', 'plate_z', 'description', 'events']
+
+SEASON_DAYS = 183
+
+# 구종 : (평균 구속, 리그 사용 빈도)
+PITCH_TYPES = {
+    'FF': (94.5, 0.33), 'SI': (93.5, 0.15), 'SL': (85.5, 0.15), 'CH': (85.8, 0.11),
+    'CU': (79.5, 0.08), 'FC': (89.5, 0.08), 'ST': (81.8, 0.06), 'FS': (86.5, 0.04),
+}
+
+# 투구 결과 : (확률, type)
+DESCRIPTIONS = {
+    'ball': (0.335, 'B'), 'blocked_ball': (0.015, 'B'), 'hit_by_pitch': (0.003, 'B'),
+    'called_strike': (0.155, 'S'), 'swinging_strike': (0.095, 'S'), 'foul': (0.2, 'S'),
+    'foul_tip': (0.007, 'S'), 'hit_into_play': (0.19, 'X'),
+}
+
+# 인플레이 결과 : (확률, babip_value)
+IN_PLAY_EVENTS = {
+    'field_out': (0.63, 0), 'single': (0.21, 1), 'double': (0.065, 1), 'triple': (0.006, 1),
+    'home_run': (0.045, 0), 'grounded_into_double_play': (0.025, 0), 'force_out': (0.019, 0),
+}
+
+
+def _simulate_at_bats(n_at_bats, rng):
+    """
+    볼카운트 진행을 타석 단위로 동시에 시뮬레이션
+
+    Returns:
+        tuple: (타석 번호, 투구 전 ball, 투구 전 strike, description 코드, 타석 결과 코드) — 투구 순서
+    """
+    names = list(DESCRIPTIONS)
+    probs = np.array([p for p, _ in DESCRIPTIONS.values()])
+    code = {name: i for i, name in enumerate(names)}
+
+    balls = np.zeros(n_at_bats, dtype=np.int8)
+    strikes = np.zeros(n_at_bats, dtype=np.int8)
+    event = np.full(n_at_bats, -1, dtype=np.int8)   # -1 : 진행 중, 0 : 인플레이, 1 : 삼진, 2 : 볼넷, 3 : 몸에 맞는 공
+    active = np.arange(n_at_bats)
+
+    steps = []
+    while len(active):
+        outcome = rng.choice(len(names), size=len(active), p=probs)
+        steps.append((active, balls[active].copy(), strikes[active].copy(), outcome.astype(np.int8)))
+
+        is_ball = np.isin(outcome, [code['ball'], code['blocked_ball']])
+        is_strike = np.isin(outcome, [code['called_strike'], code['swinging_strike'], code['foul_tip']])
+        is_foul = outcome == code['foul']
+
+        balls[active[is_ball]] += 1
+        strikes[active[is_strike | (is_foul & (strikes[active] < 2))]] += 1
+
+        event[active[outcome == code['hit_into_play']]] = 0
+        event[active[strikes[active] >= 3]] = 1
+        event[active[balls[active] >= 4]] = 2
+        event[active[outcome == code['hit_by_pitch']]] = 3
+        active = active[event[active] < 0]
+
+    at_bat = np.concatenate([s[0] for s in steps])
+    order = np.argsort(at_bat, kind='stable')
+    pitch_balls, pitch_strikes, outcome = (np.concatenate([s[i] for s in steps])[order] for i in (1, 2, 3))
+    return at_bat[order], pitch_balls, pitch_strikes, outcome, event
+
+
+def make_statcast(n_pitches, n_pitchers=1, n_batters=600, n_seasons=5, null_rate=0.002, start_date='2021-04-01', seed=42):
+    """
+    합성 Statcast 투구 데이터
+
+    Args:
+        n_pitches: 투구(행) 수 (타석 단위로 자르므로 마지막 타석 길이만큼 적을 수 있음)
+        n_pitchers: 투수 수 (투수마다 구종 구성, 릴리스 포인트, 투구 손이 다름)
+        n_batters: 타자 수 (출전 빈도는 치우친 분포)
+        n_seasons: 시즌 수 (등판일은 시즌 달력 안에서 무작위, 같은 날 여러 등판 가능)
+        null_rate: pitch_type 결측 비율 (전처리에서 결측 케이스 제거 경로 포함)
+        start_date: 첫 시즌 개막일
+        seed: 난수 seed (같은 인자면 항상 같은 DataFrame)
+
+    Returns:
+        DataFrame: load_data_from_bigquery와 같은 컬럼 (COLUMNS)
+    """
+    rng = np.random.default_rng(seed)
+
+    # 타석 시뮬레이션 (평균 약 3.5구 → 여유 있게 만든 뒤 n_pitches에 맞게 자름)
+    n_at_bats = max(1, int(n_pitches / 3.0) + 10)
+    at_bat, balls, strikes, outcome, event = _simulate_at_bats(n_at_bats, rng)
+    length = np.bincount(at_bat, minlength=n_at_bats)
+    n_at_bats = max(1, int(np.searchsorted(np.cumsum(length), n_pitches, side='right')))
+    keep = at_bat < n_at_bats
+    at_bat, balls, strikes, outcome = at_bat[keep], balls[keep], strikes[keep], outcome[keep]
+    event, length = event[:n_at_bats], length[:n_at_bats]
+    n = len(at_bat)
+    last_pitch = np.append(at_bat[1:] != at_bat[:-1], True)
+    pitch_number = np.arange(n) - np.searchsorted(at_bat, at_bat) + 1   # 타석 안의 투구 번호 (1부터)
+
+    # 등판 : 투수별로 연속된 타석 묶음 (평균 6타석), 등판마다 경기/날짜/시작 이닝과 타석 번호
+    appearance_length = rng.geometric(1 / 6, size=n_at_bats)
+    appearance = np.repeat(np.arange(n_at_bats), appearance_length)[:n_at_bats]
+    n_appearances = appearance[-1] + 1
+    appearance_pitcher = rng.integers(0, n_pitchers, size=n_appearances)
+    appearance_day = np.sort(rng.integers(0, n_seasons * SEASON_DAYS, size=n_appearances))
+    appearance_game = 600000 + np.arange(n_appearances)
+    appearance_inning = rng.integers(1, 9, size=n_appearances)
+    appearance_first_at_bat = rng.integers(1, 60, size=n_appearances)
+
+    first_of_appearance = np.flatnonzero(np.r_[True, appearance[1:] != appearance[:-1]])
+    in_appearance = np.arange(n_at_bats) - first_of_appearance[appearance]
+    ab_pitcher = appearance_pitcher[appearance]
+    ab_inning = np.minimum(appearance_inning[appearance] + in_appearance // 3, 12)
+    ab_number = appearance_first_at_bat[appearance] + in_appearance
+    ab_outs = in_appearance % 3
+
+    # 타자 : 출전 빈도가 치우친 분포, 타석 방향은 타자마다 고정
+    batter_weights = 1 / np.arange(1, n_batters + 1) ** 0.5
+    ab_batter = rng.choice(n_batters, size=n_at_bats, p=batter_weights / batter_weights.sum())
+    batter_stand = np.where(rng.random(n_batters) < 0.42, 'L', 'R')
+
+    # 투수 : 구종 구성 (3~5개), 투구 손, 릴리스 포인트
+    pitch_names = np.array(list(PITCH_TYPES))
+    league_mix = np.array([w for _, w in PITCH_TYPES.values()])
+    pitcher_mix = np.zeros((n_pitchers, len(pitch_names)))
+    for p in range(n_pitchers):
+        arsenal = rng.choice(len(pitch_names), size=rng.integers(3, 6), replace=False, p=league_mix)
+        pitcher_mix[p, arsenal] = rng.dirichlet(league_mix[arsenal] * 10)
+    pitcher_hand = np.where(rng.random(n_pitchers) < 0.28, 'L', 'R')
+    pitcher_release = np.column_stack([
+        np.where(pitcher_hand == 'L', 1.0, -1.0) * rng.uniform(1.0, 3.0, n_pitchers),
+        rng.uniform(5.3, 6.6, n_pitchers),
+        rng.uniform(53.5, 55.0, n_pitchers),
+    ])
+
+    # 투구 단위 값
+    pitcher = ab_pitcher[at_bat]
+    cumulative_mix = pitcher_mix.cumsum(axis=1)[pitcher]
+    pitch_code = (rng.random(n)[:, None] > cumulative_mix).sum(axis=1).clip(max=len(pitch_names) - 1)
+    pitch_type = pitch_names[pitch_code].astype(object)
+    pitch_type[rng.random(n) < null_rate] = None
+
+    speeds = np.array([speed for speed, _ in PITCH_TYPES.values()])
+    release_speed = np.round(speeds[pitch_code] + rng.normal(0, 1.3, n), 1)
+    release = np.round(pitcher_release[pitcher] + rng.normal(0, [0.12, 0.1, 0.15], (n, 3)), 2)
+
+    description_names = np.array(list(DESCRIPTIONS), dtype=object)
+    description_types = np.array([t for _, t in DESCRIPTIONS.values()], dtype=object)
+    description = description_names[outcome]
+
+    # 타석 결과 (마지막 투구에만 기록)
+    in_play_names = np.array(list(IN_PLAY_EVENTS), dtype=object)
+    in_play_probs = np.array([p for p, _ in IN_PLAY_EVENTS.values()])
+    in_play_babip = np.array([b for _, b in IN_PLAY_EVENTS.values()], dtype=np.float64)
+    in_play_code = rng.choice(len(in_play_names), size=n_at_bats, p=in_play_probs)
+    ab_event = np.select([event == 0, event == 1, event == 2, event == 3],
+                         [in_play_names[in_play_code], 'strikeout', 'walk', 'hit_by_pitch'], None).astype(object)
+    events = np.full(n, None, dtype=object)
+    events[last_pitch] = ab_event[at_bat[last_pitch]]
+
+    in_play = last_pitch & (event[at_bat] == 0)
+    launch_speed = np.where(in_play, np.round(rng.normal(88, 14, n).clip(20, 118), 1), np.nan)
+    launch_angle = np.where(in_play, np.round(rng.normal(12, 26, n).clip(-80, 85)), np.nan)
+    hit_location = np.where(in_play, rng.integers(1, 10, n), np.nan)
+    babip_value = np.where(in_play, in_play_babip[in_play_code[at_bat]], np.nan)
+
+    # 주자 (타석마다 고정, 없으면 결측)
+    runners = [pd.array(np.where(rng.random(n_at_bats) < rate, rng.integers(100000, 700000, n_at_bats), 0)[at_bat],
+                        dtype='Int64') for rate in (0.3, 0.18, 0.09)]
+    for runner in runners:
+        runner[runner == 0] = pd.NA
+
+    # 시즌 달력 : 시즌마다 start_date부터 SEASON_DAYS일
+    day = appearance_day[appearance][at_bat]
+    season_start = pd.to_datetime([pd.Timestamp(start_date).replace(year=pd.Timestamp(start_date).year + i)
+                                   for i in range(n_seasons)])
+    game_date = season_start[day // SEASON_DAYS] + pd.to_timedelta(day % SEASON_DAYS, unit='D')
+
+    df = pd.DataFrame({
+        'game_date': game_date,
+        'game_pk': appearance_game[appearance][at_bat],
+        'at_bat_number': ab_number[at_bat],
+        'pitch_number': pitch_number,
+        'inning': ab_inning[at_bat],
+        'pitcher': 500000 + pitcher,
+        'batter': 100000 + ab_batter[at_bat],
+        'stand': batter_stand[ab_batter][at_bat],
+        'p_throws': pitcher_hand[pitcher],
+        'outs_when_up': ab_outs[at_bat],
+        'on_1b': runners[0], 'on_2b': runners[1], 'on_3b': runners[2],
+        'balls': balls.astype(np.int64),
+        'strikes': strikes.astype(np.int64),
+        'type': description_types[outcome],
+        'hit_location': hit_location,
+        'launch_speed': launch_speed,
+        'launch_angle': launch_angle,
+        'babip_value': babip_value,
+        'pitch_type': pitch_type,
+        'release_speed': release_speed,
+        'release_pos_x': release[:, 0],
+        'release_pos_z': release[:, 1],
+        'release_pos_y': release[:, 2],
+        'plate_x': np.round(rng.normal(0, 0.85, n), 2),
+        'plate_z': np.round(rng.normal(2.35, 0.9, n), 2),
+        'description': description,
+        'events': events,
+    }, columns=COLUMNS)
+
+    # Statcast 순서 (game_date, game_pk, at_bat_number, pitch_number 내림차순) : 최신 경기가 위, 타석 안에서는 마지막 투구가 위
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    import sys
+
+    df = make_statcast(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    last = df['events'].notna()
+    print(f"rows={len(df):,d}  at_bats={last.sum():,d}  pitches/at_bat={len(df) / last.sum():.2f}")
+    print(df['pitch_type'].value_counts(normalize=True, dropna=False).round(3).to_dict())
+    print(df['description'].value_counts(normalize=True).round(3).to_dict())
+    print(df.loc[last, 'events'].value_counts(normalize=True).round(3).to_dict())
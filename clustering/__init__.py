@@ -1,10 +1,42 @@
-from .distance import ClusteredTraces
-from .visualizer import MDS
-from .visualizer import Dendrogram
+# 공개 이름은 처음 접근할 때 해당 하위 모듈을 import (PEP 562 module __getattr__)
+# → import clustering 만으로는 scipy, sklearn, matplotlib, pm4py 등을 불러오지 않음
+import importlib
+import importlib.util
 
 
-__all__ = [
-    'ClusteredTraces',
-    'MDS',
-    'Dendrogram'
-]
\ No newline at end of file
+_EXPORTS = {
+    'ClusteredTraces':     'distance',
+    'condensed_distances': 'condensed',
+    'load_condensed':      'condensed',
+    'linkage_tree':        'hierarchy',
+    'cut_linkage':         'hierarchy',
+    'silhouette_scores':   'hierarchy',
+    'sweep_clusters':      'hierarchy',
+    'clara':               'medoids',
+    'SequenceIndex':       'index',
+    'classical_mds':       'embedding',
+    'landmark_mds':        'embedding',
+    'MDS':                 'visualizer',
+    'mds_coordinates':     'visualizer',
+    'Dendrogram':          'visualizer',
+    'cluster_composition': 'visualizer',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        # 하위 모듈 자체에 접근 (예 : clustering.hierarchy)
+        if not name.startswith('__') and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,99 @@
+"""
+Condensed 거리 저장 모듈
+n×n 정사각 행렬 대신 scipy pdist 순서(상삼각, 행 우선)의 1차원 배열에 거리를 저장
+"""
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+
+def condensed_size(n):
+    """n개 시퀀스의 condensed 배열 길이 = n(n-1)/2"""
+    return n * (n - 1) // 2
+
+
+def condensed_index(i, j, n):
+    """정사각 행렬의 (i, j) 위치(i < j) → condensed 배열 index"""
+    return n * i - i * (i + 1) // 2 + (j - i - 1)
+
+
+def condensed_distances(sequences, dtype=np.uint16, path=None, block_bytes=64 * 1024 ** 2, workers=-1):
+    """
+    시퀀스 간 Levenshtein 거리를 condensed 배열로 계산
+
+    - 행 블록 단위로 rapidfuzz cdist를 실행하여 상삼각 부분만 채움 (정사각 행렬을 만들지 않음)
+    - path를 주면 .npy memory-map 파일에 채워 디스크에 보관 (np.load(path, mmap_mode='r')로 다시 열 수 있음)
+
+    Args:
+        sequences: 정수 코드 list의 list
+        dtype: 저장 dtype (거리 ≤ 가장 긴 시퀀스 길이이므로 uint16이면 충분)
+        path: memory-map 파일 경로 (None이면 메모리 배열)
+        block_bytes: 한 번에 계산할 cdist 블록의 최대 크기
+        workers: rapidfuzz 스레드 수 (-1이면 모든 코어)
+
+    Returns:
+        ndarray | np.memmap: 길이 n(n-1)/2의 condensed 거리 배열
+    """
+    n = len(sequences)
+    size = condensed_size(n)
+
+    max_length = max((len(seq) for seq in sequences), default=0)
+    if max_length > np.iinfo(dtype).max:
+        raise ValueError(f"시퀀스 길이({max_length})가 {np.dtype(dtype).name} 범위를 넘습니다")
+
+    if path is None:
+        condensed = np.empty(size, dtype=dtype)
+    else:
+        condensed = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(size,))
+
+    # 블록 하나 = block_rows × n 크기의 int32 cdist 결과
+    block_rows = max(1, block_bytes // (4 * max(n, 1)))
+    position = 0
+
+    for start in range(0, n - 1, block_rows):
+        stop = min(start + block_rows, n - 1)
+
+        block = process.cdist(sequences[start:stop], sequences[start:], scorer=Levenshtein.distance,
+                              dtype=np.int32, workers=workers)
+
+        # 행 r의 유효 구간은 대각선 오른쪽(r+1 이후) → 행 우선 순서가 곧 condensed 순서
+        upper = block[np.triu(np.ones(block.shape, dtype=bool), k=1)]
+        condensed[position:position + len(upper)] = upper
+        position += len(upper)
+
+    if path is not None:
+        condensed.flush()
+
+    return condensed
+
+
+def load_condensed(path):
+    """condensed_distances로 저장한 .npy 파일을 읽기 전용 memory-map으로 열기"""
+    return np.load(path, mmap_mode='r')
+
+
+def condensed_to_square(condensed):
+    """condensed 배열 → n×n 정사각 행렬 (작은 데이터의 시각화 등 호환용)"""
+    from scipy.spatial.distance import squareform
+
+    return squareform(np.asarray(condensed), checks=False)
+
+
+def condensed_rows(condensed, start, stop):
+    """
+    condensed 배열에서 정사각 행렬의 start ~ stop 행만 복원
+
+    Returns:
+        ndarray: (stop - start) × n 거리 행렬 (대각선은 0)
+    """
+    n = int(round((1 + np.sqrt(1 + 8 * len(condensed))) / 2))
+    rows = np.arange(start, stop)[:, None]
+    cols = np.arange(n)[None, :]
+
+    low, high = np.minimum(rows, cols), np.maximum(rows, cols)
+    index = condensed_index(low, high, n)
+    index[low == high] = 0
+
+    block = np.asarray(condensed)[index]
+    block[low == high] = 0
+    return block
@@ -1,71 +1,167 @@
-import numpy as np
+from functools import cached_property
 from mining.probability import prepare_eventLog
 from mining.probability import create_eventlog_from_dataFrame
+from mining.traces import TraceStore
 
-from sklearn.cluster import AgglomerativeClustering
-from pm4py.algo.filtering.log.variants.variants_filter import get_variants
-from rapidfuzz.distance import Levenshtein
+from .condensed import condensed_distances
+from .condensed import condensed_to_square
+from .hierarchy import linkage_tree
+from .hierarchy import cut_linkage
+from .hierarchy import sweep_clusters
+from .medoids import clara
 
 
 class ClusteredTraces:
+    """
+    Args:
+        dataframe: 전처리된 투구 데이터
+        distance_path: condensed 거리 배열을 저장할 .npy memory-map 경로 (None이면 메모리에 보관)
+        engine: 'hierarchical' (전체 거리 행렬 + complete linkage) 또는
+                'clara' (균등 표본 + 빈도 가중 비용 k-medoids, 전체 거리 행렬을 만들지 않음 → variant가 매우 많을 때)
+        sample_size, n_samples, random_state: clara 엔진의 표본 크기, 표본 추출 횟수, seed
+    """
+
+    engines = ('hierarchical', 'clara')
     
-    def __init__(self, dataframe):
+    def __init__(self, dataframe, distance_path=None, engine='hierarchical', sample_size=1000, n_samples=5, random_state=42):
+        if engine not in self.engines:
+            raise ValueError(f"engine은 {self.engines} 중 하나여야 합니다 : {engine}")
+
         self.dataframe = dataframe
+        self.distance_path = distance_path
+        self.engine = engine
+        self.sample_size = sample_size
+        self.n_samples = n_samples
+        self.random_state = random_state
         
-        self.event_log = self.preprocessing()
-        self.sequences = self.achieve_trace_infomation()[1]
-        self.matrix = self.calculate_distance_matrix()
+        self.traces = TraceStore.from_dataframe(prepare_eventLog(self.dataframe))
+        self.sequences = self._trace_infomation[0]
         self.n_clusters = 0
 
+        # MDS 좌표 캐시 : 이 객체에서 나온 모든 결과 dict가 공유 (visualizer.mds_coordinates가 채움)
+        self.coords = {}
+
+    @cached_property
+    def event_log(self):
+        """pm4py EventLog : 처음 접근할 때 한 번만 변환"""
+        return self.preprocessing()
+
     def preprocessing(self):
         prepared_df = prepare_eventLog(self.dataframe)
         eventlog_df = create_eventlog_from_dataFrame(prepared_df)        
         return eventlog_df
 
+    @cached_property
+    def representative_traces(self):
+        """
+                Description : Variant마다 처음 등장한 케이스만 pm4py Trace로 변환 (전체 로그 변환 없음)
+        """
+        prepared_df = prepare_eventLog(self.dataframe)
+        case_ids = self.traces.case_ids[self.traces.variant_first_case]
+        eventlog_df = create_eventlog_from_dataFrame(prepared_df[prepared_df['case:concept:name'].isin(case_ids)])
+        return list(eventlog_df)
+
+    @cached_property
+    def _trace_infomation(self):
+        trace_sequences = [list(v) for v in self.traces.variant_sequences]
+        trace_labels = [f"T{str(i).zfill(2)}" for i in range(len(trace_sequences))]
+        return trace_sequences, trace_labels
+
     def achieve_trace_infomation(self):
         """
                 Description : Eventlog의 Vriants Pattern과 Freq, Length을 저장하기 위한 함수
         """
-        variants = get_variants(self.event_log)
+        trace_sequences, trace_labels = self._trace_infomation
+        return (self.representative_traces, trace_sequences, trace_labels)
 
-        traces = [variants[v][0] for v in variants]
-        trace_sequences = [ [event['concept:name'] for event in trace] for trace in traces ]
-        trace_labels = [f"T{str(i).zfill(2)}" for i in range(len(trace_sequences))]
-        
-        return (traces, trace_sequences, trace_labels)
 
+    @cached_property
+    def variant_codes(self):
+        """
+                Description : Variant별 활동 코드 list (구종 하나 = 토큰 하나)
+        """
+        return [self.traces.case(index).tolist() for index in self.traces.variant_first_case]
 
-    def calculate_distance_matrix(self):
-        n = len(self.sequences)
-        distance_matrix = np.zeros((n, n))
+    @cached_property
+    def distances(self):
+        """
+                Description : condensed 거리 배열 (hierarchical 엔진에서 처음 접근할 때 한 번만 계산)
+        """
+        return self.calculate_distance_matrix()
+
+    def calculate_distance_matrix(self, workers=-1):
+        """
+                Description : 정수 코드 시퀀스 간 토큰 단위 Levenshtein 거리 (rapidfuzz cdist, 모든 코어 사용)
+                              "SL" → "SI" 같은 구종 교체는 글자 수와 관계없이 치환 1회
+                              pdist 순서의 condensed uint16 배열로 블록 단위 저장
+        """
+        return condensed_distances(self.variant_codes, path=self.distance_path, workers=workers)
 
-        for i in range(n):
-            for j in range(i + 1, n):
-                dist = Levenshtein.distance(
-                    " ".join(self.sequences[i]), 
-                    " ".join(self.sequences[j])
-                )
-                distance_matrix[i, j] = dist
-                distance_matrix[j, i] = dist
+    @property
+    def matrix(self):
+        """
+                Description : n×n 정사각 거리 행렬 (호환용, 호출할 때마다 condensed 배열에서 새로 만듦)
+        """
+        return condensed_to_square(self.distances)
 
-        return distance_matrix
+    @cached_property
+    def linkage(self):
+        """
+                Description : Complete linkage 트리 (condensed 배열에서 한 번만 계산)
+        """
+        return linkage_tree(self.distances, method='complete')
 
     @property
     def clusetering_agglomerative(self):
-        # Clustering Model 
-        clustering_model = AgglomerativeClustering( n_clusters=self.n_clusters, metric='precomputed', linkage='complete')
-        clusters = clustering_model.fit_predict(self.matrix)
+        # AgglomerativeClustering(metric='precomputed', linkage='complete')과 같은 군집을 linkage 트리에서 계산
+        clusters = self.cut(self.n_clusters)
         return clusters
 
-    def __call__(self, n_clusters=None):
+    def cut(self, n_clusters):
+        """
+                Description : 캐시된 linkage 트리를 n_clusters개 군집으로 자르기 (군집 분석을 다시 하지 않음)
+        """
+        return cut_linkage(self.linkage, n_clusters)
+
+    def sweep(self, k_values=range(2, 31)):
+        """
+                Description : 여러 군집 수에 대한 silhouette과 군집 크기 통계를 한 번에 계산
+                              (linkage 트리는 한 번만 계산하고 k마다 자르기만 함)
+        """
+        return sweep_clusters(self.distances, self.linkage, k_values)
+
+    def clustering_clara(self):
+        """
+                Description : Variant 빈도로 가중한 CLARA k-medoids (표본 거리 행렬 + 전체 variant의 medoid 배정)
+        """
+        return clara(self.variant_codes, self.n_clusters, weights=self.traces.variant_counts,
+                     n_samples=self.n_samples, sample_size=self.sample_size, random_state=self.random_state)
+
+    def __call__(self, n_clusters=None, traces=True):
+        """
+                Description : 군집 분석 결과 dict
+                              traces=False이면 대표 pm4py Trace('traces')를 만들지 않음 (pm4py를 import하지 않음)
+        """
         if n_clusters is None:
             print("Error : 군집의 개수를 정해주세요!,  'n_clusters' argument is empty")
         self.n_clusters = n_clusters
         
         result = {}
-        result['traces'], result['sequences'], result['labels'] = self.achieve_trace_infomation()
-        result['distances'] = self.matrix
-        result['clusters'] = self.clusetering_agglomerative
+        if traces:
+            result['traces'] = self.representative_traces
+        result['sequences'], result['labels'] = self._trace_infomation
+        result['codes'] = self.variant_codes
+        result['coords'] = self.coords
+
+        if self.engine == 'clara':
+            medoids = self.clustering_clara()
+            result['medoids'] = medoids['medoids']
+            result['medoid_distances'] = medoids['medoid_distances']
+            result['clusters'] = medoids['clusters']
+        else:
+            result['distances'] = self.distances
+            result['linkage'] = self.linkage
+            result['clusters'] = self.clusetering_agglomerative
         result['n_clusters'] = self.n_clusters
 
         return result
\ No newline at end of file
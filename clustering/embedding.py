@@ -0,0 +1,103 @@
+"""
+다차원척도법(MDS) 좌표 계산 모듈
+- classical MDS : 이중 중심화한 거리² 행렬의 고유값 분해 (반복 계산 없음)
+- landmark MDS  : landmark 몇 개와의 거리만으로 전체 좌표 계산 (전체 거리 행렬 없이 대규모 데이터)
+"""
+import numpy as np
+from scipy.linalg import eigh
+from scipy.sparse.linalg import eigsh
+from scipy.spatial.distance import squareform
+
+from .medoids import nearest_medoids
+
+
+def _top_eigen(matrix, n_components):
+    """대칭 행렬의 큰 고유값 n_components개와 고유벡터 (큰 행렬은 Lanczos)"""
+    n = len(matrix)
+    k = min(n_components, n)
+    if n > 500 and k < n - 1:
+        values, vectors = eigsh(matrix, k=k, which='LA')
+    else:
+        values, vectors = eigh(matrix, subset_by_index=[n - k, n - 1])
+
+    order = np.argsort(values)[::-1]
+    return values[order], vectors[:, order]
+
+
+def _orient(vectors):
+    """고유벡터 부호 고정 (절댓값이 가장 큰 성분이 양수) → 같은 입력이면 항상 같은 좌표"""
+    signs = np.sign(vectors[np.abs(vectors).argmax(axis=0), np.arange(vectors.shape[1])])
+    signs[signs == 0] = 1
+    return vectors * signs
+
+
+def classical_mds(distances, n_components=2):
+    """
+    Classical(Torgerson) MDS
+
+    Args:
+        distances: condensed 거리 배열 또는 n×n 정사각 거리 행렬
+        n_components: 좌표 차원
+
+    Returns:
+        ndarray: n × n_components 좌표 (양의 고유값이 부족한 차원은 0)
+    """
+    if np.ndim(distances) == 1:
+        distances = squareform(np.asarray(distances), checks=False)
+
+    squared = np.asarray(distances, dtype=np.float64) ** 2
+    n = len(squared)
+    coords = np.zeros((n, n_components))
+    if n == 0:
+        return coords
+
+    # B = -1/2 · J D² J (J = 중심화 행렬) : 행/열 평균을 빼는 방식으로 계산
+    row_mean = squared.mean(axis=1)
+    centered = -0.5 * (squared - row_mean[:, None] - row_mean[None, :] + row_mean.mean())
+
+    values, vectors = _top_eigen(centered, n_components)
+    positive = values > 0
+    vectors = _orient(vectors)
+    coords[:, :positive.sum()] = vectors[:, positive] * np.sqrt(values[positive])
+    return coords
+
+
+def landmark_mds(sequences, n_landmarks=500, n_components=2, random_state=42, workers=-1):
+    """
+    Landmark MDS (de Silva & Tenenbaum)
+
+    1) 무작위 landmark끼리의 거리 행렬로 classical MDS
+    2) 나머지 시퀀스는 landmark와의 거리만으로 같은 좌표계에 배치 (n × landmark 거리만 계산)
+
+    Args:
+        sequences: 정수 코드 list의 list (variant별)
+        n_landmarks: landmark 수
+        n_components: 좌표 차원
+        random_state: landmark 선택 seed
+
+    Returns:
+        ndarray: n × n_components 좌표
+    """
+    n = len(sequences)
+    coords = np.zeros((n, n_components))
+    if n == 0:
+        return coords
+
+    rng = np.random.default_rng(random_state)
+    landmarks = np.sort(rng.choice(n, size=min(n_landmarks, n), replace=False))
+
+    # 모든 시퀀스 × landmark 거리 (landmark끼리의 거리도 이 행렬에 포함)
+    squared = nearest_medoids(sequences, [sequences[i] for i in landmarks], workers=workers).astype(np.float64) ** 2
+    landmark_squared = squared[landmarks]
+
+    row_mean = landmark_squared.mean(axis=1)
+    centered = -0.5 * (landmark_squared - row_mean[:, None] - row_mean[None, :] + row_mean.mean())
+    values, vectors = _top_eigen(centered, n_components)
+
+    positive = values > 0
+    vectors = _orient(vectors)[:, positive]
+
+    # x = -1/2 · L# (δ² - δ²의 landmark 평균), L# = 고유벡터 / √고유값
+    pseudo_inverse = vectors / np.sqrt(values[positive])
+    coords[:, :positive.sum()] = -0.5 * (squared - landmark_squared.mean(axis=0)) @ pseudo_inverse
+    return coords
@@ -0,0 +1,139 @@
+"""
+계층적 군집 모듈
+condensed 거리 배열 하나로 linkage를 한 번만 계산하고, 군집 수에 따라 트리를 자름
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import linkage
+
+from .condensed import condensed_rows
+
+
+def linkage_tree(condensed, method='complete'):
+    """
+    condensed 거리 배열 → scipy linkage 행렬
+    (scipy가 내부에서 float64로 변환하므로 계산 중에는 condensed 크기 × 8 bytes가 추가로 필요)
+    """
+    return linkage(np.asarray(condensed), method=method)
+
+
+def cut_linkage(linked, n_clusters):
+    """
+    linkage 트리를 n_clusters개 군집으로 자르기
+    sklearn AgglomerativeClustering(metric='precomputed')과 같은 군집 번호를 반환
+
+    Args:
+        linked: linkage_tree 결과 ((n-1) × 4)
+        n_clusters: 군집 수
+
+    Returns:
+        ndarray: 각 시퀀스의 군집 번호
+    """
+    n_leaves = len(linked) + 1
+    if n_clusters > n_leaves:
+        raise ValueError(f"군집 수({n_clusters})가 시퀀스 수({n_leaves})보다 많습니다")
+
+    children = linked[:, :2].astype(np.intp)
+
+    # 가장 마지막에 합쳐진 노드부터 n_clusters개가 될 때까지 분리 (heap에는 음수 노드 번호 저장)
+    nodes = [-(2 * n_leaves - 2)]
+    for _ in range(n_clusters - 1):
+        left, right = children[-nodes[0] - n_leaves]
+        heapq.heappush(nodes, -left)
+        heapq.heappushpop(nodes, -right)
+
+    # 위에서 아래로 군집 번호 전파 (부모 노드 번호가 항상 자식보다 큼)
+    labels = np.full(2 * n_leaves - 1, -1, dtype=np.intp)
+    for label, node in enumerate(nodes):
+        labels[-node] = label
+
+    for node in range(2 * n_leaves - 2, n_leaves - 1, -1):
+        if labels[node] >= 0:
+            labels[children[node - n_leaves]] = labels[node]
+
+    return labels[:n_leaves]
+
+
+def silhouette_scores(condensed, labelings, block_bytes=64 * 1024 ** 2):
+    """
+    여러 군집 결과의 평균 silhouette을 condensed 배열에서 한 번에 계산
+    (정사각 행렬 없이 행 블록 단위로 읽고, 블록마다 모든 군집 결과에 재사용)
+
+    Args:
+        condensed: condensed 거리 배열
+        labelings: 군집 번호 배열의 list
+        block_bytes: 한 번에 복원할 거리 블록의 최대 크기
+
+    Returns:
+        list: labelings 순서의 평균 silhouette (sklearn silhouette_score와 같은 정의)
+    """
+    n = len(labelings[0]) if labelings else 0
+    if n == 0:
+        return []
+
+    onehots = []
+    for labels in labelings:
+        onehot = np.zeros((n, labels.max() + 1))
+        onehot[np.arange(n), labels] = 1
+        onehots.append(onehot)
+
+    totals = [0.0] * len(labelings)
+    block_rows = max(1, block_bytes // (8 * n))
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = condensed_rows(condensed, start, stop).astype(np.float64)
+
+        for position, (labels, onehot) in enumerate(zip(labelings, onehots)):
+            sizes = onehot.sum(axis=0)
+            own = labels[start:stop]
+            means = block @ onehot
+
+            # a : 같은 군집 안의 평균 거리 (자기 자신 제외), b : 가장 가까운 다른 군집의 평균 거리
+            own_size = sizes[own]
+            a = means[np.arange(len(own)), own] / np.maximum(own_size - 1, 1)
+            means = means / sizes
+            means[np.arange(len(own)), own] = np.inf
+            b = means.min(axis=1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                score = (b - a) / np.maximum(a, b)
+            score[(own_size == 1) | ~np.isfinite(score)] = 0
+
+            totals[position] += score.sum()
+
+    return [total / n for total in totals]
+
+
+def sweep_clusters(condensed, linked, k_values=range(2, 31)):
+    """
+    한 번 계산한 linkage 트리를 여러 군집 수로 잘라 비교
+
+    Args:
+        condensed: condensed 거리 배열
+        linked: linkage_tree 결과
+        k_values: 비교할 군집 수 목록
+
+    Returns:
+        DataFrame: 군집 수별 silhouette과 군집 크기 통계 (n_clusters, silhouette, min_size, max_size, mean_size, sizes)
+    """
+    n_leaves = len(linked) + 1
+    k_values = [k for k in k_values if 2 <= k < n_leaves]
+    labelings = [cut_linkage(linked, k) for k in k_values]
+    scores = silhouette_scores(condensed, labelings)
+
+    rows = []
+    for k, labels, score in zip(k_values, labelings, scores):
+        sizes = np.bincount(labels, minlength=k)
+        rows.append({
+            'n_clusters': k,
+            'silhouette': score,
+            'min_size': int(sizes.min()),
+            'max_size': int(sizes.max()),
+            'mean_size': float(sizes.mean()),
+            'sizes': sizes.tolist(),
+        })
+
+    return pd.DataFrame(rows, columns=['n_clusters', 'silhouette', 'min_size', 'max_size', 'mean_size', 'sizes'])
@@ -0,0 +1,283 @@
+"""
+Variant 최근접 검색 모듈
+정수 코드 시퀀스에 대한 편집 거리 색인 (반경 / k-NN 질의, 디스크 저장)
+"""
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+
+# 활동 코드 → 문자 (토큰 하나 = 문자 하나이므로 문자열 거리 = 구종 단위 편집 거리, Unicode 사설 영역 사용)
+_CODE_BASE = 0xE000
+
+# 다항 해시 (mod 2^64) : 홀수 P의 역원으로 구간 해시를 O(1)에 계산
+_P = np.uint64(0x9E3779B97F4A7C15)
+_P_INV = np.uint64(pow(int(_P), -1, 2 ** 64))
+
+
+def _encode(codes):
+    return ''.join(chr(_CODE_BASE + code) for code in codes)
+
+
+def _powers(base, n):
+    powers = np.ones(n, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for i in range(1, n):
+            powers[i] = powers[i - 1] * base
+    return powers
+
+
+def _deletion_hashes(codes, max_deletions):
+    """
+    같은 길이 l의 시퀀스들(m × l)에서 원소를 0 ~ max_deletions(≤ 2)개 지운 모든 시퀀스의 해시 (m × 조합 수)
+
+    S[j] = s[j:]의 해시 (끝에서부터 P의 거듭제곱), G[j] = s[:j]의 해시
+    - a 삭제      : G[a]·P^(l-1-a) + S[a+1]
+    - a, b 삭제   : G[a]·P^(l-2-a) + (S[a+1] - S[b])·P⁻¹ + S[b+1]
+    """
+    m, length = codes.shape
+    powers, inverse_powers = _powers(_P, length + 2), _powers(_P_INV, length + 2)
+    values = codes.astype(np.uint64) + np.uint64(1)  # 0 코드도 해시에 반영
+
+    with np.errstate(over='ignore'):
+        suffix = np.zeros((m, length + 1), dtype=np.uint64)
+        suffix[:, :length] = np.cumsum((values * powers[length - 1 - np.arange(length)])[:, ::-1], axis=1, dtype=np.uint64)[:, ::-1]
+        prefix = (suffix[:, [0]] - suffix) * inverse_powers[length - np.arange(length + 1)]
+
+        hashes = [suffix[:, [0]]]
+        if max_deletions >= 1 and length >= 1:
+            a = np.arange(length)
+            hashes.append(prefix[:, a] * powers[length - 1 - a] + suffix[:, a + 1])
+        if max_deletions >= 2 and length >= 2:
+            a, b = np.triu_indices(length, 1)
+            hashes.append(prefix[:, a] * powers[length - 2 - a] + (suffix[:, a + 1] - suffix[:, b]) * _P_INV + suffix[:, b + 1])
+
+    return np.concatenate(hashes, axis=1)
+
+
+class SequenceIndex:
+    """
+    Variant 시퀀스에 대한 편집 거리 색인
+
+    두 가지 하한(lower bound)으로 후보를 줄인 뒤 rapidfuzz로 정확한 거리를 계산합니다.
+
+    - 길이 버킷 : 빈 시퀀스를 pivot으로 한 삼각 부등식 d(q, s) ≥ |len(q) - len(s)|
+      → 길이별로 묶어 두고, 반경 r(또는 현재 k번째 거리)보다 길이 차이가 큰 버킷은 통째로 건너뜀
+    - 삭제 이웃 테이블 : 편집 거리 ≤ r이면 두 시퀀스에서 각각 r개 이하를 지워 같은 시퀀스를 만들 수 있음
+      → r ≤ max_radius 질의는 삭제 해시가 하나라도 겹치는 variant만 확인
+
+    구종 종류가 적고 시퀀스가 짧아 거리 값의 범위가 좁으므로 BK-tree 같은 트리 가지치기는 효과가 작아
+    (100k variant, 반경 2에서 노드의 약 20% 방문), 위 두 하한과 C 구현 일괄 거리 계산을 사용합니다.
+
+    Args:
+        activities: 활동 vocabulary (코드 → 활동 이름)
+        sequences: variant별 활동 코드 list
+        labels: variant 라벨 (None이면 T00, T01, ...)
+        counts: variant별 케이스 수 (None이면 모두 1)
+        max_radius: 삭제 이웃 테이블의 최대 반경 (0 ~ 2)
+    """
+
+    def __init__(self, activities, sequences, labels=None, counts=None, max_radius=2, _deletions=None):
+        if not 0 <= max_radius <= 2:
+            raise ValueError(f"max_radius는 0 ~ 2 사이여야 합니다 : {max_radius}")
+
+        self.activities = list(activities)
+        self.sequences = [list(map(int, sequence)) for sequence in sequences]
+        self.labels = list(labels) if labels is not None else [f"T{str(i).zfill(2)}" for i in range(len(self.sequences))]
+        self.counts = np.ones(len(self.sequences), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.max_radius = max_radius
+
+        self._activity_index = {activity: code for code, activity in enumerate(self.activities)}
+        self._keys = [_encode(sequence) for sequence in self.sequences]
+
+        # 길이 → (variant index 배열, key list)
+        lengths = np.array([len(sequence) for sequence in self.sequences], dtype=np.int64)
+        self._buckets = {}
+        for length in np.unique(lengths):
+            ids = np.flatnonzero(lengths == length)
+            self._buckets[int(length)] = (ids, [self._keys[i] for i in ids])
+
+        self._hashes, self._hash_ids = self._build_deletions() if _deletions is None else _deletions
+
+    @classmethod
+    def from_clustered(cls, clustered, max_radius=2):
+        """ClusteredTraces의 variant(achieve_trace_infomation 순서)로 색인 생성"""
+        _, labels = clustered._trace_infomation
+        return cls(clustered.traces.activities.tolist(), clustered.variant_codes, labels, clustered.traces.variant_counts,
+                   max_radius=max_radius)
+
+    def _build_deletions(self):
+        """길이 버킷별로 삭제 이웃 해시 계산 → (해시, variant) 정렬 배열"""
+        hashes, ids = [np.empty(0, dtype=np.uint64)], [np.empty(0, dtype=np.int64)]
+
+        for length, (rows, _) in self._buckets.items():
+            table = _deletion_hashes(np.array([self.sequences[i] for i in rows], dtype=np.int64).reshape(len(rows), length),
+                                     self.max_radius)
+            hashes.append(table.ravel())
+            ids.append(np.repeat(rows, table.shape[1]))
+
+        hashes, ids = np.concatenate(hashes), np.concatenate(ids)
+        order = np.lexsort((ids, hashes))
+        hashes, ids = hashes[order], ids[order]
+
+        # 같은 variant에서 나온 중복 해시 제거 (같은 구종이 연속되면 지우는 위치가 달라도 결과가 같음)
+        keep = np.ones(len(hashes), dtype=bool)
+        keep[1:] = (hashes[1:] != hashes[:-1]) | (ids[1:] != ids[:-1])
+        return hashes[keep], ids[keep].astype(np.int32)
+
+    def __len__(self):
+        return len(self.sequences)
+
+    def encode(self, sequence):
+        """
+        질의 시퀀스 → 활동 코드 list
+        활동 이름 list면 vocabulary로 변환 (없는 활동은 어떤 variant와도 일치하지 않는 코드)
+        """
+        codes = []
+        for token in sequence:
+            if isinstance(token, (int, np.integer)):
+                codes.append(int(token))
+            else:
+                codes.append(self._activity_index.get(token, len(self.activities)))
+        return codes
+
+    def decode(self, index):
+        """variant index → 활동 이름 tuple"""
+        return tuple(self.activities[code] for code in self.sequences[index])
+
+    def _candidates(self, codes, r):
+        """삭제 해시가 질의와 하나라도 겹치는 variant index 배열 (편집 거리 ≤ r인 variant를 모두 포함)"""
+        query = np.unique(_deletion_hashes(np.array([codes], dtype=np.int64).reshape(1, len(codes)), r))
+        lo = np.searchsorted(self._hashes, query, side='left')
+        hi = np.searchsorted(self._hashes, query, side='right')
+
+        sizes = hi - lo
+        total = int(sizes.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        positions = np.repeat(lo - np.cumsum(sizes) + sizes, sizes) + np.arange(total)
+        return np.unique(self._hash_ids[positions])
+
+    def _distances(self, key, ids, keys=None, cutoff=None):
+        """질의와 variant들의 편집 거리 (cutoff보다 크면 cutoff + 1)"""
+        if keys is None:
+            keys = [self._keys[i] for i in ids]
+        if not keys:
+            return np.empty(0, dtype=np.int32)
+        return process.cdist([key], keys, scorer=Levenshtein.distance, score_cutoff=cutoff, dtype=np.int32, workers=1)[0]
+
+    @staticmethod
+    def _sorted_pairs(ids, distances):
+        order = np.lexsort((ids, distances))
+        return list(zip(np.asarray(ids)[order].tolist(), np.asarray(distances)[order].tolist()))
+
+    def radius(self, sequence, r):
+        """
+        편집 거리 r 이하의 variant 검색
+
+        Args:
+            sequence: 활동 이름 또는 활동 코드 list
+            r: 최대 편집 거리
+
+        Returns:
+            list: (variant index, 거리) — 거리, index 순 정렬
+        """
+        if not self._keys or r < 0:
+            return []
+
+        codes = self.encode(sequence)
+        key = _encode(codes)
+
+        if r <= self.max_radius:
+            ids = self._candidates(codes, r)
+            distances = self._distances(key, ids, cutoff=r)
+        else:
+            found_ids, found_distances = [], []
+            for length, (bucket_ids, bucket_keys) in self._buckets.items():
+                if abs(length - len(codes)) <= r:
+                    found_ids.append(bucket_ids)
+                    found_distances.append(self._distances(key, bucket_ids, bucket_keys, cutoff=r))
+            ids = np.concatenate(found_ids) if found_ids else np.empty(0, dtype=np.int64)
+            distances = np.concatenate(found_distances) if found_distances else np.empty(0, dtype=np.int32)
+
+        within = distances <= r
+        return self._sorted_pairs(ids[within], distances[within])
+
+    def knn(self, sequence, k=5):
+        """
+        편집 거리가 가장 가까운 variant k개 검색
+
+        1) 삭제 이웃 후보의 거리로 k번째 거리(tau)를 먼저 구하고, tau ≤ max_radius면 그대로 반환
+        2) 아니면 길이 차이가 작은 버킷부터 tau 이하만 남기며 탐색, 길이 차이 > tau인 버킷에서 중단
+
+        질의 시간 (benchmarks/bench_index.py, 100k variant, 1 core)
+        - k = 1 : 평균 약 0.8 ms (대부분 1단계에서 끝남)
+        - k = 5 : 중앙값 약 2 ms, 평균 약 6 ms, 상위 10% 약 14 ms (1 ms 이하 목표에 못 미침)
+          긴 variant(10구 이상)는 거리 2 안의 이웃이 k개보다 적어 2)의 버킷 탐색으로 넘어가며 (질의의 약 40%),
+          k번째 거리가 3 ~ 17이므로 길이 버킷 수만 개를 계산해야 함
+          (구종 히스토그램 하한, 반경을 1씩 넓히는 탐색도 시험했으나 후보가 줄지 않아 더 느림)
+
+        Returns:
+            list: (variant index, 거리) — 거리, index 순 정렬
+        """
+        if not self._keys or k <= 0:
+            return []
+
+        codes = self.encode(sequence)
+        key = _encode(codes)
+
+        ids = self._candidates(codes, self.max_radius)
+        best = self._sorted_pairs(ids, self._distances(key, ids))[:k]
+        if len(best) == k and best[-1][1] <= self.max_radius:
+            return best
+
+        for length in sorted(self._buckets, key=lambda length: abs(length - len(codes))):
+            tau = best[-1][1] if len(best) == k else None
+            if tau is not None and abs(length - len(codes)) > tau:
+                break
+
+            bucket_ids, bucket_keys = self._buckets[length]
+            distances = self._distances(key, bucket_ids, bucket_keys, cutoff=tau)
+            within = distances <= tau if tau is not None else np.ones(len(distances), dtype=bool)
+
+            merged = dict(best)
+            merged.update(zip(bucket_ids[within].tolist(), distances[within].tolist()))
+            best = sorted(merged.items(), key=lambda item: (item[1], item[0]))[:k]
+
+        return best
+
+    def save(self, path):
+        """
+        색인을 .npz 파일로 저장 (삭제 이웃 테이블 포함, 다시 만들지 않고 불러오기 가능)
+        해시 배열은 압축 효과가 없으므로 압축하지 않음
+        """
+        sequence_offsets = np.zeros(len(self.sequences) + 1, dtype=np.int64)
+        np.cumsum([len(sequence) for sequence in self.sequences], out=sequence_offsets[1:])
+
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                activities=np.array(self.activities, dtype=str),
+                sequence_codes=np.array([code for sequence in self.sequences for code in sequence], dtype=np.int16),
+                sequence_offsets=sequence_offsets,
+                labels=np.array(self.labels, dtype=str),
+                counts=self.counts,
+                max_radius=np.array(self.max_radius),
+                hashes=self._hashes,
+                hash_ids=self._hash_ids,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """save로 저장한 색인 불러오기"""
+        with np.load(path) as state:
+            codes = state['sequence_codes'].tolist()
+            offsets = state['sequence_offsets'].tolist()
+            sequences = [codes[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+            return cls(state['activities'].tolist(), sequences, state['labels'].tolist(), state['counts'],
+                       max_radius=int(state['max_radius']), _deletions=(state['hashes'], state['hash_ids']))
+
+    def __repr__(self):
+        return f"SequenceIndex(variants={len(self)}, activities={len(self.activities)}, max_radius={self.max_radius})"
@@ -0,0 +1,122 @@
+"""
+표본 기반 k-medoids(CLARA) 모듈
+variant가 매우 많을 때 전체 거리 행렬 없이 군집 분석
+"""
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+
+def nearest_medoids(sequences, medoid_sequences, block_bytes=64 * 1024 ** 2, workers=-1):
+    """
+    모든 시퀀스와 medoid 사이의 거리 계산 (행 블록 단위, 메모리 사용량 = n × k)
+
+    Returns:
+        ndarray: n × k uint16 거리 행렬
+    """
+    n, k = len(sequences), len(medoid_sequences)
+    distances = np.empty((n, k), dtype=np.uint16)
+    block_rows = max(1, block_bytes // (4 * max(k, 1)))
+
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        distances[start:stop] = process.cdist(sequences[start:stop], medoid_sequences, scorer=Levenshtein.distance,
+                                              dtype=np.int32, workers=workers)
+    return distances
+
+
+def _weighted_kmedoids(distances, weights, n_clusters, rng, max_iter=100):
+    """
+    표본 거리 행렬에서 가중 k-medoids (k-medoids++ 초기화 후 assign / update 반복)
+
+    Returns:
+        ndarray: medoid의 표본 내 index
+    """
+    n = len(distances)
+
+    # k-medoids++ : 이미 고른 medoid에서 먼 variant일수록 (빈도 × 거리²) 비율로 선택
+    medoids = [rng.choice(n, p=weights / weights.sum())]
+    closest = distances[medoids[0]].astype(np.float64)
+    for _ in range(n_clusters - 1):
+        score = weights * closest ** 2
+        candidate = rng.choice(n, p=score / score.sum()) if score.sum() > 0 else rng.choice(np.setdiff1d(np.arange(n), medoids))
+        medoids.append(candidate)
+        closest = np.minimum(closest, distances[candidate])
+    medoids = np.array(medoids)
+
+    for _ in range(max_iter):
+        labels = distances[:, medoids].argmin(axis=1)
+        labels[medoids] = np.arange(n_clusters)
+
+        # 군집마다 (빈도 가중) 거리 합이 가장 작은 구성원을 새 medoid로
+        updated = medoids.copy()
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(labels == cluster)
+            cost = weights[members] @ distances[np.ix_(members, members)]
+            updated[cluster] = members[cost.argmin()]
+
+        if (updated == medoids).all():
+            break
+        medoids = updated
+
+    return medoids
+
+
+def clara(sequences, n_clusters, weights=None, n_samples=5, sample_size=1000, max_iter=100,
+          random_state=42, workers=-1):
+    """
+    CLARA 방식 k-medoids
+
+    1) variant 표본을 균등하게 추출
+    2) 표본 안에서만 거리 행렬을 만들어 가중 k-medoids (빈도는 비용 가중치로 한 번만 반영)
+    3) 전체 variant를 가장 가까운 medoid에 배정하여 가중 비용 계산
+    n_samples번 반복하여 전체 비용이 가장 작은 medoid 선택 (전체 n × n 행렬은 만들지 않음)
+    표본이 전체(sample_size ≥ n)이면 같은 거리 행렬에서 k-medoids++ 초기값만 바꾸어 n_samples번 반복
+
+    빈도 비례 표본에 가중 비용까지 쓰면 빈도가 두 번(빈도²) 반영되어 medoid가 흔한 variant 쪽으로 치우침
+
+    Args:
+        sequences: 정수 코드 list의 list (variant별)
+        n_clusters: 군집 수
+        weights: variant별 케이스 수 (None이면 모두 1)
+        n_samples: 표본 추출 횟수
+        sample_size: 표본 크기
+        random_state: 난수 seed
+
+    Returns:
+        dict:
+            - medoids          : medoid variant index
+            - clusters         : variant별 군집 번호
+            - medoid_distances : variant × medoid 거리 (uint16)
+            - cost             : 빈도 가중 거리 합
+    """
+    n = len(sequences)
+    if n_clusters > n:
+        raise ValueError(f"군집 수({n_clusters})가 시퀀스 수({n})보다 많습니다")
+
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    rng = np.random.default_rng(random_state)
+    sample_size = min(max(sample_size, n_clusters), n)
+
+    best = None
+    sample_distances = None
+    for _ in range(n_samples):
+        if sample_size < n or sample_distances is None:
+            sample = np.sort(rng.choice(n, size=sample_size, replace=False)) if sample_size < n else np.arange(n)
+            sample_sequences = [sequences[i] for i in sample]
+            sample_distances = process.cdist(sample_sequences, sample_sequences, scorer=Levenshtein.distance,
+                                             dtype=np.int32, workers=workers)
+
+        medoids = sample[_weighted_kmedoids(sample_distances, weights[sample], n_clusters, rng, max_iter)]
+
+        medoid_distances = nearest_medoids(sequences, [sequences[i] for i in medoids], workers=workers)
+        cost = float(weights @ medoid_distances.min(axis=1))
+
+        if best is None or cost < best['cost']:
+            best = {'medoids': medoids, 'medoid_distances': medoid_distances, 'cost': cost}
+
+    clusters = best['medoid_distances'].argmin(axis=1)
+    clusters[best['medoids']] = np.arange(n_clusters)
+    best['clusters'] = clusters
+
+    return best
@@ -1,10 +1,24 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from sklearn.manifold import MDS as multidimensional_scaling
-from scipy.cluster.hierarchy import dendrogram, linkage
+from scipy.spatial.distance import squareform
 
+from .embedding import classical_mds
+from .embedding import landmark_mds
+
+
+def MDS_coords(matrix, method='smacof'):
+    """
+        거리 행렬 → 2차원 좌표
+        method : 'smacof' (sklearn 반복 계산) 또는 'classical' (고유값 분해 한 번)
+    """
+    if method == 'classical':
+        return classical_mds(matrix, n_components=2)
+
+    # condensed 거리 배열이면 정사각 행렬로 변환
+    if np.ndim(matrix) == 1:
+        matrix = squareform(np.asarray(matrix), checks=False)
+
+    from sklearn.manifold import MDS as multidimensional_scaling
 
-def MDS_coords(matrix):
     mds = multidimensional_scaling(
         n_components=2,
         dissimilarity='precomputed',
@@ -14,14 +28,44 @@ def MDS_coords(matrix):
     return mds_coords
 
 
-def MDS(clustered_result):
+def mds_coordinates(clustered_result, method='auto', n_landmarks=500):
+    """
+        군집 결과의 2차원 좌표 (결과의 'coords'에 캐시)
+        같은 ClusteredTraces의 결과들은 'coords' dict를 공유하므로, 군집 수를 바꿔 다시 그려도 좌표는 다시 계산하지 않음
+
+        method :
+            - 'auto'      : 거리 행렬이 있고 variant가 5000개 이하면 'classical', 아니면 'landmark'
+            - 'classical' : 전체 거리 행렬의 classical MDS
+            - 'landmark'  : n_landmarks개 landmark 기반 MDS (전체 거리 행렬 불필요, CLARA 결과 등)
+            - 'smacof'    : 기존 sklearn MDS
+    """
+    if method == 'auto':
+        method = 'classical' if 'distances' in clustered_result and len(clustered_result['labels']) <= 5000 else 'landmark'
+
+    key = ('landmark', n_landmarks) if method == 'landmark' else method
+    cache = clustered_result.setdefault('coords', {})
+
+    if key not in cache:
+        if method == 'landmark':
+            cache[key] = landmark_mds(clustered_result['codes'], n_landmarks=n_landmarks)
+        elif method in ('classical', 'smacof'):
+            cache[key] = MDS_coords(clustered_result['distances'], method=method)
+        else:
+            raise ValueError(f"지원하지 않는 MDS method입니다 : {method}")
+
+    return cache[key]
+
+
+def MDS(clustered_result, method='auto', n_landmarks=500, max_labels=500):
     """
         2-Axis Coordination위에 다차원척도법으로 시각화하는 함수
+        (좌표 계산 방식은 mds_coordinates 참고, variant가 max_labels개보다 많으면 점 라벨 생략)
     """
-    matrix = clustered_result['distances']
+    import matplotlib.pyplot as plt
+
     trace_labels = clustered_result['labels']
     clusters = clustered_result['clusters']
-    mds_coords = MDS_coords(matrix)
+    mds_coords = mds_coordinates(clustered_result, method=method, n_landmarks=n_landmarks)
 
     plt.figure(figsize=(10, 8))
 
@@ -35,7 +79,7 @@ def MDS(clustered_result):
     )
 
     # 각 점 위에 T00 등 라벨 추가
-    for i, label in enumerate(trace_labels):
+    for i, label in enumerate(trace_labels if len(trace_labels) <= max_labels else []):
         plt.text(
             mds_coords[i, 0] + 0.02,
             mds_coords[i, 1] + 0.02,
@@ -53,13 +97,24 @@ def MDS(clustered_result):
 
 
 def Dendrogram(clustered_result):
-    matrix = clustered_result['distances']
+    import matplotlib.pyplot as plt
+    from scipy.cluster.hierarchy import dendrogram, linkage
+
     trace_labels = clustered_result['labels']
-    trace_sequences = clustered_result['sequences']
-    clusters = clustered_result['clusters']
-    n_clusters = clustered_result['n_clusters']
 
-    linked = linkage(matrix, method='complete')
+    if 'distances' not in clustered_result:
+        print("Dendrogram은 hierarchical 엔진 결과에서만 그릴 수 있습니다 (군집 구성만 출력)")
+        cluster_composition(clustered_result)
+        return
+
+    matrix = clustered_result['distances']
+
+    # linkage는 condensed 거리 배열을 받아야 함 (정사각 행렬을 넣으면 관측값으로 보고 거리를 다시 계산)
+    linked = clustered_result.get('linkage')
+    if linked is None:
+        if np.ndim(matrix) == 2:
+            matrix = squareform(matrix, checks=False)
+        linked = linkage(np.asarray(matrix), method='complete')
 
     plt.figure(figsize=(14, 7))
 
@@ -79,6 +134,18 @@ def Dendrogram(clustered_result):
     plt.grid(axis='y', linestyle='--', alpha=0.4)
     plt.show()
 
+    cluster_composition(clustered_result)
+
+
+def cluster_composition(clustered_result):
+    """
+        군집별 구성 Variant 출력
+    """
+    trace_labels = clustered_result['labels']
+    trace_sequences = clustered_result['sequences']
+    clusters = clustered_result['clusters']
+    n_clusters = clustered_result['n_clusters']
+
     cluster_dict = {i: [] for i in range(n_clusters)}
 
     for idx, c in enumerate(clusters):
@@ -2,41 +2,67 @@
 # __all__=["Function1", "Function2", ...  ]
 # __doc__= "discription"
 # 외부 파일에서 import 시에는 from <Directory> import ( <function>, <function>, ...)
+#
+# 공개 이름은 처음 접근할 때 해당 하위 모듈을 import (PEP 562 module __getattr__)
+# → import mining 만으로는 pandas, pm4py, BigQuery, plotly, pyvis 등을 불러오지 않음
+# 새 함수를 공개할 때는 _EXPORTS에 '이름': '하위 모듈'을 추가
 
+import importlib
+import importlib.util
 
-from .preprocessing import define_at_bat_cases
-from .preprocessing import assign_group_index_two_pointer
-from .preprocessing import one_way_filter
 
-from .pipeline import preprocessing_df
-from .pipeline import one_step_EDA_from_bigquery
-from .pipeline import one_step_EDA_from_csv
+_EXPORTS = {
+    'define_at_bat_cases':            'preprocessing',
+    'assign_group_index_two_pointer': 'preprocessing',
+    'segment_runs':                   'preprocessing',
+    'one_way_filter':                 'preprocessing',
 
-from .probability import BasedTraces
-from .probability import prepare_eventLog
-from .probability import create_eventlog_from_dataFrame
+    'preprocessing_df':               'pipeline',
+    'one_step_EDA_from_bigquery':     'pipeline',
+    'one_step_EDA_from_csv':          'pipeline',
+    'stream_transitions_from_csv':    'pipeline',
+    'refresh_transitions':            'pipeline',
+    'run_pitchers':                   'batch',
+    'PipelinePlan':                   'planner',
 
+    'BasedTraces':                    'probability',
+    'prepare_eventLog':               'probability',
+    'create_eventlog_from_dataFrame': 'probability',
 
-from .exploratory import ProcessEDA
+    'TraceStore':                     'traces',
+    'count_transitions':              'transitions',
+    'TransitionResult':               'transitions',
 
-from .visualizer import sankey_visualizer
-from .visualizer import interactive_graph
+    'ProcessEDA':                     'exploratory',
 
-from .utils import load_data_from_bigquery
+    'sankey_visualizer':              'visualizer',
+    'interactive_graph':              'visualizer',
+    'OutputSink':                     'sinks',
+    'prune_transitions':              'pruning',
 
+    'StageProfiler':                  'profiling',
+    'optimize_dtypes':                'schema',
+    'PITCH_SCHEMA':                   'schema',
 
-__all__ = [    
-    'define_at_bat_cases',
-    'assign_group_index_two_pointer',
-    'one_way_filter',
-    'preprocessing_df',
-    'one_step_EDA_from_bigquery',
-    'one_step_EDA_from_csv',
-    'BasedTraces',
-    'prepare_eventLog',
-    'create_eventlog_from_dataFrame',
-    'ProcessEDA',
-    'sankey_visualizer',
-    'interactive_graph',
-    'load_data_from_bigquery'
-]
+    'load_data_from_bigquery':        'utils',
+    'QueryCache':                     'cache',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        # 하위 모듈 자체에 접근 (예 : mining.pipeline)
+        if not name.startswith('__') and importlib.util.find_spec(f"{__name__}.{name}") is not None:
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,150 @@
+"""
+여러 투수 일괄 분석 모듈
+하나의 투구 테이블을 pitcher별로 나누어 프로세스 풀에서 전처리 → BasedTraces → ClusteredTraces 실행
+"""
+import os
+import shutil
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .pipeline import preprocessing_df
+from .preprocessing import one_way_filter
+from .probability import BasedTraces
+from .schema import optimize_dtypes
+
+
+# 리포트 컬럼 순서
+REPORT_COLUMNS = ['pitcher', 'status', 'n_pitches', 'n_cases',
+                  'load_sec', 'preprocess_sec', 'transition_sec', 'cluster_sec', 'total_sec',
+                  'error', 'traceback']
+
+# 워커 프로세스마다 한 번만 여는 Arrow 테이블 (경로 → memory-mapped Table)
+_worker_tables = {}
+
+
+def _open_table(path):
+    """Arrow IPC 파일을 memory-map으로 열기 (복사 없이 OS 페이지 캐시를 프로세스끼리 공유)"""
+    if path not in _worker_tables:
+        source = pa.memory_map(path, 'r')
+        _worker_tables[path] = pa.ipc.open_file(source).read_all()
+    return _worker_tables[path]
+
+
+def _run_pitcher(path, pitcher, start, stop, options):
+    """
+    워커에서 투수 한 명 분석
+    예외가 나도 배치를 멈추지 않도록 결과 dict에 상태와 오류를 담아 반환
+    """
+    report = {'pitcher': pitcher, 'n_pitches': stop - start, 'status': 'ok', 'error': None}
+    output = {}
+    started = time.perf_counter()
+
+    try:
+        stage = time.perf_counter()
+        df = _open_table(path).slice(start, stop - start).to_pandas()
+        report['load_sec'] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        df_preprocess = preprocessing_df(df, start_name=options['start_name'], end_name=options['end_name'],
+                                         case_type=options['case_type'], case_keys=options['case_keys'])
+        if options['events'] is not None:
+            df_preprocess = one_way_filter(df_preprocess, 'events', options['events'])
+        report['n_cases'] = df_preprocess['processID'].nunique()
+        report['preprocess_sec'] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        output['transitions'] = BasedTraces(df_preprocess)()
+        report['transition_sec'] = time.perf_counter() - stage
+
+        if options['n_clusters'] is not None:
+            from clustering.distance import ClusteredTraces
+
+            stage = time.perf_counter()
+            # pm4py Trace는 만들지 않음 (워커에서 pm4py import 없음, 부모 프로세스로 보낼 필요도 없음)
+            output['clusters'] = ClusteredTraces(df_preprocess)(n_clusters=options['n_clusters'], traces=False)
+            report['cluster_sec'] = time.perf_counter() - stage
+
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = f"{type(e).__name__}: {e}"
+        report['traceback'] = traceback.format_exc()
+
+    report['total_sec'] = time.perf_counter() - started
+    return pitcher, output, report
+
+
+def run_pitchers(df, n_clusters=None, max_workers=None, events=('strikeout',),
+                 start_name='start', end_name='end', case_type=None, case_keys='date_batter'):
+    """
+    투구 테이블을 pitcher별로 나누어 병렬 분석
+
+    - 테이블은 한 번만 Arrow IPC 파일로 기록하고, 워커는 memory-map으로 자기 구간만 읽음 (DataFrame pickle 없음)
+    - 투수별 실행 시간과 실패를 기록하며, 일부 투수가 실패해도 나머지는 계속 진행
+
+    Args:
+        df: 여러 투수의 투구 데이터 (pitcher 컬럼 필요)
+        n_clusters: ClusteredTraces 군집 수 (None이면 군집 분석 생략)
+        max_workers: 프로세스 수 (None이면 CPU 수)
+        events: 케이스 필터 조건 (one_way_filter의 posCondition, None이면 필터 없음)
+
+    Returns:
+        tuple: (results, report)
+            - results : 성공한 투수만 {pitcher: {'transitions': TransitionResult, 'clusters': dict}}
+            - report  : 투수별 상태, 오류, 단계별 실행 시간(초) DataFrame
+    """
+    options = {
+        'n_clusters': n_clusters,
+        'events': list(events) if events is not None else None,
+        'start_name': start_name,
+        'end_name': end_name,
+        'case_type': case_type,
+        'case_keys': case_keys,
+    }
+
+    # pitcher별로 연속된 구간이 되도록 stable 정렬 (투수 안의 행 순서는 유지)
+    # 작은 dtype으로 변환한 뒤 기록 (category → Arrow dictionary 배열 : 파일과 워커의 DataFrame 모두 작아짐)
+    df_sorted = optimize_dtypes(df).sort_values(by='pitcher', kind='stable').reset_index(drop=True)
+    pitchers = df_sorted['pitcher'].to_numpy()
+    starts = np.flatnonzero(np.append(True, pitchers[1:] != pitchers[:-1])) if len(pitchers) else np.empty(0, dtype=np.int64)
+    bounds = np.append(starts, len(pitchers))
+
+    tmp_dir = tempfile.mkdtemp(prefix='pitch_batch_')
+    path = os.path.join(tmp_dir, 'pitches.arrow')
+    results, reports = {}, []
+
+    try:
+        table = pa.Table.from_pandas(df_sorted, preserve_index=False)
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        del table, df_sorted
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_pitcher, path, pitchers[start].item(), int(start), int(stop), options): pitchers[start].item()
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            }
+
+            for future in as_completed(futures):
+                try:
+                    pitcher, output, report = future.result()
+                except Exception as e:
+                    # 워커 프로세스 자체가 죽은 경우
+                    pitcher, output = futures[future], {}
+                    report = {'pitcher': pitcher, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+
+                if report['status'] == 'ok':
+                    results[pitcher] = output
+                reports.append(report)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = pd.DataFrame(reports, columns=REPORT_COLUMNS)
+    report = report.sort_values(by='pitcher', kind='stable').reset_index(drop=True)
+
+    return results, report
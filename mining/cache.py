@@ -0,0 +1,145 @@
+"""
+쿼리 결과 로컬 캐시 모듈
+BigQuery 결과 DataFrame을 Parquet 파일로 저장하여 같은 쿼리를 다시 실행하지 않도록 함
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+
+import pandas as pd
+
+
+class QueryCache:
+    """
+    쿼리 텍스트와 파라미터의 해시를 키로 하는 Parquet 캐시
+
+    - 파일 수정 시각(mtime) = 저장 시각 → ttl(초)이 지나면 만료
+    - 파일 접근 시각(atime) = 마지막 사용 시각 → max_bytes를 넘으면 오래 사용하지 않은 파일부터 삭제 (LRU)
+    - 저장 중 프로세스가 종료되어 남은 임시 파일(*.tmp)은 ttl과 tmp_ttl 중 긴 시간이 지나면 evict에서 삭제
+      (다른 프로세스가 아직 쓰는 중인 임시 파일은 지우지 않도록 tmp_ttl보다 오래된 것만)
+
+    Args:
+        cache_dir: 캐시 디렉토리
+        ttl: 유효 시간(초), None이면 만료 없음
+        max_bytes: 캐시 디렉토리 최대 크기, None이면 제한 없음
+    """
+
+    suffix = '.parquet'
+    tmp_suffix = '.tmp'
+    tmp_ttl = 60 * 60  # 임시 파일 최소 보관 시간(초) : 한 번의 저장이 이보다 오래 걸리지는 않음
+
+    def __init__(self, cache_dir='.cache/bigquery', ttl=24 * 60 * 60, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(query, params=None):
+        """쿼리 텍스트 + 파라미터 → sha256 해시"""
+        payload = json.dumps({'query': query, 'params': params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def _is_expired(self, path):
+        return self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl
+
+    def _is_stale_tmp(self, path):
+        ttl = self.tmp_ttl if self.ttl is None else max(self.ttl, self.tmp_ttl)
+        return time.time() - os.path.getmtime(path) > ttl
+
+    def get(self, key):
+        """
+        캐시된 DataFrame 반환 (없거나 만료되었으면 None)
+        """
+        path = self._path(key)
+        try:
+            if self._is_expired(path):
+                os.remove(path)
+                return None
+
+            df = pd.read_parquet(path)
+
+            # LRU : 접근 시각만 갱신 (저장 시각은 유지)
+            os.utime(path, (time.time(), os.path.getmtime(path)))
+        except FileNotFoundError:
+            # 캐시에 없거나 다른 프로세스가 먼저 삭제한 경우
+            return None
+
+        return df
+
+    def put(self, key, df):
+        """
+        DataFrame 저장 (임시 파일에 쓴 뒤 교체하여 동시 실행에도 안전)
+        쓰는 중 실패하면 임시 파일을 지우고 예외를 그대로 전달 (기존 캐시 파일은 바뀌지 않음)
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}{self.tmp_suffix}"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        만료된 파일과 오래된 임시 파일 삭제 후, 전체 크기가 max_bytes 이하가 될 때까지 오래 사용하지 않은 파일부터 삭제
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+
+            # put이 쓰는 임시 파일 : <key>.parquet.<uuid>.tmp
+            if name.endswith(self.tmp_suffix) and self.suffix + '.' in name:
+                try:
+                    if self._is_stale_tmp(path):
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+
+            if not name.endswith(self.suffix):
+                continue
+
+            try:
+                if self._is_expired(path):
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        if self.max_bytes is None:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """캐시 파일 전체 삭제"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.suffix):
+                os.remove(os.path.join(self.cache_dir, name))
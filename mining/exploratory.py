@@ -4,7 +4,11 @@
 
 from .visualizer import sankey_visualizer
 from .visualizer import interactive_graph
+from .sinks import OutputSink
+from .pruning import prune_transitions
 from .utils import extract_stage_number
+from .transitions import TransitionResult
+from functools import cached_property
 import pandas as pd
 
 class ProcessEDA:
@@ -12,21 +16,33 @@ class ProcessEDA:
     이벤트 로그 기반 탐색적 데이터 분석(EDA) 모듈
     
     Args:
-        calculation (dict): EventLogToProbability 클래스의 계산 결과 딕셔너리.
+        calculation (TransitionResult | dict): BasedTraces의 계산 결과 (또는 기존 dict 형태).
         (case_id, activity, timestamp 등의 표준 컬럼 포함 가정)
+
+    Attributes:
+        profile (StageProfiler | None): 파이프라인을 profile 옵션으로 실행했을 때의 단계별 계측 (profile.report())
     """
 
-    def __init__(self, calculation: dict):
+    def __init__(self, calculation):
         """클래스 초기화 및 계산 결과 저장"""
+        # 각 View는 처음 접근할 때 계산 (EventLog는 Frequency.visualizer에서 필요할 때 변환)
         self.calc = calculation
+        self.result = calculation if isinstance(calculation, TransitionResult) else None
+        self.profile = None
         
-        self.Descriptive = self._Descriptive(self.calc)
-        self.Transition = self._Transition(self.calc)
+        self.Descriptive = self._Descriptive(self.calc, self.result)
+        self.Transition = self._Transition(self.calc, self.result)
 
     class _Descriptive:
-        def __init__(self, calculation):
+        def __init__(self, calculation, result=None):
             self.calc = calculation
-            self.data = self.calc.get('data', {})
+            self.result = result
+
+        @cached_property
+        def data(self):
+            if self.result is not None:
+                return self.result.data
+            return self.calc.get('data', {})
 
         @property
         def maximum_frequencey(self):
@@ -69,12 +85,24 @@ class ProcessEDA:
                 print('='*50)           
 
     class _Transition:
-        def __init__(self, calculation: dict):
+        def __init__(self, calculation: dict, result=None):
             self.calc = calculation 
+            self.result = result
             
             self.Probability = self._Probability(self) 
             self.Frequency = self._Frequency(self) 
 
+        def _calculated(self, view, kind):
+            """
+            view : 'all', 'length', 'layer', 'layer_length' / kind : 'counts', 'probs'
+            """
+            if self.result is not None:
+                counts, probs = self.result.view(layered=view in ('layer', 'layer_length'), by_length=view in ('length', 'layer_length'))
+                return counts if kind == 'counts' else probs
+
+            calc = self.calc if view == 'all' else self.calc[view]
+            return calc.get(kind, {})
+
         def _grouped_transition_faired_set(self, grouped_transition_data):
             grouped_df_set={}
             for length, transition_data in grouped_transition_data.items():
@@ -102,42 +130,83 @@ class ProcessEDA:
 
         class _Probability:
             def __init__(self, parent):
-                self.all_probs = parent._transition_faired_set(parent.calc['probs'])
-                self.len_probs = parent._grouped_transition_faired_set(parent.calc['length']['probs'])
-                self.layer_probs = parent._transition_faired_set(parent.calc['layer']['probs'])
-                self.len_layer_probs = parent._grouped_transition_faired_set(parent.calc['layer_length']['probs'])
-                
-            def visualizer(self, layered=True, grouped=True):
+                self._parent = parent
+
+            @cached_property
+            def all_probs(self):
+                return self._parent._transition_faired_set(self._parent._calculated('all', 'probs'))
+
+            @cached_property
+            def len_probs(self):
+                return self._parent._grouped_transition_faired_set(self._parent._calculated('length', 'probs'))
+
+            @cached_property
+            def layer_probs(self):
+                return self._parent._transition_faired_set(self._parent._calculated('layer', 'probs'))
+
+            @cached_property
+            def len_layer_probs(self):
+                return self._parent._grouped_transition_faired_set(self._parent._calculated('layer_length', 'probs'))
                 
-                if layered is True:                    
-                    if grouped is True:
-                        for length, df_vis in self.len_layer_probs.items():
-                            sankey_visualizer(df_vis, length)
-                    else :
-                        length = 'Whole Data'
-                        df_vis = self.layer_probs
-                        sankey_visualizer(df_vis, length)
+            def visualizer(self, layered=True, grouped=True, output=None, prune=None):
+                """
+                전이 확률 시각화 (layered : Sankey, 아니면 네트워크 그래프)
+
+                Args:
+                    output: None이면 화면/브라우저 출력
+                            디렉토리 경로(str)이면 html로 저장, OutputSink이면 지정한 형식으로 저장
+                            (파일 이름 : sankey_<length> / graph_<length>)
+                    prune: Sankey를 그리기 전에 적용할 prune_transitions 인자 dict
+                           (예 : {'top_k': 3, 'min_flow': 0.01, 'max_layer': 6})
+
+                Returns:
+                    list: 저장한 파일 경로
+                """
+                if isinstance(output, str):
+                    output = OutputSink(output)
 
+                if grouped is True:
+                    items = (self.len_layer_probs if layered is True else self.len_probs).items()
                 else:
-                    if grouped is True:
-                        for length, df_vis in self.len_probs.items():
-                            interactive_graph(df_vis)
-                    else :
-                        length = 'Whole Data'
-                        df_vis = self.all_probs
-                        interactive_graph(df_vis)
+                    items = [('Whole Data', self.layer_probs if layered is True else self.all_probs)]
+
+                paths = []
+                for length, df_vis in items:
+                    if layered is True:
+                        if prune:
+                            df_vis = prune_transitions(df_vis, **prune)
+                        paths += sankey_visualizer(df_vis, length, output=output)
+                    else:
+                        paths += interactive_graph(df_vis, output=output, name=f"graph_{length}")
+                return paths
 
 
         class _Frequency:
             def __init__(self, parent):
-                self.all_cnts = parent._transition_faired_set(parent.calc.get('counts', {}))
-                self.len_cnts = parent._grouped_transition_faired_set(parent.calc['length']['counts'])
-
-                self.event_log = parent.calc.get('event_log', {})
-                self.grouped_event_log = parent.calc['length'].get('event_log', {})
+                self._parent = parent
                 # self.layer_cnts = parent.calc['layer'].get('counts', {}),
                 # self.len_layer_cnts = parent._grouped_transition_faired_set(parent.calc['layer_length'].get('counts', {})
                 
+            @cached_property
+            def all_cnts(self):
+                return self._parent._transition_faired_set(self._parent._calculated('all', 'counts'))
+
+            @cached_property
+            def len_cnts(self):
+                return self._parent._grouped_transition_faired_set(self._parent._calculated('length', 'counts'))
+
+            @property
+            def event_log(self):
+                if self._parent.result is not None:
+                    return self._parent.result.event_log
+                return self._parent.calc.get('event_log', {})
+
+            @property
+            def grouped_event_log(self):
+                if self._parent.result is not None:
+                    return self._parent.result.grouped_event_log
+                return self._parent.calc['length'].get('event_log', {})
+
             def visualizer(self, layered=True, grouped=True):
 
                 from pm4py.algo.discovery.dfg import algorithm as dfg_discovery
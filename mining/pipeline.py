@@ -2,99 +2,283 @@
 파이프라인 모듈
 CSV > EDA 까지 한 flow로 가는 코드
 """
+import os
 import pandas as pd
 
 # custom
-from .utils import load_data_from_bigquery
+from .utils import load_data_from_bigquery, DEFAULT_TABLE
 
+from .preprocessing import CASE_KEYS
 from .preprocessing import define_at_bat_cases
 from .preprocessing import add_node_and_preprocess
 from .preprocessing import one_way_filter
+from .preprocessing import segment_runs
 
 from .probability import BasedTraces
+from .transitions import TransitionResult
 from .exploratory import ProcessEDA
+from .profiling import StageProfiler
+from .schema import optimize_dtypes, csv_dtypes, align_categories
+from .planner import PipelinePlan
 
 
 
-def preprocessing_df(df, start_name='start', end_name='end', case_type=None):
+def preprocessing_df(df, start_name='start', end_name='end', case_type=None, case_keys='date_batter', profile=None):
+    """
+    profile: 단계별 계측 (None이면 계측 안 함, True 또는 StageProfiler)
+    """
+    profiler = StageProfiler.resolve(profile)
 
     # case 정의
-    df_grouped = define_at_bat_cases(df)
+    with profiler.stage('define_cases') as stage:
+        df_grouped = define_at_bat_cases(df, case_keys=case_keys)
+        profiler.observe(stage, df_grouped)
 
-    # 결측치 indexing (pitch_type)
-    missing_index = set(df_grouped[df_grouped['pitch_type'].isna()]['processID'])
-    valid_index = ~df_grouped['processID'].isin(missing_index)
-    
-    # 결측치 제거
-    df_valid = df_grouped[valid_index]
+    # 결측치 indexing (pitch_type) 및 제거
+    with profiler.stage('drop_missing') as stage:
+        missing_index = set(df_grouped[df_grouped['pitch_type'].isna()]['processID'])
+        valid_index = ~df_grouped['processID'].isin(missing_index)
+        df_valid = df_grouped[valid_index]
+        profiler.observe(stage, df_valid)
     
     # 시작, 종료 노드 추가
-    df_added = add_node_and_preprocess(df_valid, start_name, end_name, case_type=case_type)
+    with profiler.stage('add_nodes') as stage:
+        df_added = add_node_and_preprocess(df_valid, start_name, end_name, case_type=case_type)
+        profiler.observe(stage, df_added)
 
     return df_added
 
 
-def one_step_EDA_from_bigquery(path="key.json", limit=None, start_name='start', end_name='end', case_type=None):
+def _analyze(df_preprocess, profiler):
+    """전처리 결과 → 필터링 → 전이 계산 → ProcessEDA (단계별 계측)"""
+    # Data Filtering
+    with profiler.stage('filter') as stage:
+        df_filtered = one_way_filter(df_preprocess, 'events', ['strikeout'])
+        profiler.observe(stage, df_filtered)
+
+    # Event Log 데이터를 Probability로 계산 (정수 코드 Trace 저장소 → 전이 빈도/확률)
+    calc_eventlog = BasedTraces(df_filtered)
+    with profiler.stage('trace_store') as stage:
+        traces = calc_eventlog.traces
+        if stage is not None:
+            stage['rows'], stage['cases'] = traces.n_events, len(traces)
+    with profiler.stage('transitions'):
+        final_result = calc_eventlog()
+
+    # Probability Based EDA : 기술통계량 및 시각화
+    with profiler.stage('eda'):
+        eda = ProcessEDA(final_result)
+
+    return eda
+
+
+def one_step_EDA_from_bigquery(path="key.json", limit=None, start_name='start', end_name='end', case_type=None, case_keys='date_batter', cache=None, profile=None, optimize=True,
+                               start_date=None, end_date=None, pitchers=None, pushdown=True, client=None, table=DEFAULT_TABLE):
     """
     전체 분석 파이프라인 실행
     
     Args:
         key_path: BigQuery 키 파일 경로
-        limit: 데이터 제한 (None이면 전체)
+        limit: 데이터 제한 (조건을 적용하기 전 Statcast 순서의 앞 limit행, None이면 전체)
         min_prob: 전이 확률 최소 임계값
         case_type: 분석할 케이스 타입 ('out' 또는 'reach')
+        case_keys: 케이스(타석) 정의 키 ('date_batter', 'at_bat', 'inning' 또는 컬럼명 tuple)
+        cache: 로컬 Parquet 캐시 (None, True 또는 QueryCache 객체)
+        profile: 단계별 계측 (None이면 계측 안 함, True 또는 StageProfiler → eda.profile)
+        optimize: True이면 로드 직후 PITCH_SCHEMA dtype(category, int32, float32 등)으로 변환 (결과는 같고 메모리 사용량 감소)
+        start_date, end_date: game_date 범위 (None이면 제한 없음, 양 끝 포함)
+        pitchers: 투수 ID 목록 (None이면 제한 없음)
+        pushdown: True이면 필요한 컬럼, 날짜/투수 조건, 삼진 케이스 조건을 쿼리에서 적용 (PipelinePlan.sql)
+                  - limit은 조건을 적용하기 전 원본의 행 수 (Statcast 순서의 앞 limit행, pushdown=False와 같음)
+                  - 케이스 경계는 쿼리에서 Statcast 순서(ROW_ORDER)로 나눈 케이스 번호(CASE_RUN)를 사용하므로 결과는 pushdown=False와 같음
+                  False이면 전체를 읽은 뒤 같은 조건을 메모리에서 적용
+        client: BigQuery Client (None이면 path의 키로 생성, load_data_from_bigquery 참고)
+        table: 조회할 테이블
     
     Returns:
         dict: 분석 결과
     """
+    profiler = StageProfiler.resolve(profile)
+    plan = PipelinePlan(case_keys=case_keys, start_date=start_date, end_date=end_date, pitchers=pitchers)
+
     # Data Load
-    df = load_data_from_bigquery(key_path="key.json", limit=limit)
+    with profiler.stage('load') as stage:
+        if pushdown:
+            df = load_data_from_bigquery(key_path=path, limit=limit, cache=cache, client=client, table=table, plan=plan)
+            case_keys = plan.sql_case_keys
+        else:
+            df = plan.restrict(load_data_from_bigquery(key_path=path, limit=limit, cache=cache, client=client, table=table))
+        profiler.observe(stage, df)
 
-    # Data Preprocess
-    df_preprocess = preprocessing_df(df, start_name=start_name, end_name=end_name, case_type=case_type)
+    if optimize:
+        with profiler.stage('optimize_dtypes') as stage:
+            df = optimize_dtypes(df)
+            profiler.observe(stage, df)
 
-    # Data Filtering
-    df_filtered = one_way_filter(df_preprocess, 'events', ['strikeout'])
-
-    # Event Log 데이터를 Probability로 계산
-    calc_eventlog = BasedTraces(df_filtered) 
-    final_result = calc_eventlog()
+    # Data Preprocess
+    df_preprocess = preprocessing_df(df, start_name=start_name, end_name=end_name, case_type=case_type, case_keys=case_keys, profile=profiler)
 
-    # Probability Based EDA : 기술통계량 및 시각화
-    eda = ProcessEDA(final_result)
+    eda = _analyze(df_preprocess, profiler)
+    if profiler.enabled:
+        eda.profile = profiler
 
     return eda
     
-def one_step_EDA_from_csv(path:str, limit=None, start_name='start', end_name='end', case_type=None):
+def one_step_EDA_from_csv(path:str, limit=None, start_name='start', end_name='end', case_type=None, case_keys='date_batter', chunksize=None, profile=None, optimize=True,
+                          start_date=None, end_date=None, pitchers=None, pushdown=True):
     """
     전체 분석 파이프라인 실행
     
     Args:
-        key_path: BigQuery 키 파일 경로
-        limit: 데이터 제한 (None이면 전체)
-        min_prob: 전이 확률 최소 임계값
+        path: CSV 파일 경로
+        limit: 데이터 제한 (조건을 적용하기 전 파일의 앞 limit행, pushdown 여부와 관계없음, None이면 전체)
         case_type: 분석할 케이스 타입 ('out' 또는 'reach')
+        case_keys: 케이스(타석) 정의 키 ('date_batter', 'at_bat', 'inning' 또는 컬럼명 tuple)
+        chunksize: 지정하면 CSV를 chunksize 행씩 나누어 읽는 streaming 모드
+                   (결과는 한 번에 읽은 경우와 같음, 단 pm4py EventLog 기반 Frequency.visualizer는 사용 불가)
+        profile: 단계별 계측 (None이면 계측 안 함, True 또는 StageProfiler → eda.profile)
+                 streaming 모드에서는 청크마다 기록하고 리포트에서 단계별로 합산
+        optimize: True이면 라벨/실수 컬럼은 read_csv에서 바로 category/float32로 읽고, 정수 컬럼은 읽은 뒤 축소 (schema.PITCH_SCHEMA)
+        start_date, end_date: game_date 범위 (None이면 제한 없음, 양 끝 포함)
+        pitchers: 투수 ID 목록 (None이면 제한 없음)
+        pushdown: True이면 필요한 컬럼만 파싱하고, 청크 단위로 날짜/투수 조건과 삼진 케이스 조건을 적용 (PipelinePlan.read_csv)
+                  케이스 경계는 조건 적용 전 원본 순서로 정하므로 결과는 pushdown=False와 같음
     
     Returns:
-        dict: 분석 결과
+        ProcessEDA: 분석 결과
     """
-    # Data Load
-    df = pd.read_csv(path)
+    profiler = StageProfiler.resolve(profile)
+    plan = PipelinePlan(case_keys=case_keys, start_date=start_date, end_date=end_date, pitchers=pitchers)
 
-    # Data Preprocess
-    df_preprocess = preprocessing_df(df, start_name=start_name, end_name=end_name, case_type=case_type)
+    if chunksize is not None:
+        final_result = stream_transitions_from_csv(path, chunksize, limit=limit, start_name=start_name, end_name=end_name, case_type=case_type, case_keys=case_keys, profile=profiler, optimize=optimize,
+                                                   start_date=start_date, end_date=end_date, pitchers=pitchers, pushdown=pushdown)
+        with profiler.stage('eda'):
+            eda = ProcessEDA(final_result)
+    else:
+        # Data Load
+        with profiler.stage('load') as stage:
+            if pushdown:
+                df = plan.read_csv(path, limit=limit, optimize=optimize)
+                case_keys = plan.csv_case_keys
+            else:
+                df = pd.read_csv(path, nrows=limit, parse_dates=['game_date'], dtype=csv_dtypes() if optimize else None)
+                if optimize:
+                    df = optimize_dtypes(df)
+                df = plan.restrict(df)
+            profiler.observe(stage, df)
 
-    # Data Filtering
-    df_filtered = one_way_filter(df_preprocess, 'events', ['strikeout'])
+        # Data Preprocess
+        df_preprocess = preprocessing_df(df, start_name=start_name, end_name=end_name, case_type=case_type, case_keys=case_keys, profile=profiler)
 
-    # Event Log 데이터를 Probability로 계산
-    calc_eventlog = BasedTraces(df_filtered) 
-    final_result = calc_eventlog()
+        eda = _analyze(df_preprocess, profiler)
 
-    # Probability Based EDA : 기술통계량 및 시각화
-    eda = ProcessEDA(final_result)
+    if profiler.enabled:
+        eda.profile = profiler
 
-    
     return eda
 
 
+def _accumulate_transitions(result, df, start_name, end_name, case_type, case_keys, profiler=None):
+    """완결된 타석만 담긴 df를 전처리 → 필터링 → 전이 집계한 뒤 기존 결과에 합침"""
+    if len(df) == 0:
+        return result
+
+    profiler = StageProfiler.resolve(profiler)
+    df_preprocess = preprocessing_df(df, start_name=start_name, end_name=end_name, case_type=case_type, case_keys=case_keys, profile=profiler)
+
+    with profiler.stage('filter') as stage:
+        df_filtered = one_way_filter(df_preprocess, 'events', ['strikeout'])
+        profiler.observe(stage, df_filtered)
+    if len(df_filtered) == 0:
+        return result
+
+    with profiler.stage('transitions'):
+        partial = BasedTraces(df_filtered)()
+
+    if result is None:
+        return partial
+    with profiler.stage('merge'):
+        return result.update(partial)
+
+
+def stream_transitions_from_csv(path:str, chunksize=100_000, limit=None, start_name='start', end_name='end', case_type=None, case_keys='date_batter', profile=None, optimize=True,
+                                start_date=None, end_date=None, pitchers=None, pushdown=True):
+    """
+    CSV를 chunksize 행씩 읽으면서 전이 빈도를 누적 계산
+    - 청크의 마지막 타석은 다음 청크에서 이어질 수 있으므로 다음 청크 앞에 붙여서 처리
+    - 메모리 사용량 : 청크 크기 + 아직 끝나지 않은 타석 + 누적된 집계 결과
+    - profile : 단계별 계측 (None, True 또는 StageProfiler, 청크마다 기록)
+    - optimize : True이면 청크를 PITCH_SCHEMA dtype으로 읽음 (보류 타석과 합칠 때는 카테고리를 맞춰 category 유지)
+    - start_date, end_date, pitchers : 날짜/투수 조건 (청크마다 적용)
+    - pushdown : True이면 필요한 컬럼만 파싱 (PipelinePlan.scan_csv), False이면 전체 컬럼을 읽은 뒤 선택
+    
+    Returns:
+        TransitionResult: 한 번에 읽어서 계산한 결과와 같은 결과
+
+    Raises:
+        ValueError: 조건을 만족하는 타석이 하나도 없는 경우
+    """
+    keys = CASE_KEYS[case_keys] if isinstance(case_keys, str) else tuple(case_keys)
+    profiler = StageProfiler.resolve(profile)
+    plan = PipelinePlan(case_keys=keys, start_date=start_date, end_date=end_date, pitchers=pitchers)
+    result = None
+    pending = None
+
+    if pushdown:
+        chunks = plan.scan_csv(path, chunksize=chunksize, limit=limit, optimize=optimize)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, nrows=limit, parse_dates=['game_date'], dtype=csv_dtypes() if optimize else None)
+        chunks = (plan.restrict(optimize_dtypes(chunk) if optimize else chunk) for chunk in reader)
+
+    while True:
+        with profiler.stage('load') as stage:
+            chunk = next(chunks, None)
+            profiler.observe(stage, chunk)
+        if chunk is None:
+            break
+        if len(chunk) == 0:
+            continue
+
+        if pending is not None:
+            chunk = pd.concat(align_categories(pending, chunk), ignore_index=True)
+
+        # 마지막 타석은 보류
+        case_index = segment_runs(*(chunk[key] for key in keys))
+        is_open = case_index == case_index[-1]
+        pending = chunk[is_open]
+
+        result = _accumulate_transitions(result, chunk[~is_open], start_name, end_name, case_type, case_keys, profiler)
+
+    if pending is not None:
+        result = _accumulate_transitions(result, pending, start_name, end_name, case_type, case_keys, profiler)
+
+    if result is None:
+        raise ValueError(f"no cases matched : 조건을 만족하는 타석이 없습니다 ({path})")
+    return result
+
+
+def refresh_transitions(df_new, state_path, start_name='start', end_name='end', case_type=None, case_keys='date_batter'):
+    """
+    새로 들어온 투구 데이터(예: 하루치)만 처리하여 저장된 누적 결과에 더함
+    - state_path가 없으면 df_new만으로 새 누적 결과를 만들어 저장
+    - 작업량은 전체 이력이 아니라 새 데이터 크기에 비례
+    
+    Args:
+        df_new: 새 투구 데이터 DataFrame (완결된 타석만 포함)
+        state_path: 누적 결과(.npz) 파일 경로
+    
+    Returns:
+        TransitionResult: 갱신된 누적 결과 (df_new에 조건을 만족하는 타석이 없으면 저장된 결과 그대로)
+
+    Raises:
+        ValueError: 저장된 결과가 없고 df_new에도 조건을 만족하는 타석이 없는 경우
+    """
+    result = TransitionResult.load(state_path) if os.path.exists(state_path) else None
+    result = _accumulate_transitions(result, df_new, start_name, end_name, case_type, case_keys)
+
+    if result is None:
+        raise ValueError(f"no cases matched : 조건을 만족하는 타석이 없어 누적 결과를 만들 수 없습니다 ({state_path})")
+    result.save(state_path)
+
+    return result
@@ -0,0 +1,240 @@
+"""
+파이프라인 실행 계획 모듈
+분석에 필요한 컬럼만 읽고(projection), 날짜/투수 조건과 케이스(타석) 결과 조건을 데이터 소스에서 적용(pushdown)
+→ 분석에 쓰이지 않는 컬럼과 타석은 DataFrame으로 만들지 않음
+
+- BigQuery : SELECT 컬럼 목록, WHERE 날짜/투수 조건, window 함수로 원본 순서의 케이스를 나누고 조건을 만족하는 케이스만 조회
+- CSV      : usecols로 필요한 컬럼만 파싱, 청크마다 날짜/투수 조건 적용 후 케이스를 나누고 조건을 만족하는 케이스만 보관
+두 경우 모두 케이스 번호(CASE_RUN)를 붙여 반환하므로 파이프라인은 (CASE_RUN,)으로 케이스를 정의 (케이스 경계는 pushdown하지 않은 경우와 같음)
+
+limit 규칙 (pushdown 여부, BigQuery/CSV 모두 같음) : 원본의 앞 limit행만 읽은 뒤 행/케이스 조건을 적용
+- BigQuery : Statcast 순서(ROW_ORDER)의 앞 limit행 (source 서브쿼리, 기본 쿼리의 ORDER BY ... LIMIT과 같음)
+- CSV      : 파일의 앞 limit행 (pd.read_csv의 nrows)
+→ 조건을 적용한 뒤의 행 수가 아니며, limit 경계에 걸린 마지막 케이스는 limit 안의 투구만 포함
+"""
+import numpy as np
+import pandas as pd
+
+from .preprocessing import CASE_KEYS
+from .preprocessing import segment_runs
+from .schema import optimize_dtypes, csv_dtypes, align_categories
+from .utils import ROW_ORDER
+
+
+# 전처리(add_node_and_preprocess)와 전이 계산에 항상 필요한 컬럼
+BASE_COLUMNS = ('game_date', 'pitch_type', 'description', 'events')
+
+# pushdown 결과에서 원본 기준 케이스 번호를 담는 컬럼 (필터링 후 떨어져 있던 같은 키의 타석이 합쳐지지 않도록)
+CASE_RUN = 'caseRun'
+
+
+def _sql_literal(value):
+    """SQL 문자열 literal (작은따옴표, 역슬래시 escape)"""
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+class PipelinePlan:
+    """
+    one_step_EDA 파이프라인의 데이터 읽기 계획
+
+    - columns    : 읽을 컬럼 (BASE_COLUMNS + 케이스 키 + 조건 컬럼 + extra_columns)
+    - 행 조건    : start_date <= game_date <= end_date, pitcher ∈ pitchers
+    - 케이스 조건 : filter_column 값이 events 중 하나인 투구가 있는 케이스만 (one_way_filter와 같은 조건)
+
+    케이스 조건은 원본에서 미리 적용하는 것이고 파이프라인의 one_way_filter는 그대로 실행되므로 결과는 같음
+
+    Args:
+        case_keys: 케이스(타석) 정의 키 ('date_batter', 'at_bat', 'inning' 또는 컬럼명 tuple)
+        events: 케이스 조건 값 (None이면 케이스 조건 없음)
+        filter_column: 케이스 조건 컬럼
+        start_date, end_date: game_date 범위 (None이면 제한 없음, 양 끝 포함)
+        pitchers: 투수 ID 목록 (None이면 제한 없음)
+        extra_columns: 분석 후 추가로 사용할 컬럼 (예 : 'inning', 'balls')
+    """
+
+    def __init__(self, case_keys='date_batter', events=('strikeout',), filter_column='events',
+                 start_date=None, end_date=None, pitchers=None, extra_columns=()):
+        self.case_keys = CASE_KEYS[case_keys] if isinstance(case_keys, str) else tuple(case_keys)
+        self.events = list(events) if events is not None else None
+        self.filter_column = filter_column
+        self.start_date = pd.Timestamp(start_date) if start_date is not None else None
+        self.end_date = pd.Timestamp(end_date) if end_date is not None else None
+        self.pitchers = [int(pitcher) for pitcher in pitchers] if pitchers is not None else None
+        self.extra_columns = tuple(extra_columns)
+
+    @property
+    def columns(self):
+        """읽을 컬럼 (중복 없이 순서 유지)"""
+        columns = BASE_COLUMNS + self.case_keys + self.extra_columns
+        if self.events is not None:
+            columns += (self.filter_column,)
+        if self.pitchers is not None:
+            columns += ('pitcher',)
+        return list(dict.fromkeys(columns))
+
+    # ------------------------------------------------------------------ BigQuery
+
+    def _sql_row_condition(self, alias):
+        conditions = []
+        if self.start_date is not None:
+            conditions.append(f"CAST({alias}.game_date AS DATE) >= DATE '{self.start_date:%Y-%m-%d}'")
+        if self.end_date is not None:
+            conditions.append(f"CAST({alias}.game_date AS DATE) <= DATE '{self.end_date:%Y-%m-%d}'")
+        if self.pitchers is not None:
+            conditions.append(f"{alias}.pitcher IN ({', '.join(map(str, self.pitchers)) or 'NULL'})")
+        return conditions
+
+    @property
+    def sql_case_keys(self):
+        """sql 결과에 사용할 케이스 키 (원본 순서로 나눈 케이스 번호)"""
+        return (CASE_RUN,)
+
+    def sql(self, table, limit=None):
+        """
+        BigQuery 쿼리 (필요한 컬럼만, 행/케이스 조건은 쿼리에서 적용)
+
+        0) limit이 있으면 Statcast 순서(ROW_ORDER)의 앞 limit행만 source 서브쿼리로 읽음 (조건 적용 전)
+        1) 행 조건을 적용한 행에 Statcast 순서(ROW_ORDER)로 행 번호
+        2) 이전 행과 케이스 키가 다르면 새 케이스 → 누적합이 CASE_RUN (segment_runs와 같은 정의, NULL끼리는 같은 값)
+        3) 케이스 안에 조건(filter_column ∈ events)을 만족하는 투구가 있는 케이스만 행 번호 순서로 반환
+
+        Args:
+            table: 조회할 테이블
+            limit: 원본 테이블의 행 수 제한 (조건 적용 전, ROW_ORDER 기준 앞 limit행, None이면 전체)
+        """
+        select = ', '.join(f"t.{column}" for column in self.columns)
+        order = ', '.join(f"t.{column}" for column in ROW_ORDER)
+        conditions = self._sql_row_condition('t')
+        where = "\n      WHERE " + "\n        AND ".join(conditions) if conditions else ""
+        source = f"`{table}`"
+        if limit:
+            # 조건을 적용하기 전에 자름 (케이스 조건 뒤에 자르면 마지막 케이스가 잘리고, pushdown=False와 행 집합이 달라짐)
+            order_columns = [column.split()[0] for column in ROW_ORDER]
+            source_columns = ', '.join(dict.fromkeys(self.columns + order_columns))
+            source = f"(SELECT {source_columns} FROM `{table}` ORDER BY {', '.join(ROW_ORDER)} LIMIT {int(limit)})"
+
+        same_case = ' AND '.join(f"LAG({key}) OVER (ORDER BY rowOrder) IS NOT DISTINCT FROM {key}" for key in self.case_keys)
+        if self.events is not None:
+            matched = f"{self.filter_column} IN ({', '.join(map(_sql_literal, self.events)) or 'NULL'})"
+            case_filter = f"MAX(CASE WHEN {matched} THEN 1 ELSE 0 END) OVER (PARTITION BY {CASE_RUN})"
+        else:
+            case_filter = "1"
+        output = ', '.join(self.columns + [CASE_RUN])
+
+        query = f"""
+    WITH ordered AS (
+      SELECT {select}, ROW_NUMBER() OVER (ORDER BY {order}) AS rowOrder
+      FROM {source} AS t{where}
+    ),
+    starts AS (
+      SELECT *, CASE WHEN {same_case} THEN 0 ELSE 1 END AS caseStart
+      FROM ordered
+    ),
+    runs AS (
+      SELECT *, SUM(caseStart) OVER (ORDER BY rowOrder ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS {CASE_RUN}
+      FROM starts
+    ),
+    cases AS (
+      SELECT *, {case_filter} AS caseMatched
+      FROM runs
+    )
+    SELECT
+      {output}
+    FROM
+      cases
+    WHERE
+      caseMatched = 1
+    ORDER BY
+      rowOrder
+    """
+        return query
+
+    # ------------------------------------------------------------------ CSV / DataFrame
+
+    def row_mask(self, df):
+        """행 조건 (날짜/투수) bool 배열"""
+        mask = np.ones(len(df), dtype=bool)
+        if self.start_date is not None:
+            mask &= (df['game_date'] >= self.start_date).to_numpy()
+        if self.end_date is not None:
+            mask &= (df['game_date'] <= self.end_date).to_numpy()
+        if self.pitchers is not None:
+            mask &= df['pitcher'].isin(self.pitchers).to_numpy()
+        return mask
+
+    def restrict(self, df):
+        """이미 읽은 DataFrame에 컬럼 선택과 행 조건 적용 (pushdown하지 않는 경우, 케이스 조건은 one_way_filter에서)"""
+        df = df[[column for column in self.columns if column in df.columns]]
+        mask = self.row_mask(df)
+        return df if mask.all() else df[mask]
+
+    def scan_csv(self, path, chunksize=100_000, limit=None, optimize=True):
+        """
+        필요한 컬럼만 청크 단위로 읽고 행 조건을 적용한 청크를 차례로 반환 (케이스 조건은 적용하지 않음)
+
+        Args:
+            limit: 원본 CSV의 행 수 제한 (조건 적용 전, pd.read_csv의 nrows)
+        """
+        columns = self.columns
+        dtype = {column: value for column, value in csv_dtypes().items() if column in columns} if optimize else None
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, nrows=limit,
+                                 parse_dates=['game_date'], dtype=dtype):
+            if optimize:
+                chunk = optimize_dtypes(chunk)
+            mask = self.row_mask(chunk)
+            yield chunk if mask.all() else chunk[mask]
+
+    def read_csv(self, path, chunksize=100_000, limit=None, optimize=True):
+        """
+        CSV에서 조건을 만족하는 케이스만 읽기
+        케이스는 행 조건을 적용한 원본 순서 그대로 case_keys로 나눈 뒤 CASE_RUN 번호를 붙임
+        → 파이프라인은 case_keys 대신 (CASE_RUN,)으로 케이스를 정의 (csv_case_keys)
+
+        Returns:
+            DataFrame: 조건을 만족하는 케이스의 투구 (columns + CASE_RUN)
+        """
+        frames = []
+        pending = None
+        offset = 0
+
+        def keep(frame, final):
+            """완결된 케이스 중 조건을 만족하는 케이스만 frames에 추가, 마지막 케이스(미완결)는 반환"""
+            nonlocal offset
+            runs = segment_runs(*(frame[key] for key in self.case_keys))
+            is_open = np.zeros(len(frame), dtype=bool) if final else runs == runs[-1]
+
+            n_runs = runs[-1] + 1
+            if self.events is not None:
+                matched = np.zeros(n_runs, dtype=bool)
+                matched[runs[frame[self.filter_column].isin(self.events).to_numpy()]] = True
+                selected = matched[runs] & ~is_open
+            else:
+                selected = ~is_open
+
+            if selected.any():
+                frames.append(frame[selected].assign(**{CASE_RUN: runs[selected] + offset}))
+            offset += int(runs[is_open][0]) if is_open.any() else int(n_runs)
+            return frame[is_open] if is_open.any() else None
+
+        for chunk in self.scan_csv(path, chunksize=chunksize, limit=limit, optimize=optimize):
+            if len(chunk) == 0:
+                continue
+            if pending is not None:
+                chunk = pd.concat(align_categories(pending, chunk), ignore_index=True)
+            pending = keep(chunk, final=False)
+
+        if pending is not None:
+            keep(pending, final=True)
+
+        if not frames:
+            return pd.DataFrame(columns=self.columns + [CASE_RUN])
+        return pd.concat(align_categories(*frames), ignore_index=True)
+
+    @property
+    def csv_case_keys(self):
+        """read_csv 결과에 사용할 케이스 키"""
+        return (CASE_RUN,)
+
+    def __repr__(self):
+        return (f"PipelinePlan(case_keys={self.case_keys}, events={self.events}, start_date={self.start_date}, "
+                f"end_date={self.end_date}, pitchers={self.pitchers}, columns={self.columns})")
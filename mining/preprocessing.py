@@ -2,10 +2,68 @@
 데이터 전처리 모듈
 """
 
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 
 # Helper Functions
+def _is_categorical(values):
+    return isinstance(values.dtype, pd.CategoricalDtype)
+
+
+def _label_text(values):
+    """
+    라벨 컬럼을 문자열로 변환 (astype(str)과 같은 값)
+    category 컬럼은 카테고리 이름만 변환하여 category로 유지 (행마다 문자열을 만들지 않음)
+    """
+    if _is_categorical(values):
+        return values.cat.rename_categories(values.cat.categories.astype(str))
+    return values.astype(str)
+
+
+def _map_labels(values, mapping, default):
+    """
+    values.map(mapping).fillna(default)와 같은 값
+    category 컬럼은 카테고리만 매핑하여 코드 배열로 category를 다시 만듦 (여러 값 → 한 값 매핑도 category 유지)
+    """
+    if not _is_categorical(values):
+        return values.map(mapping).fillna(default)
+
+    # 마지막 원소 = 결측(코드 -1)의 매핑 결과
+    mapped = [mapping.get(category, default) for category in values.cat.categories] + [default]
+    lookup, labels = pd.factorize(pd.Index(mapped, dtype=object))
+    codes = lookup[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=values.index, name=values.name)
+
+
+def _join_labels(left, right, sep='_'):
+    """
+    left.astype(str) + sep + right.astype(str)와 같은 값
+    둘 중 하나라도 category이면 (left 코드, right 코드) 조합마다 한 번만 문자열을 만들어 category로 반환
+    """
+    if not (_is_categorical(left) or _is_categorical(right)):
+        return left.astype(str) + sep + right.astype(str)
+
+    left = _label_text(left.astype('category'))
+    right = _label_text(right.astype('category'))
+    width = len(right.cat.categories) + 1
+
+    # 결측(코드 -1)은 'nan' (astype(str)과 같음)
+    left_names = np.append(left.cat.categories.to_numpy(dtype=object), 'nan')
+    right_names = np.append(right.cat.categories.to_numpy(dtype=object), 'nan')
+    pairs = left.cat.codes.to_numpy(np.int64) * width + right.cat.codes.to_numpy(np.int64)
+    unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+
+    names = [f"{left_names[pair // width]}{sep}{right_names[pair % width]}" for pair in unique_pairs]
+    lookup, labels = pd.factorize(pd.Index(names, dtype=object))
+    return pd.Series(pd.Categorical.from_codes(lookup[inverse.ravel()], categories=labels), index=left.index)
+
+
+def _reset_index(df_event):
+    """reset_index(drop=True)와 같지만 데이터를 복사하지 않음 (이미 새로 만든 DataFrame에만 사용)"""
+    return df_event.set_axis(pd.RangeIndex(len(df_event)), axis=0, copy=False)
+
+
 def deleteNullPitchType(df_event):
     """
     pitch_type이 'nan'(문자열) 또는 None인 행 제거
@@ -14,8 +72,10 @@ def deleteNullPitchType(df_event):
     condition = ~df_event['processID'].isin(p_index)
     
     df_event = df_event[condition]
-    df_event = df_event.sort_values(by=['processID'], ascending=True).reset_index(drop=True)
-    return df_event
+    # define_at_bat_cases 결과는 이미 processID 순서 : 정렬(전체 복사)은 필요할 때만
+    if not df_event['processID'].is_monotonic_increasing:
+        df_event = df_event.sort_values(by=['processID'], ascending=True, kind='stable')
+    return _reset_index(df_event)
 
 def checkNullPitchType(df_event):
     """
@@ -47,7 +107,7 @@ def descriptionToGroups(df_event):
         'foul': 'I', # 인플레이(In-play)&파울
         'hit_into_play': 'I'
     }
-    df_event['grouped_description'] = df_event['description'].map(mapping).fillna('result')
+    df_event['grouped_description'] = _map_labels(df_event['description'], mapping, 'result')
     return df_event
 
 
@@ -56,10 +116,8 @@ def attach_case_result_to_pitch_type(df_event):
     각 투구의 pitch_type에 해당 타석의 최종 결과(out / reach / other)를 붙임
     예: SL → SL_out, SI → SI_reach
     """
-    # case_id별 마지막 이벤트 기반으로 결과 분류
-    case_results = df_event.groupby('processID')['events'].apply(
-        lambda x: x.dropna().iloc[-1] if len(x.dropna()) > 0 else None
-    )
+    # case_id별 마지막 이벤트(행 순서 기준, 결측 제외) 기반으로 결과 분류
+    case_results = df_event.groupby('processID', sort=False)['events'].last()
 
     def classify_result(event):
         if event in ['strikeout', 'out', 'field_out', 'force_out', 'double_play', 'triple_play',
@@ -71,13 +129,13 @@ def attach_case_result_to_pitch_type(df_event):
         else:
             return 'other'
 
-    case_results = case_results.apply(classify_result)
+    case_results = case_results.astype(object).apply(classify_result).astype('category')
 
-    # 원본 DataFrame에 결과 병합
-    df_event = df_event.merge(case_results.rename('case_result'), on='processID', how='left')
+    # 원본 DataFrame에 결과 병합 (processID → 결과 매핑 : merge와 달리 전체 DataFrame을 복사하지 않음)
+    df_event['case_result'] = df_event['processID'].map(case_results)
 
     # pitch_type + 결과 결합
-    df_event['pitch_type'] = df_event['pitch_type'] + '_' + df_event['case_result']
+    df_event['pitch_type'] = _join_labels(df_event['pitch_type'], df_event['case_result'])
 
     return df_event
 
@@ -93,115 +151,137 @@ def add_node_and_preprocess(df_event, start_name, end_name, case_type=None):
     # [2.1] 출루 유무에 따라 concept:name을 설정할 경우
     if case_type == 'reach' or case_type == 'out':
         acept_data = attach_case_result_to_pitch_type(acept_data)
-        acept_data['concept:name'] = acept_data['pitch_type'].astype(str)
+        acept_data['concept:name'] = _label_text(acept_data['pitch_type'])
         if case_type == 'reach+discription' or case_type == 'out+discription':
-            acept_data['concept:name'] = acept_data['pitch_type'].astype(str)+ "_" + acept_data['grouped_description'].astype(str) 
+            acept_data['concept:name'] = _join_labels(acept_data['pitch_type'], acept_data['grouped_description'])
     
     # [3] pm4py용 EventLog 포맷으로 변경 (Timestamp, CaseID, Activity)
     acept_data['time:timestamp'] = acept_data['game_date'] + pd.to_timedelta(acept_data['pitchOrder'], unit='s')
     acept_data['case:concept:name'] = acept_data['processID']
     if case_type == None:
-        acept_data['concept:name'] = acept_data['pitch_type'].astype(str)
+        acept_data['concept:name'] = _label_text(acept_data['pitch_type'])
     elif case_type == 'discription':
-        acept_data['concept:name'] = acept_data['pitch_type'].astype(str)+ "_" + acept_data['grouped_description'].astype(str) 
+        acept_data['concept:name'] = _join_labels(acept_data['pitch_type'], acept_data['grouped_description'])
 
-        
+    # category 라벨 컬럼에는 시작/종료 노드 이름을 카테고리로 추가 (concat 후에도 category 유지)
+    # ('reach+discription', 'out+discription'은 기존처럼 투구 행의 concept:name을 만들지 않음 → 시작/종료 행에만 값)
+    for column in ('pitch_type', 'concept:name'):
+        if column in acept_data.columns and _is_categorical(acept_data[column]):
+            categories = acept_data[column].cat.categories
+            names = [name for name in dict.fromkeys((start_name, end_name)) if name not in categories]
+            acept_data[column] = acept_data[column].cat.add_categories(names)
     
     # [4] 시작/종료 노드 추가
-    start_name = start_name
-    end_name = end_name
-    add_node_list = []
-
-    for process in acept_data['processID'].unique():
-        case_df = acept_data[acept_data['processID'] == process]
-        if len(case_df) > 0:
-            # 첫 번째 행을 복사하여 "In" 노드 생성
-            first_row = case_df.iloc[-1].copy()
-            first_row['time:timestamp'] = first_row['time:timestamp'] - timedelta(seconds=1)
-            first_row['case:concept:name'] = first_row['processID']
-            first_row['concept:name'] = start_name
-            first_row['pitch_type'] = start_name
-            first_row['pitchOrder'] = -1  # 시작 노드는 -1로 설정
-        
-            last_row = case_df.iloc[0].copy()
-            last_row['time:timestamp'] = last_row['time:timestamp'] + timedelta(seconds=1)
-            last_row['case:concept:name'] = last_row['processID']
-            last_row['concept:name'] = end_name
-            last_row['pitch_type'] = end_name
-            last_row['pitchOrder'] = len(case_df)
-            
-            add_node_list.extend([first_row, last_row])
-
-    # [4] 결과 저장
-    node_df = pd.DataFrame(add_node_list)
-    acept_data = pd.concat([acept_data, node_df], ignore_index=True)
-    acept_data = acept_data.sort_values(by=['processID', 'pitchOrder'], ascending=[True, True]).reset_index(drop=True)
+    # 케이스별 첫 투구(pitchOrder 최소)와 마지막 투구(pitchOrder 최대)의 행 위치 (전체 DataFrame을 정렬하지 않고 키만 정렬)
+    process_id = acept_data['processID'].to_numpy()
+    pitch_order = acept_data['pitchOrder'].to_numpy()
+    order = np.lexsort((pitch_order, process_id))
+    sorted_id = process_id[order]
+    boundary = np.flatnonzero(sorted_id[1:] != sorted_id[:-1]) + 1
+    first_position = order[np.append(0, boundary)] if len(order) else order
+    last_position = order[np.append(boundary - 1, len(order) - 1)] if len(order) else order
+    case_length = np.diff(np.append(np.append(0, boundary), len(order)))
+
+    # 첫 번째 투구를 복사하여 "In" 노드 생성
+    first_rows = acept_data.take(first_position)
+    first_rows['time:timestamp'] = first_rows['time:timestamp'] - timedelta(seconds=1)
+    first_rows['case:concept:name'] = first_rows['processID']
+    first_rows.loc[:, 'concept:name'] = start_name
+    first_rows.loc[:, 'pitch_type'] = start_name
+    first_rows['pitchOrder'] = -1  # 시작 노드는 -1로 설정
+
+    # 마지막 투구를 복사하여 "Out" 노드 생성
+    last_rows = acept_data.take(last_position)
+    last_rows['time:timestamp'] = last_rows['time:timestamp'] + timedelta(seconds=1)
+    last_rows['case:concept:name'] = last_rows['processID']
+    last_rows.loc[:, 'concept:name'] = end_name
+    last_rows.loc[:, 'pitch_type'] = end_name
+    last_rows['pitchOrder'] = case_length
+
+    # [4] 결과 저장 : (processID, pitchOrder) 순서로 한 번만 재배열
+    acept_data = pd.concat([acept_data, first_rows, last_rows], ignore_index=True)
+    order = np.lexsort((acept_data['pitchOrder'].to_numpy(), acept_data['processID'].to_numpy()))
+    acept_data = _reset_index(acept_data.take(order))
 
     return acept_data
 
 
-def assign_group_index_two_pointer(df):
-    """
-    투 포인터 알고리즘:
-    - left: 시작 포인터 (고정)
-    - right: 순차 탐색 포인터
-    - left의 case_id == right의 case_id → 같은 그룹 인덱스 부여
-    - left의 case_id != right의 case_id → 그룹 인덱스 +1, left를 right로 업데이트
+def segment_runs(*keys):
     """
-    n = len(df)
-    group_indices = [0] * n
+    Run-length 세그먼트 인덱싱 (NumPy 배열 기반)
+    - 각 키를 정수 코드로 factorize
+    - 인접한 행끼리 코드를 비교(shift & compare)하여 값이 바뀌는 지점을 표시
+    - 바뀌는 지점의 누적합(cumsum)이 곧 그룹 인덱스
     
-    if n == 0:
-        return group_indices
+    Args:
+        *keys: 같은 길이의 1차원 배열(Series, ndarray 등). 여러 개를 주면 모든 키가 같아야 같은 run
     
-    left = 0  # 시작 포인터
-    group_index = 0  # 그룹 인덱스 (case_id가 달라질 때마다 증가)
-    start_case_id = df.iloc[left]['case_id']  # 시작 case_id
+    Returns:
+        np.ndarray: int32 그룹 인덱스 (0부터 시작, 연속된 같은 키는 같은 값)
+    """
+    n = len(keys[0])
+    boundary = np.zeros(n, dtype=bool)
     
-    # 첫 번째 행은 항상 그룹 0
-    group_indices[left] = group_index
+    for key in keys:
+        codes, _ = pd.factorize(np.asarray(key))
+        boundary[1:] |= codes[1:] != codes[:-1]
     
-    # right 포인터로 순차 탐색
-    for right in range(1, n):
-        current_case_id = df.iloc[right]['case_id']
-        
-        # 시작 case_id와 같으면 같은 그룹 인덱스 부여
-        if current_case_id == start_case_id:
-            group_indices[right] = group_index
-        else:
-            # case_id가 달라졌으므로 그룹 인덱스 증가
-            group_index += 1
-            # 시작값을 달라진 값으로 업데이트
-            start_case_id = current_case_id
-            left = right  # left 포인터를 right 위치로 업데이트
-            group_indices[right] = group_index
+    return np.cumsum(boundary, dtype=np.int32)
+
+
+def assign_group_index_two_pointer(df):
+    """
+    투 포인터 알고리즘과 같은 결과를 segment_runs로 계산하는 wrapper
+    - 이전 행과 case_id가 같음 → 같은 그룹 인덱스 부여
+    - 이전 행과 case_id가 다름 → 그룹 인덱스 +1
     
-    return group_indices
+    Returns:
+        np.ndarray: int32 그룹 인덱스
+    """
+    return segment_runs(df['case_id'])
+
+
+# 케이스(타석) 정의에 사용할 키 조합
+CASE_KEYS = {
+    'date_batter': ('game_date', 'batter'),              # 경기일자 + 타자 (기존 방식)
+    'at_bat': ('game_pk', 'at_bat_number'),              # 경기 + 타석 번호 (같은 타자의 연속 타석도 분리)
+    'inning': ('game_date', 'batter', 'inning'),         # 경기일자 + 타자 + 이닝
+}
 
 
-def define_at_bat_cases(df):
+def define_at_bat_cases(df, case_keys='date_batter', sort_keys=False):
     """
-    각 타석을 케이스로 정의 (game_date + batter)
-    경기일자가 같고 같은 게임의 같은 타자 = 하나의 케이스 (하나의 프로세스)
+    각 타석을 케이스로 정의 (기본값 : game_date + batter)
+    케이스 키가 같은 연속된 투구 = 하나의 케이스 (하나의 프로세스)
     
     Args:
         df: 투구 데이터 DataFrame
+        case_keys: CASE_KEYS의 이름('date_batter', 'at_bat', 'inning') 또는 컬럼명 tuple
+        sort_keys: True이면 키 코드로 stable lexsort하여 떨어져 있는 같은 키의 투구를 모은 뒤 케이스 정의
+                   (정렬되지 않은 원본에서 ('game_pk', 'at_bat_number')처럼 타석을 유일하게 식별하는 키와 함께 사용)
     
     Returns:
-        DataFrame: case_id가 추가된 DataFrame
-    """
-    # 투구 순서 부여 + 케이스별로 정렬 + 그룹 인덱스 라벨링
-    df_event = df.copy()
-    df_event = df_event.reset_index()
-    df_event['case_id'] = (df_event['game_date'].astype(str) + "_" + df_event['batter'].astype(str))
-    df_event['processID'] = assign_group_index_two_pointer(df_event)
-    df_event = df_event.sort_values(by=['case_id','index'], ascending=[True, False]).reset_index(drop=True)
-
-    # 그룹 인덱스 할당
-    df_event['pitchOrder'] = df_event.groupby('processID').cumcount()
-    df_event = df_event.sort_values(by=['processID','index'], ascending=[True, True]).reset_index(drop=True)
-    del df_event['index']
-    del df_event['case_id']
+        DataFrame: processID, pitchOrder가 추가된 DataFrame
+    """
+    keys = CASE_KEYS[case_keys] if isinstance(case_keys, str) else tuple(case_keys)
+    df_event = df.reset_index(drop=True)
+
+    # 키를 정수 코드로 변환 (문자열 결합 없음)
+    codes = [pd.factorize(df_event[key], sort=True)[0] for key in keys]
+    position = np.arange(len(df_event))
+
+    if sort_keys:
+        order = np.lexsort([position] + codes[::-1])
+        df_event = df_event.take(order).reset_index(drop=True)
+        codes = [code[order] for code in codes]
+
+    # 그룹 인덱스 라벨링
+    process_id = segment_runs(*codes)
+
+    # 투구 순서 부여 : 케이스 안에서 아래쪽 행일수록 먼저 던진 투구 (마지막 행 = pitchOrder 0)
+    case_end = np.flatnonzero(np.append(process_id[1:] != process_id[:-1], True))
+    df_event['processID'] = process_id
+    df_event['pitchOrder'] = case_end[process_id] - position
 
     return df_event
 
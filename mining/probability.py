@@ -1,14 +1,12 @@
 """
 확률 분석 모듈
 """
-from pm4py.objects.log.util import dataframe_utils
-from pm4py.objects.conversion.log import converter as log_converter
-from pm4py.objects.log.obj import EventLog, Trace
-
-from pm4py.algo.filtering.log.variants.variants_filter import get_variants
-from collections import defaultdict
+from functools import cached_property
 import pandas as pd
 
+from .traces import TraceStore
+from .transitions import count_transitions
+
 
 def prepare_eventLog(df_clean):
     """
@@ -43,6 +41,8 @@ def clean_event_log(log):
     Returns:
         EventLog: 정리된 이벤트 로그
     """
+    from pm4py.objects.log.obj import EventLog, Trace
+
     cleaned_log = EventLog()
     
     for _, case in enumerate(log):
@@ -80,6 +80,9 @@ def create_eventlog_from_dataFrame(df_clean):
     Returns:
         EventLog: PM4Py 이벤트 로그
     """
+    # pm4py는 EventLog가 필요할 때만 import (전이 계산만 하는 경우 불필요)
+    from pm4py.objects.log.util import dataframe_utils
+    from pm4py.objects.conversion.log import converter as log_converter
 
     # Timestamp 변환 & 이벤트 로그 변환
     df_clean = dataframe_utils.convert_timestamp_columns_in_df(df_clean)
@@ -93,11 +96,28 @@ def create_eventlog_from_dataFrame(df_clean):
 
 class BasedTraces:
     
+    """
+    DataFrame 기반 전이 빈도/확률 계산
+    모든 View(TraceStore, EventLog, 길이별 EventLog, 전이 집계)는 처음 접근할 때 한 번만 계산합니다.
+    """
+    
     def __init__(self, dataframe):
         self.dataframe = dataframe
-        
-        self.event_log = self.preprocessing()
-        self.grouped_event_log = self.grouped_preprocessing()
+
+    @cached_property
+    def traces(self):
+        """정수 코드 기반 Trace 저장소"""
+        return TraceStore.from_dataframe(prepare_eventLog(self.dataframe))
+
+    @cached_property
+    def grouped_event_log(self):
+        """길이별 pm4py EventLog 목록 : 처음 접근할 때 한 번만 변환"""
+        return self.grouped_preprocessing()
+
+    @cached_property
+    def event_log(self):
+        """pm4py EventLog : 처음 접근할 때 한 번만 변환"""
+        return self.preprocessing()
 
     def preprocessing(self):
         prepared_df = prepare_eventLog(self.dataframe)
@@ -118,139 +138,50 @@ class BasedTraces:
             grouped_preprocessed_data.append((f"length_{i}", eventlog_df))
         return grouped_preprocessed_data
 
+    @cached_property
+    def transitions(self):
+        """TraceStore에서 한 번에 집계한 전이 빈도 (TransitionResult)"""
+        return count_transitions(self.traces, source=self)
+
     def achieve_rawdata(self):
         """
                 Description : Eventlog의 Vriants Pattern과 Freq, Length을 저장하기 위한 함수
         """
-        raw_data = defaultdict(list)
-        variants_dict = get_variants(self.event_log)
-        
-        for activities, traces in variants_dict.items():
-            activity_length = len(activities) - 2
-        
-            raw_data['all'].append((activities, len(traces), activity_length))
-            raw_data[f'length_{activity_length}'].append((activities, len(traces)))
-            
-        return raw_data
+        return self.transitions.data
         
     
     def calc_translation(self):
         """
              Description : Eventlog에서 Length와 Layer 구분없이 빈도와 전이확률을 계산
         """
-        counts = defaultdict(lambda: defaultdict(int))
-
-        for case in self.event_log:
-            activities = [event['concept:name'] for event in case]
-
-            for i in range(len(activities) - 1):
-                from_activity = activities[i]
-                to_activity = activities[i + 1]        
-                counts[from_activity][to_activity] += 1
-
-        probs = {}
-        for from_activity, to_dict in counts.items(): 
-            total = sum(to_dict.values()) 
-            probs[from_activity] = {to_activity: count / total for to_activity, count in to_dict.items()}
-        
-        return counts, probs
+        return self.transitions.view()
     
 
     def calc_transition_same_length(self):
         """
              Description : Eventlog에서 Length가 같은 varient pattern에 대하여 빈도와 전이확률 계산
         """
-        variants_dict = get_variants(self.event_log)
-        counts = defaultdict(lambda : defaultdict(lambda:defaultdict(int)))
-        probs = defaultdict(lambda : defaultdict(int))
-        
-        for activities, traces in variants_dict.items():
-            activity_legnth = len(activities) - 2
-            
-            for i in range(len(activities) - 1):
-                from_activity = activities[i]
-                to_activity = activities[i + 1]        
-                counts[f'length_{activity_legnth}'][from_activity][to_activity] += 1
-            
-        for length in counts.keys():                
-            for from_activity, to_dict in counts[length].items(): 
-                total = sum(to_dict.values()) 
-                probs[length][from_activity] = {to_activity: count / total for to_activity, count in to_dict.items()}
-                
-        return counts, probs
+        return self.transitions.view(by_length=True)
         
         
     def calc_transition_same_layer(self):
         """
              Description : Eventlog에서 Layer 별로 빈도와 전이확률 계산
         """
-        counts = defaultdict(lambda: defaultdict(int))
-        probs = {}
-
-        for case in self.event_log:
-            activities = [event['concept:name'] for event in case]                
-            
-            layered_activities = list(activities)
-            for i in range(1, len(layered_activities) - 1):
-                 layered_activities[i] = layered_activities[i] + "_" + str(i)
-                 
-            for i in range(len(layered_activities)-1):
-                from_activity = layered_activities[i]    
-                to_activity = layered_activities[i+1]
-                counts[from_activity][to_activity] += 1
-
-        for from_activity, to_dict in counts.items(): 
-            total = sum(to_dict.values()) 
-            probs[from_activity] = {to_activity: count / total for to_activity, count in to_dict.items()}
-            
-        return counts, probs
+        return self.transitions.view(layered=True)
         
         
     def calc_transition_same_layer_and_length(self):
         """
                  Description : Eventlog에서 Layer와 Length가 같은 varient patterns들의 빈도와 전이확률 계산
         """
-        variants_dict = get_variants(self.event_log)
-        
-        counts = defaultdict(lambda : defaultdict(lambda:defaultdict(int)))
-        probs = defaultdict(lambda : defaultdict(int))
-        
-        for activities, traces in variants_dict.items():
-            activity_length = len(activities) -2
-        
-            layered_activities = list(activities)
-            for i in range(1, len(layered_activities) - 1):
-                 layered_activities[i] = layered_activities[i] + "_" + str(i)
-                 
-            for i in range(len(layered_activities)-1):
-                from_activity = layered_activities[i]    
-                to_activity = layered_activities[i+1]
-                counts[f"length_{activity_length}"][from_activity][to_activity] += 1
-        
-        for length in counts.keys():
-            for from_activity, to_dict in counts[length].items(): 
-                total = sum(to_dict.values()) 
-                probs[length][from_activity] = {to_activity: count / total for to_activity, count in to_dict.items()}
-    
-        return counts, probs
+        return self.transitions.view(layered=True, by_length=True)
             
 
         
     def __call__(self):
-        
-        result = {}
-        result['event_log'] = self.event_log
-
-        result['data'] = self.achieve_rawdata()         
-        result['counts'], result['probs'] = self.calc_translation()
-        
-        result['length'] = {}
-        result['length']['event_log'] = self.grouped_event_log
-        result['length']['counts'], result['length']['probs'] = self.calc_transition_same_length()
-        
-        result['layer'] = {}
-        result['layer_length'] = {}
-        result['layer']['counts'], result['layer']['probs'] = self.calc_transition_same_layer()
-        result['layer_length']['counts'], result['layer_length']['probs'] = self.calc_transition_same_layer_and_length()
-        
-        return result
+        """
+                Description : 전이 빈도/확률 계산 결과 (TransitionResult)
+                              기존 dict 형태가 필요하면 result.to_dict()
+        """
+        return self.transitions
@@ -0,0 +1,134 @@
+"""
+파이프라인 단계별 계측 모듈
+단계마다 실행 시간, 메모리(최대 RSS 증가량 / tracemalloc), 행 수와 케이스 수를 기록 (opt-in, 기본값은 계측하지 않음)
+"""
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:     # Windows : 최대 RSS 기록 안 함
+    resource = None
+
+
+# 리포트 컬럼 순서
+REPORT_COLUMNS = ['stage', 'calls', 'seconds', 'rows', 'cases', 'rss_growth_mb', 'process_rss_peak_mb', 'traced_peak_mb']
+
+
+def _rss_peak_mb():
+    """프로세스 최대 RSS (MiB, 프로세스 시작 이후 최대값)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class StageProfiler:
+    """
+    파이프라인 단계 계측기
+
+    - stage(name) 블록마다 record(dict) 하나 : stage, seconds, rows, cases, rss_growth_mb, process_rss_peak_mb, traced_peak_mb
+    - 메모리
+      - rss_growth_mb       : 단계 동안 늘어난 프로세스 최대 RSS (단계 시작 전 최대값보다 더 쓴 만큼, 아니면 0)
+                              OS는 프로세스 전체의 최대 RSS만 제공하므로 단계 자체의 최대 사용량이 아니라 최대값을 갱신한 양
+      - process_rss_peak_mb : 단계가 끝난 시점까지의 프로세스 최대 RSS (앞 단계를 포함한 프로세스 전체의 값, 단계별 값 아님)
+      - traced_peak_mb      : trace_memory=True일 때 단계 안에서 Python/NumPy가 할당한 최대량 (단계별 값)
+    - 같은 이름의 단계가 여러 번 실행되면(streaming 청크 등) report()에서 합산
+    - hooks : 단계가 끝날 때마다 record 사본으로 호출 (예 : 사내 metrics 전송, 예외는 파이프라인으로 전달됨)
+
+    Args:
+        enabled: False이면 아무것도 기록하지 않음 (계측 코드가 파이프라인에 남아 있어도 비용 없음)
+        trace_memory: True이면 단계마다 tracemalloc 최대 할당량 기록 (Python 할당이 많은 단계는 느려짐)
+        hooks: record dict를 받는 함수 list
+    """
+
+    def __init__(self, enabled=True, trace_memory=False, hooks=()):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks)
+        self.records = []
+
+    @classmethod
+    def resolve(cls, profile):
+        """
+        파이프라인 profile 인자 → StageProfiler
+        - None, False   : 비활성 계측기
+        - True          : 기본 계측기 (시간, 최대 RSS 증가량, 행/케이스 수)
+        - StageProfiler : 그대로 사용 (trace_memory, hooks 지정)
+        """
+        if isinstance(profile, cls):
+            return profile
+        return cls(enabled=bool(profile))
+
+    @contextmanager
+    def stage(self, name):
+        """단계 계측 블록 (중첩하지 않음 : tracemalloc 최대값을 단계마다 초기화)"""
+        if not self.enabled:
+            yield None
+            return
+
+        record = {'stage': name, 'seconds': None, 'rows': None, 'cases': None,
+                  'rss_growth_mb': None, 'process_rss_peak_mb': None, 'traced_peak_mb': None}
+        rss_before = _rss_peak_mb()
+
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            if self.trace_memory:
+                record['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                if started_tracing:
+                    tracemalloc.stop()
+            rss_after = _rss_peak_mb()
+            if rss_after is not None:
+                record['rss_growth_mb'] = rss_after - rss_before
+                record['process_rss_peak_mb'] = rss_after
+
+            self.records.append(record)
+            for hook in self.hooks:
+                hook(dict(record))
+
+    def observe(self, record, df, case_column='processID'):
+        """단계 결과 DataFrame의 행 수와 케이스 수 기록 (비활성이면 계산하지 않음)"""
+        if record is None or df is None:
+            return
+        record['rows'] = len(df)
+        if case_column in df.columns:
+            record['cases'] = int(df[case_column].nunique())
+
+    def report(self):
+        """
+        단계별 리포트 (같은 이름은 합산 : 시간/행/케이스/RSS 증가량은 합, 프로세스 최대 RSS와 tracemalloc 최대량은 최대)
+
+        Returns:
+            DataFrame: REPORT_COLUMNS (단계가 처음 실행된 순서)
+        """
+        if not self.records:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+
+        records = pd.DataFrame(self.records)
+        grouped = records.groupby('stage', sort=False)
+        report = grouped.agg(calls=('seconds', 'size'), seconds=('seconds', 'sum'),
+                             process_rss_peak_mb=('process_rss_peak_mb', 'max'), traced_peak_mb=('traced_peak_mb', 'max'))
+        report['rss_growth_mb'] = grouped['rss_growth_mb'].sum(min_count=1)
+        report['rows'] = grouped['rows'].sum(min_count=1).astype('Int64')
+        report['cases'] = grouped['cases'].sum(min_count=1).astype('Int64')
+
+        return report.reset_index()[REPORT_COLUMNS]
+
+    def total_seconds(self):
+        return sum(record['seconds'] for record in self.records)
+
+    def __repr__(self):
+        return f"StageProfiler(enabled={self.enabled}, trace_memory={self.trace_memory}, stages={len(self.records)})"
@@ -0,0 +1,89 @@
+"""
+단계별(layered) 전이 확률 그래프 축소 모듈
+Sankey diagram의 노드 수를 제한하면서 start에서 나온 흐름(1.0)의 비율은 그대로 유지
+"""
+import numpy as np
+import pandas as pd
+
+from .utils import extract_stage_number
+from .visualizer import sankey_links
+
+
+def prune_transitions(data, top_k=None, min_flow=None, max_layer=None, other='other'):
+    """
+    단계별 전이 확률 DataFrame 축소
+
+    노드를 지우지 않고 같은 단계의 '<other>_<단계>' 노드로 합치므로 흐름의 합은 보존됨
+    (합쳐진 노드의 전이 확률 = 합쳐진 흐름 / 합쳐진 유입량)
+
+    - top_k     : 각 노드(합쳐진 노드 포함)에서 흐름이 큰 다음 단계 노드 k개만 유지
+                  어느 노드의 top_k에도 들지 않는 노드는 other로 합침 → 단계별 노드 수 ≤ (이전 단계 노드 수 × k + 1)
+    - min_flow  : 유입 흐름이 start 흐름 대비 min_flow 미만인 드문 노드는 other로 합침
+    - max_layer : max_layer보다 깊은 단계는 '<other>_<max_layer + 1>' 노드 하나로 합치고 그 뒤의 전이는 생략
+    start, end 노드는 합치지 않음
+
+    Args:
+        data: Source, Target, Variable(확률) 컬럼의 DataFrame (source 단계 순 정렬, ProcessEDA의 layered 결과)
+        top_k: 노드별로 유지할 다음 단계 노드 수 (None이면 제한 없음)
+        min_flow: 노드 유입 흐름 하한 (0~1, None이면 제한 없음)
+        max_layer: 표시할 최대 단계 (None이면 제한 없음)
+        other: 합친 노드 이름
+
+    Returns:
+        DataFrame: 같은 형식(Source, Target, Variable)의 축소된 전이 확률
+    """
+    if data.empty:
+        return data[['Source', 'Target', 'Variable']].copy()
+
+    nodes, sources, targets, flows = sankey_links(data)
+    nodes = np.array(nodes, dtype=object)
+    stages = np.array([extract_stage_number(node) for node in nodes], dtype=np.int64)
+    fixed = (nodes == 'start') | (nodes == 'end')
+
+    inflow = np.bincount(targets, weights=flows, minlength=len(nodes))
+    inflow[nodes == 'start'] = 1.0
+
+    # 노드 → 합쳐진 노드 이름 (단계 순서대로 결정 : 이전 단계의 합쳐진 결과로 다음 단계의 top_k 선택)
+    mapped = nodes.copy()
+    if max_layer is not None:
+        deep = (stages > max_layer) & ~fixed
+        mapped[deep] = f"{other}_{max_layer + 1}"
+    else:
+        deep = np.zeros(len(nodes), dtype=bool)
+
+    for stage in np.unique(stages[~fixed & ~deep]):
+        in_stage = (stages == stage) & ~fixed & ~deep
+        keep = in_stage.copy()
+
+        if min_flow is not None:
+            keep &= inflow >= min_flow
+
+        if top_k is not None:
+            incoming = in_stage[targets] & (stages[sources] < stage)
+            if incoming.any():
+                edges = pd.DataFrame({'source': mapped[sources[incoming]], 'target': targets[incoming],
+                                      'flow': flows[incoming]})
+                edges = edges.groupby(['source', 'target'], sort=False, as_index=False)['flow'].sum()
+                edges = edges.sort_values(['source', 'flow'], ascending=[True, False], kind='stable')
+                chosen = np.zeros(len(nodes), dtype=bool)
+                chosen[edges.groupby('source', sort=False).head(top_k)['target'].to_numpy()] = True
+                keep &= chosen
+
+        mapped[in_stage & ~keep] = f"{other}_{stage}"
+
+    # 합쳐진 그래프의 흐름 → 전이 확률 (깊은 단계에서 나가는 전이와 같은 노드로의 전이는 생략)
+    merged = pd.DataFrame({'Source': mapped[sources], 'Target': mapped[targets], 'flow': flows})
+    merged = merged[~deep[sources] & (merged['Source'] != merged['Target'])]
+    merged = merged.groupby(['Source', 'Target'], sort=False, as_index=False)['flow'].sum()
+
+    merged_inflow = pd.Series(inflow[~deep], index=mapped[~deep]).groupby(level=0).sum()
+    merged_inflow['start'] = 1.0
+    source_inflow = merged_inflow.reindex(merged['Source']).to_numpy()
+    merged['Variable'] = np.divide(merged['flow'].to_numpy(), source_inflow,
+                                   out=np.zeros(len(merged)), where=source_inflow > 0)
+
+    merged['Source_Num'] = merged['Source'].map(extract_stage_number)
+    merged['Target_Num'] = merged['Target'].map(extract_stage_number)
+    merged = merged.sort_values(by=['Source_Num', 'Target_Num'], kind='stable')
+
+    return merged[['Source', 'Target', 'Variable']].reset_index(drop=True)
@@ -0,0 +1,109 @@
+"""
+투구 데이터 dtype 스키마 모듈
+load_data_from_bigquery / read_csv 직후 컬럼을 작은 dtype으로 변환하여 전처리 단계의 메모리 사용량을 줄임
+
+- 라벨 컬럼(pitch_type, description, events, stand, p_throws, type) : category
+- ID 컬럼 : int32 (주자 ID는 결측이 있으므로 nullable Int32)
+- 볼카운트, 이닝 등 작은 정수 : int8 / int16
+- 물리량(구속, 릴리스 포인트, 타구 속도 등) : float32
+"""
+import numpy as np
+import pandas as pd
+
+
+PITCH_SCHEMA = {
+    'game_pk': 'int32',
+    'at_bat_number': 'int16',
+    'pitch_number': 'int8',
+    'inning': 'int16',
+    'pitcher': 'int32',
+    'batter': 'int32',
+    'stand': 'category',
+    'p_throws': 'category',
+    'outs_when_up': 'int8',
+    'on_1b': 'Int32',
+    'on_2b': 'Int32',
+    'on_3b': 'Int32',
+    'balls': 'int8',
+    'strikes': 'int8',
+    'type': 'category',
+    'hit_location': 'float32',
+    'launch_speed': 'float32',
+    'launch_angle': 'float32',
+    'babip_value': 'float32',
+    'pitch_type': 'category',
+    'release_speed': 'float32',
+    'release_pos_x': 'float32',
+    'release_pos_z': 'float32',
+    'release_pos_y': 'float32',
+    'plate_x': 'float32',
+    'plate_z': 'float32',
+    'description': 'category',
+    'events': 'category',
+}
+
+
+def _convert(values, dtype):
+    """컬럼 하나를 dtype으로 변환 (정수 컬럼에 결측이 있으면 같은 크기의 nullable 정수로)"""
+    if dtype in ('int8', 'int16', 'int32', 'int64') and values.isna().any():
+        dtype = dtype.capitalize()
+    if dtype.startswith(('int', 'Int')) and values.dtype.kind == 'f':
+        # float로 읽힌 정수 컬럼 (결측 때문에) : 값이 정수가 아니면 변환하지 않음
+        finite = values.dropna()
+        if not np.array_equal(finite, np.round(finite)):
+            return values
+    return values.astype(dtype)
+
+
+def optimize_dtypes(df, schema=None):
+    """
+    스키마에 따라 컬럼 dtype 축소 (스키마에 없는 컬럼과 이미 같은 dtype인 컬럼은 그대로)
+
+    Args:
+        df: 투구 데이터 DataFrame (load_data_from_bigquery / read_csv 결과)
+        schema: 컬럼 → dtype dict (None이면 PITCH_SCHEMA)
+
+    Returns:
+        DataFrame: 변환된 새 DataFrame (원본은 변경하지 않음, 변환하지 않은 컬럼은 데이터를 공유)
+    """
+    schema = PITCH_SCHEMA if schema is None else schema
+    converted = {}
+    for column, dtype in schema.items():
+        if column in df.columns and str(df[column].dtype) != dtype:
+            converted[column] = _convert(df[column], dtype)
+
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def align_categories(*frames):
+    """
+    여러 DataFrame의 category 컬럼 카테고리를 합집합으로 맞춤 (코드만 다시 매핑)
+    카테고리가 다른 category 컬럼을 pd.concat하면 object로 바뀌므로 concat 전에 사용 (streaming 청크 + 보류 타석 등)
+
+    Returns:
+        list: 카테고리를 맞춘 DataFrame (category 컬럼이 없으면 그대로)
+    """
+    columns = [column for column in frames[0].columns
+               if all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames)]
+
+    aligned = [dict() for _ in frames]
+    for column in columns:
+        categories = frames[0][column].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[column].cat.categories)
+        for changes, frame in zip(aligned, frames):
+            if not frame[column].cat.categories.equals(categories):
+                changes[column] = frame[column].cat.set_categories(categories)
+
+    return [frame.assign(**changes) if changes else frame for frame, changes in zip(frames, aligned)]
+
+
+def csv_dtypes(schema=None):
+    """
+    read_csv의 dtype 인자 : category / float 컬럼은 파싱하면서 바로 변환 (object 문자열 컬럼을 만들지 않음)
+    정수 컬럼은 결측이 있으면 read_csv가 실패하므로 제외 (읽은 뒤 optimize_dtypes로 변환)
+    """
+    schema = PITCH_SCHEMA if schema is None else schema
+    return {column: dtype for column, dtype in schema.items() if not dtype.lower().startswith('int')}
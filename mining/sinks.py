@@ -0,0 +1,97 @@
+"""
+시각화 결과 저장 모듈
+화면 출력이나 브라우저 없이 명시한 경로에 HTML / PNG / JSON 파일로 저장 (병렬 워커에서 사용)
+"""
+import json
+import os
+import re
+import uuid
+
+
+FORMATS = ('html', 'png', 'json')
+
+
+class OutputSink:
+    """
+    시각화 결과를 저장할 디렉토리와 형식
+
+    - 그림마다 이름(name)을 받아 '<directory>/<prefix><name>.<format>' 경로를 만듦
+    - 워커마다 다른 directory 또는 prefix를 주면 동시에 실행해도 서로의 결과를 덮어쓰지 않음
+
+    Args:
+        directory: 저장 디렉토리 (없으면 생성)
+        formats: 저장 형식 tuple ('html', 'png', 'json')
+        prefix: 파일 이름 앞에 붙일 문자열 (예 : 투수 ID)
+    """
+
+    def __init__(self, directory, formats=('html',), prefix=''):
+        formats = (formats,) if isinstance(formats, str) else tuple(formats)
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 형식입니다 : {sorted(unknown)} (지원 : {FORMATS})")
+
+        self.directory = directory
+        self.formats = formats
+        self.prefix = prefix
+
+    def paths(self, name):
+        """그림 이름 → 형식별 저장 경로 list"""
+        stem = re.sub(r'[^\w.-]+', '_', f"{self.prefix}{name}").strip('_')
+        return [os.path.join(self.directory, f"{stem}.{fmt}") for fmt in self.formats]
+
+    def __repr__(self):
+        return f"OutputSink(directory={self.directory!r}, formats={self.formats}, prefix={self.prefix!r})"
+
+
+def resolve_output(output, name):
+    """
+    output 인자 → 저장 경로 list
+    - None        : [] (저장하지 않음 → 기존처럼 화면/브라우저 출력)
+    - str         : 그 경로 하나 (형식은 확장자로 판단)
+    - list, tuple : 경로 여러 개
+    - OutputSink  : sink.paths(name)
+    """
+    if output is None:
+        return []
+    if isinstance(output, OutputSink):
+        return output.paths(name)
+    if isinstance(output, (str, os.PathLike)):
+        return [os.fspath(output)]
+    return [os.fspath(path) for path in output]
+
+
+def output_format(path):
+    """경로 확장자 → 형식 ('html', 'png', 'json')"""
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt == 'htm':
+        fmt = 'html'
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다 : {path} (지원 : {FORMATS})")
+    return fmt
+
+
+def atomic_write(path, write):
+    """
+    임시 파일에 write(tmp_path)로 쓴 뒤 교체 (같은 경로를 동시에 써도 깨진 파일이 남지 않음)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.{uuid.uuid4().hex}.tmp{ext}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def write_json(obj, path):
+    """dict → JSON 파일"""
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
+    return atomic_write(path, write)
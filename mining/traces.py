@@ -0,0 +1,138 @@
+"""
+정수 코드 기반 Trace 저장소 모듈
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+class TraceStore:
+    """
+    이벤트 로그를 평평한(flat) NumPy 배열로 보관하는 저장소
+
+    - activities : 활동 vocabulary (코드 → 활동 이름)
+    - codes      : 모든 케이스의 활동 코드를 이어 붙인 int16 배열
+    - offsets    : CSR 방식의 케이스 경계 (i번째 케이스 = codes[offsets[i]:offsets[i+1]])
+    - case_ids   : 각 케이스의 case:concept:name
+
+    pm4py EventLog와 같은 순서(케이스는 처음 등장한 순서, 케이스 안에서는 행 순서)를 유지합니다.
+    """
+
+    def __init__(self, activities, codes, offsets, case_ids):
+        self.activities = np.asarray(activities, dtype=object)
+        self.codes = np.asarray(codes, dtype=np.int16)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.case_ids = np.asarray(case_ids)
+
+    @classmethod
+    def from_dataframe(cls, df_clean, case_column='case:concept:name', activity_column='concept:name'):
+        """
+        prepare_eventLog로 정리된 DataFrame에서 저장소 생성
+
+        Args:
+            df_clean: 케이스 ID와 활동 컬럼을 가진 DataFrame
+
+        Returns:
+            TraceStore
+        """
+        case_codes, case_ids = pd.factorize(df_clean[case_column], sort=False)
+        activity_codes, activities = pd.factorize(df_clean[activity_column], sort=False)
+
+        if len(activities) > np.iinfo(np.int16).max:
+            raise ValueError(f"활동 종류가 너무 많습니다 ({len(activities)}개) : int16 코드로 표현할 수 없습니다")
+
+        # 케이스 순서(처음 등장한 순서)로 stable 정렬 → 케이스 안의 행 순서 유지
+        order = np.argsort(case_codes, kind='stable')
+        offsets = np.zeros(len(case_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(case_codes, minlength=len(case_ids)), out=offsets[1:])
+
+        return cls(activities, activity_codes[order], offsets, case_ids)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        """케이스별 활동 코드 배열(view)을 순서대로 반환"""
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.codes[start:end]
+
+    def case(self, index):
+        """index번째 케이스의 활동 코드 배열"""
+        return self.codes[self.offsets[index]:self.offsets[index + 1]]
+
+    def decode(self, codes):
+        """활동 코드 배열 → 활동 이름 tuple"""
+        return tuple(self.activities[codes])
+
+    def sequences(self):
+        """케이스별 활동 이름 tuple을 순서대로 반환"""
+        for codes in self:
+            yield self.decode(codes)
+
+    @cached_property
+    def _variant_table(self):
+        """
+        케이스별 활동 코드를 (케이스 수 × 최대 길이) 행렬로 펼친 뒤 np.unique로 한 번에 variant 계산
+        variant 번호는 pm4py get_variants와 같이 처음 등장한 순서
+        """
+        lengths = self.lengths
+        n_cases = len(self)
+        max_length = int(lengths.max()) if n_cases else 0
+
+        matrix = np.full((n_cases, max_length), -1, dtype=np.int16)
+        rows = np.repeat(np.arange(n_cases), lengths)
+        cols = np.arange(self.n_events) - np.repeat(self.offsets[:-1], lengths)
+        matrix[rows, cols] = self.codes
+
+        _, first_case, inverse, counts = np.unique(matrix, axis=0, return_index=True, return_inverse=True, return_counts=True)
+
+        order = np.argsort(first_case, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        return rank[inverse.reshape(-1)], first_case[order], counts[order]
+
+    @property
+    def case_variants(self):
+        """케이스별 variant 번호"""
+        return self._variant_table[0]
+
+    @property
+    def variant_first_case(self):
+        """variant별 처음 등장한 케이스 index"""
+        return self._variant_table[1]
+
+    @property
+    def variant_counts(self):
+        """variant별 케이스 수"""
+        return self._variant_table[2]
+
+    @cached_property
+    def variant_sequences(self):
+        """variant별 활동 이름 tuple"""
+        return [self.decode(self.case(index)) for index in self.variant_first_case]
+
+    def variants(self):
+        """
+        Variant(활동 이름 tuple)별 케이스 수
+        pm4py get_variants와 같이 처음 등장한 순서로 정렬된 dict 반환
+        """
+        return dict(zip(self.variant_sequences, self.variant_counts.tolist()))
+
+    @property
+    def lengths(self):
+        """케이스별 이벤트 수"""
+        return np.diff(self.offsets)
+
+    @property
+    def n_events(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self):
+        """코드, 경계, 케이스 ID 배열이 차지하는 메모리 (vocabulary 제외)"""
+        return self.codes.nbytes + self.offsets.nbytes + self.case_ids.nbytes
+
+    def __repr__(self):
+        return f"TraceStore(cases={len(self)}, events={self.n_events}, activities={len(self.activities)}, nbytes={self.nbytes})"
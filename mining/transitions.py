@@ -0,0 +1,470 @@
+"""
+전이(Transition) 빈도/확률 계산 엔진
+TraceStore의 활동 코드 배열에서 (from, to) 쌍을 만들어 np.bincount로 한 번에 집계
+"""
+from collections import defaultdict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+
+def _transition_pairs(store):
+    """
+    케이스 경계를 넘지 않는 (from, to) 쌍
+
+    Returns:
+        tuple: (케이스 index, length, layer, from 코드, to 코드) 배열
+               - length : 시작/종료 노드를 제외한 케이스 길이
+               - layer  : from 이벤트의 케이스 안 위치 (시작 노드 = 0)
+    """
+    lengths = store.lengths
+    case_index = np.repeat(np.arange(len(store)), lengths)
+    position = np.arange(store.n_events) - store.offsets[:-1][case_index]
+
+    within_case = position[1:] > 0
+    pair_case = case_index[1:][within_case]
+    layer = position[:-1][within_case]
+    length = lengths[pair_case] - 2
+    from_code = store.codes[:-1][within_case].astype(np.int64)
+    to_code = store.codes[1:][within_case].astype(np.int64)
+
+    return pair_case, length, layer, from_code, to_code
+
+
+def count_transitions(store, source=None):
+    """
+    전이 빈도 집계 (length × layer × from × to)
+
+    Args:
+        store: TraceStore
+        source: pm4py EventLog를 제공할 BasedTraces (선택)
+
+    Returns:
+        TransitionResult
+    """
+    pair_case, length, layer, from_code, to_code = _transition_pairs(store)
+
+    n_activities = len(store.activities)
+    n_layers = int(layer.max(initial=0)) + 1
+    flat = ((length * n_layers + layer) * n_activities + from_code) * n_activities + to_code
+
+    # variant마다 처음 등장한 케이스만 한 번씩 집계
+    is_first = np.zeros(len(store), dtype=bool)
+    is_first[store.variant_first_case] = True
+    distinct = is_first[pair_case]
+
+    # 등장한 칸(cell)만 처음 등장한 순서로 보관 (sparse)
+    unique_flat, first_seen, cell_index = np.unique(flat, return_index=True, return_inverse=True)
+    order = np.argsort(first_seen, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    cell_index = rank[cell_index.reshape(-1)]
+
+    counts = np.bincount(cell_index, minlength=len(order))
+    distinct_counts = np.bincount(cell_index[distinct], minlength=len(order))
+
+    rest, to_cells = np.divmod(unique_flat[order], n_activities)
+    rest, from_cells = np.divmod(rest, n_activities)
+    length_cells, layer_cells = np.divmod(rest, n_layers)
+    cells = np.column_stack([length_cells, layer_cells, from_cells, to_cells])
+
+    return TransitionResult(
+        activities=store.activities,
+        cells=cells,
+        counts=counts,
+        distinct_counts=distinct_counts,
+        variants=store.variant_sequences,
+        variant_counts=store.variant_counts,
+        source=source,
+    )
+
+
+def _layered_name(activity, position, n_events):
+    """케이스 중간의 활동에만 위치를 붙임 (예: SL → SL_1)"""
+    if 0 < position < n_events - 1:
+        return activity + "_" + str(position)
+    return activity
+
+
+class _LazyDict(dict):
+    """일부 값(pm4py EventLog 등)을 처음 조회할 때 계산하는 dict (기존 dict 형태 호환용)"""
+
+    def __init__(self, data, lazy):
+        super().__init__(data)
+        self._lazy = dict(lazy)
+
+    def __missing__(self, key):
+        if key not in self._lazy:
+            raise KeyError(key)
+        value = self[key] = self._lazy.pop(key)()
+        return value
+
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._lazy
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def _normalize(counts_dict):
+    """from 활동별 전이 확률"""
+    probs = {}
+    for from_activity, to_dict in counts_dict.items():
+        total = sum(to_dict.values())
+        probs[from_activity] = {to_activity: count / total for to_activity, count in to_dict.items()}
+    return probs
+
+
+class TransitionResult:
+    """
+    BasedTraces 계산 결과
+
+    전이 빈도는 length × layer × from × to 4차원 텐서를 등장한 칸만 저장한 sparse 형태로 보관
+    - cells           : (칸 수, 4) 배열 [length, layer, from 코드, to 코드], 처음 등장한 순서
+    - counts          : 칸별 케이스 단위 전이 빈도
+    - distinct_counts : 칸별 variant마다 한 번씩 집계한 전이 빈도
+    - activities      : 활동 코드 → 활동 이름
+    - variants        : variant(활동 이름 tuple) 목록과 variant_counts(케이스 수)
+
+    length는 시작/종료 노드를 제외한 케이스 길이, layer는 from 활동의 케이스 안 위치(시작 노드 = 0)입니다.
+    pm4py EventLog는 계산한 BasedTraces가 있을 때만 event_log / grouped_event_log로 접근할 수 있고, pickle에는 포함되지 않습니다.
+    """
+
+    def __init__(self, activities, cells, counts, distinct_counts, variants, variant_counts, source=None):
+        self.activities = np.asarray(activities, dtype=object)
+        self.cells = np.asarray(cells, dtype=np.int64).reshape(-1, 4)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.distinct_counts = np.asarray(distinct_counts, dtype=np.int64)
+        self.variants = [tuple(variant) for variant in variants]
+        self.variant_counts = np.asarray(variant_counts, dtype=np.int64)
+        self._source = source
+        self._views = {}
+        self._activity_index = {activity: i for i, activity in enumerate(self.activities.tolist())}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_source'] = None
+        for key in ('_compat', '_cell_index', '_variant_index'):
+            state.pop(key, None)
+        return state
+
+    # ---------------------------------------------------------------
+    # pm4py EventLog (계산한 BasedTraces에서 필요할 때 변환)
+    # ---------------------------------------------------------------
+    @property
+    def event_log(self):
+        return self._source.event_log if self._source is not None else None
+
+    @property
+    def grouped_event_log(self):
+        return self._source.grouped_event_log if self._source is not None else None
+
+    # ---------------------------------------------------------------
+    # 텐서 조회
+    # ---------------------------------------------------------------
+    def _select(self, length=None, layer=None):
+        mask = np.ones(len(self.cells), dtype=bool)
+        if length is not None:
+            mask &= self.cells[:, 0] == length
+        if layer is not None:
+            mask &= self.cells[:, 1] == layer
+        return mask
+
+    def count_matrix(self, length=None, layer=None, distinct=False):
+        """
+        from × to 전이 빈도 행렬 (지정하지 않은 축은 합산)
+
+        Args:
+            length: 케이스 길이 (None이면 전체)
+            layer: from 활동의 위치 (None이면 전체)
+            distinct: True이면 variant마다 한 번씩 집계한 빈도 사용
+        """
+        n_activities = len(self.activities)
+        mask = self._select(length, layer)
+        values = self.distinct_counts if distinct else self.counts
+
+        matrix = np.zeros((n_activities, n_activities), dtype=np.int64)
+        np.add.at(matrix, (self.cells[mask, 2], self.cells[mask, 3]), values[mask])
+        return matrix
+
+    def probs(self, length=None, layer=None, distinct=False):
+        """
+        from × to 전이 확률 DataFrame (행 합 = 1, 나가는 전이가 없는 행은 0)
+
+        예: result.probs(length=5, layer=2)
+        """
+        matrix = self.count_matrix(length, layer, distinct)
+        totals = matrix.sum(axis=1, keepdims=True)
+        probs = np.divide(matrix, totals, out=np.zeros(matrix.shape, dtype=np.float64), where=totals > 0)
+        return pd.DataFrame(probs, index=self.activities, columns=self.activities)
+
+    def top_next(self, activity, k=3, length=None, layer=None, distinct=False):
+        """
+        activity 다음에 올 확률이 높은 활동 상위 k개
+
+        Returns:
+            list: [(다음 활동, 전이 확률), ...]
+        """
+        row = self.count_matrix(length, layer, distinct)[self._activity_index[activity]]
+        total = row.sum()
+        if total == 0:
+            return []
+
+        top = np.argsort(-row, kind='stable')[:k]
+        return [(self.activities[i], float(row[i] / total)) for i in top if row[i] > 0]
+
+    def to_frame(self):
+        """
+        등장한 칸을 long format DataFrame으로 변환
+        columns : length, layer, from, to, count, distinct_count, prob (같은 length, layer, from 안에서 정규화)
+        """
+        frame = pd.DataFrame({
+            'length': self.cells[:, 0],
+            'layer': self.cells[:, 1],
+            'from': self.activities[self.cells[:, 2]],
+            'to': self.activities[self.cells[:, 3]],
+            'count': self.counts,
+            'distinct_count': self.distinct_counts,
+        })
+        frame['prob'] = frame['count'] / frame.groupby(['length', 'layer', 'from'])['count'].transform('sum')
+        return frame
+
+    # ---------------------------------------------------------------
+    # 기존 dict 형태 (ProcessEDA 호환)
+    # ---------------------------------------------------------------
+    def view(self, layered=False, by_length=False):
+        """
+        기존 BasedTraces의 calc_* 함수와 같은 (counts, probs) dict
+        - layered   : 중간 활동에 위치를 붙인 노드 (calc_transition_same_layer)
+        - by_length : variant마다 한 번씩 집계하여 'length_n'별로 분리 (calc_transition_same_length)
+        처음 요청할 때 계산하여 저장
+        """
+        if (layered, by_length) not in self._views:
+            self._views[(layered, by_length)] = self._build_view(layered, by_length)
+        return self._views[(layered, by_length)]
+
+    def _build_view(self, layered, by_length):
+        values = self.distinct_counts if by_length else self.counts
+        counts = {}
+        self._add_to_view(counts, range(len(self.cells)), values, layered, by_length)
+
+        if by_length:
+            return counts, {length: _normalize(counts_dict) for length, counts_dict in counts.items()}
+        return counts, _normalize(counts)
+
+    def _add_to_view(self, counts, cell_indices, values, layered, by_length):
+        """
+        view의 counts dict에 칸별 빈도를 더함
+
+        Returns:
+            list: 값이 바뀐 (length 또는 None, from 활동) 행 (처음 바뀐 순서)
+        """
+        activities = self.activities.tolist()
+        touched = {}
+
+        for i in cell_indices:
+            value = int(values[i])
+            if value == 0:
+                continue
+
+            length, layer, from_code, to_code = self.cells[i].tolist()
+            from_activity, to_activity = activities[from_code], activities[to_code]
+            if layered:
+                from_activity = _layered_name(from_activity, layer, length + 2)
+                to_activity = _layered_name(to_activity, layer + 1, length + 2)
+
+            group = f"length_{length}" if by_length else None
+            target = counts.setdefault(group, {}) if by_length else counts
+            to_dict = target.setdefault(from_activity, {})
+            to_dict[to_activity] = to_dict.get(to_activity, 0) + value
+            touched[(group, from_activity)] = None
+
+        return list(touched)
+
+    @cached_property
+    def data(self):
+        """Variant Pattern과 빈도, 길이 (기존 achieve_rawdata)"""
+        raw_data = defaultdict(list)
+        for activities, freq in zip(self.variants, self.variant_counts.tolist()):
+            activity_length = len(activities) - 2
+
+            raw_data['all'].append((activities, freq, activity_length))
+            raw_data[f'length_{activity_length}'].append((activities, freq))
+
+        return dict(raw_data)
+
+    def to_dict(self, event_log=True):
+        """
+        기존 BasedTraces.__call__과 같은 dict 형태
+        event_log=False이면 pm4py EventLog를 변환하지 않음
+        """
+        result = {}
+        if event_log:
+            result['event_log'] = self.event_log
+
+        result['data'] = self.data
+        result['counts'], result['probs'] = self.view()
+
+        result['length'] = {}
+        if event_log:
+            result['length']['event_log'] = self.grouped_event_log
+        result['length']['counts'], result['length']['probs'] = self.view(by_length=True)
+
+        result['layer'] = {}
+        result['layer_length'] = {}
+        result['layer']['counts'], result['layer']['probs'] = self.view(layered=True)
+        result['layer_length']['counts'], result['layer_length']['probs'] = self.view(layered=True, by_length=True)
+
+        return result
+
+    # ---------------------------------------------------------------
+    # 병합 (청크/일 단위로 나누어 계산한 결과 합치기)
+    # ---------------------------------------------------------------
+    def merge(self, other):
+        """
+        두 결과를 합친 새 TransitionResult 반환 (self는 바뀌지 않음)
+        같은 데이터를 한 번에 계산한 결과와 같음 (활동, 칸, variant 모두 처음 등장한 순서 유지)
+        """
+        merged = TransitionResult(self.activities, self.cells.copy(), self.counts.copy(), self.distinct_counts.copy(),
+                                  self.variants, self.variant_counts.copy())
+        merged.update(other)
+        return merged
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def update(self, other):
+        """
+        other(새 데이터로 계산한 결과)를 self에 누적 (in-place)
+        - counts, variant_counts : 합산
+        - distinct_counts : other에만 있는 새 variant의 전이만 추가
+        - 이미 계산된 view는 값이 바뀐 (length, from) 행의 확률만 다시 계산
+
+        작업량은 other의 크기(새 칸, 새 variant 수)에 비례합니다.
+
+        Returns:
+            TransitionResult: self
+        """
+        # 활동 vocabulary 확장
+        activities = self.activities.tolist()
+        for activity in other.activities.tolist():
+            if activity not in self._activity_index:
+                self._activity_index[activity] = len(activities)
+                activities.append(activity)
+        self.activities = np.asarray(activities, dtype=object)
+
+        remap = np.array([self._activity_index[activity] for activity in other.activities.tolist()], dtype=np.int64)
+        other_cells = other.cells.copy()
+        other_cells[:, 2:] = remap[other_cells[:, 2:]]
+
+        # 칸 : other에서 새로 등장한 칸은 뒤에 이어 붙임
+        cell_index = self._cell_index
+        n_before = len(self.cells)
+        other_index = np.empty(len(other_cells), dtype=np.int64)
+        for j, cell in enumerate(map(tuple, other_cells.tolist())):
+            if cell not in cell_index:
+                cell_index[cell] = len(cell_index)
+            other_index[j] = cell_index[cell]
+
+        n_new = len(cell_index) - n_before
+        if n_new:
+            new_cells = np.array(list(cell_index)[n_before:], dtype=np.int64).reshape(-1, 4)
+            self.cells = np.vstack([self.cells, new_cells])
+            self.counts = np.concatenate([self.counts, np.zeros(n_new, dtype=np.int64)])
+            self.distinct_counts = np.concatenate([self.distinct_counts, np.zeros(n_new, dtype=np.int64)])
+
+        delta_counts = np.zeros(len(self.cells), dtype=np.int64)
+        np.add.at(delta_counts, other_index, other.counts)
+        delta_distinct = np.zeros(len(self.cells), dtype=np.int64)
+
+        # variant
+        variant_index = self._variant_index
+        variant_counts = self.variant_counts.tolist()
+        for variant, freq in zip(other.variants, other.variant_counts.tolist()):
+            if variant in variant_index:
+                variant_counts[variant_index[variant]] += freq
+                continue
+
+            variant_index[variant] = len(self.variants)
+            self.variants.append(variant)
+            variant_counts.append(freq)
+
+            codes = [self._activity_index[activity] for activity in variant]
+            for layer in range(len(codes) - 1):
+                delta_distinct[cell_index[(len(codes) - 2, layer, codes[layer], codes[layer + 1])]] += 1
+
+        self.variant_counts = np.asarray(variant_counts, dtype=np.int64)
+        self.counts += delta_counts
+        self.distinct_counts += delta_distinct
+
+        # 계산된 view 갱신 : 바뀐 행만 다시 정규화
+        for (layered, by_length), (counts, probs) in self._views.items():
+            delta = delta_distinct if by_length else delta_counts
+            touched = self._add_to_view(counts, np.flatnonzero(delta).tolist(), delta, layered, by_length)
+
+            for group, from_activity in touched:
+                if by_length:
+                    probs.setdefault(group, {})[from_activity] = _normalize({from_activity: counts[group][from_activity]})[from_activity]
+                else:
+                    probs[from_activity] = _normalize({from_activity: counts[from_activity]})[from_activity]
+
+        # 누적된 결과는 원래 BasedTraces의 EventLog와 더 이상 일치하지 않음
+        self._source = None
+        self.__dict__.pop('data', None)
+        self.__dict__.pop('_compat', None)
+        return self
+
+    # ---------------------------------------------------------------
+    # 저장 / 불러오기
+    # ---------------------------------------------------------------
+    def save(self, path):
+        """누적 상태를 .npz 파일로 저장 (pickle 없이 NumPy 배열만 사용)"""
+        variant_codes = [self._activity_index[activity] for variant in self.variants for activity in variant]
+        variant_offsets = np.zeros(len(self.variants) + 1, dtype=np.int64)
+        np.cumsum([len(variant) for variant in self.variants], out=variant_offsets[1:])
+
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                activities=np.array(self.activities.tolist(), dtype=str),
+                cells=self.cells,
+                counts=self.counts,
+                distinct_counts=self.distinct_counts,
+                variant_codes=np.asarray(variant_codes, dtype=np.int64),
+                variant_offsets=variant_offsets,
+                variant_counts=self.variant_counts,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """save로 저장한 누적 상태 불러오기"""
+        with np.load(path) as state:
+            activities = state['activities'].tolist()
+            codes = state['variant_codes'].tolist()
+            offsets = state['variant_offsets'].tolist()
+            variants = [tuple(activities[code] for code in codes[start:end]) for start, end in zip(offsets[:-1], offsets[1:])]
+
+            return cls(activities, state['cells'], state['counts'], state['distinct_counts'], variants, state['variant_counts'])
+
+    @cached_property
+    def _cell_index(self):
+        return {cell: i for i, cell in enumerate(map(tuple, self.cells.tolist()))}
+
+    @cached_property
+    def _variant_index(self):
+        return {variant: i for i, variant in enumerate(self.variants)}
+
+    def __getitem__(self, key):
+        """
+        기존 dict 형태 조회 (result['counts'] 등)
+        전이 집계만 미리 만들고, pm4py EventLog(['event_log'], ['length']['event_log'])는 조회할 때 변환
+        """
+        if '_compat' not in self.__dict__:
+            compat = self.to_dict(event_log=False)
+            compat['length'] = _LazyDict(compat['length'], {'event_log': lambda: self.grouped_event_log})
+            self._compat = _LazyDict(compat, {'event_log': lambda: self.event_log})
+        return self._compat[key]
+
+    def __repr__(self):
+        return f"TransitionResult(activities={len(self.activities)}, cells={len(self.cells)}, variants={len(self.variants)})"
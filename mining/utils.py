@@ -1,8 +1,8 @@
 import pandas as pd
-from google.cloud import bigquery
-from google.oauth2 import service_account
 import re
 
+from .cache import QueryCache
+
 def extract_stage_number(state):
     """상태(state) 문자열에서 단계 번호를 추출합니다."""
     if state == 'start': 
@@ -16,23 +16,35 @@ def extract_stage_number(state):
 
 
 
-def load_data_from_bigquery(key_path="key.json", limit=None):
+DEFAULT_TABLE = "helpful-kit-473614-g8.Dugtrio_1.josh_hader_pitch_by_pitch_5yr"
+
+# Statcast 원본(CSV)과 같은 행 순서 : 최신 경기가 위, 타석 안에서는 마지막 투구가 위
+# BigQuery 결과는 ORDER BY 없이는 순서가 보장되지 않고, 케이스 경계(연속된 같은 키)와 pitchOrder가 행 순서에 의존함
+ROW_ORDER = ('game_date DESC', 'game_pk DESC', 'at_bat_number DESC', 'pitch_number DESC')
+
+
+def load_data_from_bigquery(key_path="key.json", limit=None, cache=None, client=None, table=DEFAULT_TABLE, plan=None):
     """
-    BigQuery에서 Josh Hader의 투구 데이터 로드
+    BigQuery에서 투구 데이터 로드 (기본값 : Josh Hader 5년 투구 테이블)
     
     Args:
         key_path: 서비스 계정 키 파일 경로
         limit: 데이터 제한 (None이면 전체)
+        cache: 로컬 Parquet 캐시 (None이면 사용 안 함, True이면 기본 QueryCache, 또는 QueryCache 객체)
+        client: BigQuery Client (None이면 key_path로 생성, 테스트 시 query(...).to_dataframe()을 제공하는 대체 객체 사용 가능)
+        table: 조회할 테이블 (여러 투수가 담긴 테이블이면 run_pitchers로 투수별 일괄 분석)
+        plan: PipelinePlan (None이면 전체 컬럼/전체 행, 지정하면 plan.sql로 필요한 컬럼과 조건을 만족하는 행만 조회)
     
     Returns:
         DataFrame: 투구 데이터
     """
-    credentials = service_account.Credentials.from_service_account_file(key_path)
-    client = bigquery.Client(credentials=credentials, project=credentials.project_id)
-    
-    query = """
+    query = f"""
     SELECT
       game_date,
+      game_pk,
+      at_bat_number,
+      pitch_number,
+      inning,
       pitcher,
       batter,
       stand,
@@ -52,14 +64,38 @@ def load_data_from_bigquery(key_path="key.json", limit=None):
       description,
       events
     FROM
-      `helpful-kit-473614-g8.Dugtrio_1.josh_hader_pitch_by_pitch_5yr`
+      `{table}`
+    ORDER BY
+      {', '.join(ROW_ORDER)}
     """
     
     if limit:
         query += f" LIMIT {limit}"
+
+    if plan is not None:
+        query = plan.sql(table, limit=limit)
+
+    if cache is True:
+        cache = QueryCache()
+
+    if cache is not None:
+        cache_key = cache.make_key(query)
+        df = cache.get(cache_key)
+        if df is not None:
+            return df
+
+    if client is None:
+        from google.cloud import bigquery
+        from google.oauth2 import service_account
+
+        credentials = service_account.Credentials.from_service_account_file(key_path)
+        client = bigquery.Client(credentials=credentials, project=credentials.project_id)
     
     df = client.query(query).to_dataframe()
     df['game_date'] = pd.to_datetime(df['game_date'])
+
+    if cache is not None:
+        cache.put(cache_key, df)
     
     return df
 
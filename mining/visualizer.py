@@ -1,55 +1,86 @@
 import os
+import importlib.util
+import numpy as np
 import pandas as pd
 import webbrowser
 
-import plotly.graph_objects as go
-import networkx as nx
-from pyvis.network import Network
+from .sinks import resolve_output, output_format, atomic_write, write_json
+from .utils import extract_stage_number
 
 
-def sankey_visualizer(data, length):
+NODE_COLORS = {'SI': 'rgba(40, 167, 69, 0.8)', 'SL': 'rgba(0, 123, 255, 0.8)', None: 'rgba(108, 117, 125, 0.8)'}
+LINK_COLORS = {'SI': 'rgba(40, 167, 69, 0.4)', 'SL': 'rgba(0, 123, 255, 0.4)', None: 'rgba(108, 117, 125, 0.4)'}
 
-    # Visualization
+
+def _state_colors(states, palette):
+    """상태 이름 → 색상 (SI : 초록, SL : 파랑, 나머지 : 회색)"""
+    states = pd.Series(states, dtype=object).astype(str)
+    colors = np.full(len(states), palette[None], dtype=object)
+    colors[states.str.contains('SL', regex=False).to_numpy()] = palette['SL']
+    colors[states.str.contains('SI', regex=False).to_numpy()] = palette['SI']
+    return colors.tolist()
+
+
+def sankey_links(data):
+    """
+    전이 확률 → Sankey 노드와 링크 (start의 흐름 1.0을 확률대로 나누어 전파)
+
+    data는 source 단계 순으로 정렬되어 있다고 가정 (ProcessEDA의 전처리 결과)
+    - 같은 source 단계의 연속 구간은 한 번에 계산 (구간 안의 target이 같은 구간의 source가 아니면 순서와 무관)
+    - 그렇지 않은 구간(층이 없는 그래프 등)만 기존처럼 한 행씩 계산
+
+    Returns:
+        tuple: (노드 list, source index, target index, 링크 흐름 값)
+    """
     all_nodes = list(pd.unique(data[['Source', 'Target']].values.ravel('K')))
-    node_map = {node: i for i, node in enumerate(all_nodes)}
-
-    node_colors = []
-    for node in all_nodes:
-        if 'SI' in node:
-            node_colors.append('rgba(40, 167, 69, 0.8)')  # Green for SI
-        elif 'SL' in node:
-            node_colors.append('rgba(0, 123, 255, 0.8)') # Blue for SL
+    node_index = pd.Index(all_nodes)
+
+    sources = node_index.get_indexer(data['Source'])
+    targets = node_index.get_indexer(data['Target'])
+    values = data['Variable'].to_numpy(dtype=np.float64)
+
+    flow = np.zeros(len(all_nodes))
+    if 'start' in node_index:
+        flow[node_index.get_loc('start')] = 1.0
+
+    stages = np.array([extract_stage_number(node) for node in all_nodes], dtype=np.int64)[sources]
+    bounds = np.flatnonzero(np.r_[True, stages[1:] != stages[:-1], True]) if len(stages) else np.array([0])
+
+    link_flow = np.zeros(len(values))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        segment_sources, segment_targets = sources[start:stop], targets[start:stop]
+
+        if np.isin(segment_sources, segment_targets).any():
+            for i in range(start, stop):
+                link_flow[i] = flow[sources[i]] * values[i]
+                flow[targets[i]] += link_flow[i]
         else:
-            node_colors.append('rgba(108, 117, 125, 0.8)') # Gray for others
-
-    flow_values = {'start': 1.0}
-
-    source_indices = []
-    target_indices = []
-    link_values = []
-    link_colors = []
-
-    def get_link_color(target_node):
-        if 'SI' in target_node:
-            return 'rgba(40, 167, 69, 0.4)'  # Green for SI
-        elif 'SL' in target_node:
-            return 'rgba(0, 123, 255, 0.4)' # Blue for SL
-        return 'rgba(108, 117, 125, 0.4)' # Gray for others
-
-    for _, row in data.iterrows():
-        source = row['Source']
-        target = row['Target']
-        variable = row['Variable']
-        
+            link_flow[start:stop] = flow[segment_sources] * values[start:stop]
+            np.add.at(flow, segment_targets, link_flow[start:stop])
 
-        current_flow = flow_values.get(source, 0)    
-        link_flow = current_flow * variable
-        flow_values[target] = flow_values.get(target, 0) + link_flow
-        
-        source_indices.append(node_map[source])
-        target_indices.append(node_map[target])
-        link_values.append(link_flow)
-        link_colors.append(get_link_color(target))
+    return all_nodes, sources, targets, link_flow
+
+
+def sankey_visualizer(data, length, output=None):
+    """
+    단계별 전이 확률 Sankey diagram
+
+    Args:
+        data: Source, Target, Variable(확률) 컬럼의 DataFrame
+        length: 제목에 표시할 시퀀스 길이
+        output: None이면 화면 출력(fig.show)
+                경로(str), 경로 list 또는 OutputSink이면 파일로만 저장 (확장자 : html, png, json)
+                - html : plotly.js는 CDN에서 불러옴 (파일마다 수 MB를 포함하지 않음)
+                - png  : kaleido 필요 (requirements.txt, kaleido 1.x는 Chrome도 필요 : plotly_get_chrome)
+                         없으면 어떤 파일도 쓰기 전에 ImportError
+                - json : 노드와 링크 흐름 값
+
+    Returns:
+        list: 저장한 파일 경로 (output이 None이면 빈 list)
+    """
+    import plotly.graph_objects as go
+
+    all_nodes, source_indices, target_indices, link_values = sankey_links(data)
 
     fig = go.Figure(data=[go.Sankey(
         node=dict(
@@ -57,53 +88,82 @@ def sankey_visualizer(data, length):
             thickness=20,
             line=dict(color="black", width=0.5),
             label=all_nodes,
-            color=node_colors,
+            color=_state_colors(all_nodes, NODE_COLORS),
         ),
 
         link=dict(
-            source=source_indices,
-            target=target_indices,
-            value=link_values,
-            color=link_colors,
+            source=source_indices.tolist(),
+            target=target_indices.tolist(),
+            value=link_values.tolist(),
+            color=_state_colors(data['Target'], LINK_COLORS),
             hovertemplate='Source: %{source.label}<br>' +
                         'Target: %{target.label}<br>' +
                         'variable: %{value:.2%})'
         ))])
 
+    title = f"Multi-Layer State Transition ({length})"
     fig.update_layout(
-        title_text=f"Multi-Layer State Transition ({length})",
+        title_text=title,
         font_size=20,
         width=800,
         height=600
     )
 
-    fig.show()
+    paths = resolve_output(output, f"sankey_{length}")
+    if not paths:
+        fig.show()
+        return []
 
+    if any(output_format(path) == 'png' for path in paths) and importlib.util.find_spec('kaleido') is None:
+        raise ImportError("Sankey PNG 저장에는 kaleido가 필요합니다 : pip install kaleido (또는 html / json 형식 사용)")
 
-def interactive_graph(df_preprocessing):
+    for path in paths:
+        fmt = output_format(path)
+        if fmt == 'html':
+            atomic_write(path, lambda tmp_path: fig.write_html(tmp_path, include_plotlyjs='cdn', auto_open=False))
+        elif fmt == 'png':
+            atomic_write(path, lambda tmp_path: fig.write_image(tmp_path, format='png'))
+        else:
+            write_json({
+                'title': title,
+                'nodes': all_nodes,
+                'links': [{'source': all_nodes[s], 'target': all_nodes[t], 'probability': float(p), 'value': float(v)}
+                          for s, t, p, v in zip(source_indices, target_indices, data['Variable'], link_values)],
+            }, path)
+
+    return paths
 
-    flow_values = {'start' : 1.0}
-    all_node = list(pd.unique(df_preprocessing[['Source', 'Target']].values.ravel("K")))
-    
 
+def _transition_graph(df_preprocessing):
+    """전이 확률 DataFrame → networkx DiGraph (edge : weight, label)"""
+    import networkx as nx
+
+    all_node = list(pd.unique(df_preprocessing[['Source', 'Target']].values.ravel("K")))
 
-    # 그래프 생성
     G = nx.DiGraph()
+    G.add_nodes_from(all_node)
+    G.add_edges_from((from_act, to_act, {'weight': val, 'label': f"{val:.2f}"})
+                     for from_act, to_act, val in zip(df_preprocessing['Source'], df_preprocessing['Target'], df_preprocessing['Variable']))
+    return G
 
-    # Node  & Edge 생성
-    for node in all_node : G.add_node(node)
-    for from_act, to_act, val in zip(df_preprocessing['Source'], df_preprocessing['Target'], df_preprocessing['Variable']):        
-        
-        if df_preprocessing['Variable'].dtype == 'int64':
-            label = f"{val}"
-        else :
-            label = f"{val:.2f}"
 
-        G.add_edge(from_act, to_act, weight=val, label=f"{val:.2f}")
+def _edge_widths(G, low, high):
+    """edge 확률 → 두께 (최소 low, 최대 high로 정규화)"""
+    all_weights = [G[u][v]['weight'] for u, v in G.edges()]
+    max_weight = max(all_weights) if all_weights else 1.0
+    min_weight = min(all_weights) if all_weights else 0.0
+
+    if max_weight > min_weight:
+        return [low + (weight - min_weight) / (max_weight - min_weight) * (high - low) for weight in all_weights]
+    return [(low + high) / 2] * len(all_weights)
 
 
-    # 네트워크 생성
-    net = Network(height="800px", width="100%", bgcolor="#ffffff", font_color="black", directed=True)
+def _network(G, cdn_resources='local'):
+    """DiGraph → pyvis Network ('local'이면 저장할 때 현재 디렉토리에 lib/를 복사)"""
+    from pyvis.network import Network
+
+    net = Network(height="800px", width="100%", bgcolor="#ffffff", font_color="black", directed=True,
+                  cdn_resources=cdn_resources)
 
     # 네트워크 그래프 : Node Parameter
     node_dict = {}
@@ -126,27 +186,14 @@ def interactive_graph(df_preprocessing):
         net.add_node(node, label=node, **node_dict)
         
 
-    # 모든 확률 값 가져오기 (두께 정규화용)
-    all_weights = [G[u][v]['weight'] for u, v in G.edges()]
-    max_weight = max(all_weights) if all_weights else 1.0
-    min_weight = min(all_weights) if all_weights else 0.0    
-
-    # 네트워크 그래프에 엣지 추가
-    # edge_color = "rgba(74, 144, 226, 0.8)"  
-    for u, v in G.edges():
+    # 네트워크 그래프에 엣지 추가 (두께 : 최소 1, 최대 10)
+    for (u, v), width in zip(G.edges(), _edge_widths(G, 1, 10)):
         weight = G[u][v]['weight']
         label = G[u][v].get('label', f'{weight:.2f}')
-        
-        # 두께 정규화 (최소 1, 최대 10)
-        if max_weight > min_weight:
-            normalized_weight = 1 + (weight - min_weight) / (max_weight - min_weight) * 9
-        else:
-            normalized_weight = 5
 
         net.add_edge(u, v, 
                     label=label, 
-                    # color=edge_color,
-                    width=normalized_weight,
+                    width=width,
                     arrows="to",
                     arrowStrikethrough=False)
 
@@ -193,17 +240,88 @@ def interactive_graph(df_preprocessing):
     }
     """)
 
-    # HTML 파일로 저장
-    output_file = 'test.html'
-    file_path = os.path.abspath(output_file)
-    net.save_graph(output_file)
-
-    print(f"\n인터랙티브 그래프가 다음 위치에 저장되었습니다:")
-    print(f"  {file_path}")
-    print(f"브라우저에서 열어보세요!")
+    return net
+
+
+def _save_graph_png(G, path):
+    """DiGraph → 정적 PNG (matplotlib Agg, 화면 출력 없음)"""
+    import networkx as nx
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    nodes = list(G.nodes())
+    node_colors = ["#4A90E2"] * len(nodes)
+    if nodes:
+        node_colors[0] = "#E3F2FD"
+        node_colors[-1] = "#1565C0"
+
+    fig = Figure(figsize=(15, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    # seed 고정으로 실행할 때마다 같은 위치에 그려지도록 설정
+    pos = nx.spring_layout(G, seed=42, k=0.8, iterations=50)
+    nx.draw_networkx_edges(G, pos, ax=ax, width=_edge_widths(G, 0.5, 5), edge_color="#4A90E2", alpha=0.6,
+                           arrowsize=20, arrowstyle='->', connectionstyle='arc3, rad=0.1')
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=2000, node_color=node_colors, edgecolors='black', linewidths=1.5)
+    nx.draw_networkx_labels(G, pos, ax=ax, font_size=12, font_color="black", font_weight="bold")
+    nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels={(u, v): G[u][v]['label'] for u, v in G.edges()},
+                                 font_size=10, font_color='black', rotate=False,
+                                 bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', boxstyle='round,pad=0.3'))
+
+    ax.set_title("Pitch Type Transition Probability Network", fontsize=16)
+    ax.axis('off')
+    fig.tight_layout()
+
+    atomic_write(path, lambda tmp_path: fig.savefig(tmp_path, format='png'))
+
+
+def interactive_graph(df_preprocessing, output=None, name='graph'):
+    """
+    전이 확률 네트워크 그래프
+
+    Args:
+        df_preprocessing: Source, Target, Variable(확률) 컬럼의 DataFrame
+        output: None이면 test.html로 저장 후 브라우저로 열기
+                경로(str), 경로 list 또는 OutputSink이면 파일로만 저장 (브라우저를 열지 않음)
+                - html : pyvis 인터랙티브 그래프 (vis.js는 CDN에서 불러옴)
+                - png  : matplotlib 정적 그래프
+                - json : 노드와 edge 확률
+        name: OutputSink로 저장할 때 사용할 파일 이름
+
+    Returns:
+        list: 저장한 파일 경로 (output이 None이면 빈 list)
+    """
+    G = _transition_graph(df_preprocessing)
+
+    paths = resolve_output(output, name)
+    if not paths:
+        # HTML 파일로 저장
+        output_file = 'test.html'
+        file_path = os.path.abspath(output_file)
+        _network(G).save_graph(output_file)
+
+        print(f"\n인터랙티브 그래프가 다음 위치에 저장되었습니다:")
+        print(f"  {file_path}")
+        print(f"브라우저에서 열어보세요!")
+
+        # 자동으로 브라우저 열기
+        webbrowser.open(f'file://{file_path}')
+        return []
+
+    for path in paths:
+        fmt = output_format(path)
+        if fmt == 'html':
+            atomic_write(path, _network(G, cdn_resources='remote').save_graph)
+        elif fmt == 'png':
+            _save_graph_png(G, path)
+        else:
+            write_json({
+                'nodes': list(G.nodes()),
+                'edges': [{'source': u, 'target': v, 'probability': float(G[u][v]['weight'])} for u, v in G.edges()],
+            }, path)
 
-    # 자동으로 브라우저 열기
-    webbrowser.open(f'file://{file_path}')
+    return paths
 
 # import networkx as nx
 # import matplotlib.pyplot as plt
@@ -0,0 +1,4 @@
+"""
+pytest 테스트 (실행 : python -m pytest -q)
+최적화한 구현을 기존(baseline) 구현과 같은 결과를 내는지 확인
+"""
@@ -0,0 +1,189 @@
+"""
+기존(baseline) 구현을 순수 Python으로 옮긴 참조 구현
+- 전이 집계 : pm4py EventLog 대신 케이스별 활동 이름 list를 입력으로 사용
+- 전처리   : 케이스별 loop로 시작/종료 노드를 추가하는 기존 add_node_and_preprocess
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def _probs(counts):
+    return {from_activity: {to_activity: count / sum(to_dict.values()) for to_activity, count in to_dict.items()}
+            for from_activity, to_dict in counts.items()}
+
+
+def _layered(activities):
+    return [activity + "_" + str(i) if 0 < i < len(activities) - 1 else activity for i, activity in enumerate(activities)]
+
+
+def variants(cases):
+    """variant → 케이스 수 (처음 등장한 순서, pm4py get_variants와 같음)"""
+    result = {}
+    for activities in cases:
+        result[tuple(activities)] = result.get(tuple(activities), 0) + 1
+    return result
+
+
+def achieve_rawdata(cases):
+    raw_data = defaultdict(list)
+    for activities, freq in variants(cases).items():
+        raw_data['all'].append((activities, freq, len(activities) - 2))
+        raw_data[f'length_{len(activities) - 2}'].append((activities, freq))
+    return dict(raw_data)
+
+
+def transition_view(cases, layered=False, by_length=False):
+    """
+    BasedTraces.calc_translation / calc_transition_same_length / calc_transition_same_layer /
+    calc_transition_same_layer_and_length와 같은 (counts, probs)
+    길이별 집계는 variant마다 한 번씩, 나머지는 케이스마다 집계
+    """
+    sequences = list(variants(cases)) if by_length else cases
+    counts = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+
+    for activities in sequences:
+        group = f'length_{len(activities) - 2}' if by_length else None
+        names = _layered(list(activities)) if layered else list(activities)
+        for from_activity, to_activity in zip(names[:-1], names[1:]):
+            counts[group][from_activity][to_activity] += 1
+
+    counts = {group: {key: dict(value) for key, value in to_dict.items()} for group, to_dict in counts.items()}
+    if by_length:
+        return counts, {group: _probs(to_dict) for group, to_dict in counts.items()}
+    counts = counts.get(None, {})
+    return counts, _probs(counts)
+
+
+def plain(value):
+    """중첩 dict(defaultdict 포함) → 일반 dict (비교용)"""
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    return value
+
+
+def flatten(value, path=()):
+    """중첩 dict → {(key, ...): 값} (pytest.approx 비교용)"""
+    if not isinstance(value, dict):
+        return {path: value}
+    flat = {}
+    for key, item in value.items():
+        flat.update(flatten(item, path + (key,)))
+    return flat
+
+
+def assert_same_result(result, expected):
+    """두 TransitionResult가 같은지 (활동, 칸, variant 순서 포함)"""
+    assert result.activities.tolist() == expected.activities.tolist()
+    assert result.variants == expected.variants
+    np.testing.assert_array_equal(result.variant_counts, expected.variant_counts)
+    np.testing.assert_array_equal(result.cells, expected.cells)
+    np.testing.assert_array_equal(result.counts, expected.counts)
+    np.testing.assert_array_equal(result.distinct_counts, expected.distinct_counts)
+
+
+def random_cases(n_cases, activities=('FF', 'SL', 'CH', 'CU', 'SI'), max_length=6, seed=0):
+    """start/end 사이에 활동이 1 ~ max_length개 이어지는 케이스 목록"""
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _ in range(n_cases):
+        middle = rng.choice(list(activities), rng.integers(1, max_length + 1)).tolist()
+        cases.append(['start', *middle, 'end'])
+    return cases
+
+
+def cases_frame(cases, first_case=0):
+    """케이스 목록 → prepare_eventLog 결과와 같은 형태의 DataFrame"""
+    rows = [(first_case + case, activity) for case, activities in enumerate(cases) for activity in activities]
+    df = pd.DataFrame(rows, columns=['case:concept:name', 'concept:name'])
+    df['time:timestamp'] = pd.Timestamp('2024-04-01') + pd.to_timedelta(np.arange(len(df)), unit='s')
+    df['processID'] = df['case:concept:name']
+    return df
+
+
+# ---------------------------------------------------------------------------
+# 전처리 (mining/preprocessing.py 기존 구현, 케이스별 loop)
+# deleteNullPitchType의 정렬만 stable로 바꿈 : 기존 quicksort는 케이스 안의 행 순서를 보장하지 않아
+# 시작/종료 노드가 복사하는 행(첫/마지막 투구)이 실행마다 달라질 수 있음
+# ---------------------------------------------------------------------------
+
+def deleteNullPitchType(df_event):
+    p_index = set(df_event[df_event['pitch_type'].isna()]['processID'])
+    df_event = df_event[~df_event['processID'].isin(p_index)]
+    return df_event.sort_values(by=['processID'], ascending=True, kind='stable').reset_index(drop=True)
+
+
+def descriptionToGroups(df_event):
+    mapping = {
+        'called_strike': 'S', 'swinging_strike': 'S', 'swinging_strike_blocked': 'S', 'foul_tip': 'S',
+        'foul_bunt': 'S', 'missed_bunt': 'S',
+        'blocked_ball': 'B', 'ball': 'B', 'hit_by_pitch': 'B',
+        'foul': 'I', 'hit_into_play': 'I',
+    }
+    df_event['grouped_description'] = df_event['description'].map(mapping).fillna('result')
+    return df_event
+
+
+def attach_case_result_to_pitch_type(df_event):
+    case_results = df_event.groupby('processID')['events'].apply(
+        lambda x: x.dropna().iloc[-1] if len(x.dropna()) > 0 else None
+    )
+
+    def classify_result(event):
+        if event in ['strikeout', 'out', 'field_out', 'force_out', 'double_play', 'triple_play',
+                     'strikeout_double_play', 'sac_fly', 'sac_bunt']:
+            return 'out'
+        elif event in ['single', 'double', 'triple', 'home_run', 'walk', 'hit_by_pitch',
+                       'catcher_interf', 'field_error', 'fielders_choice']:
+            return 'reach'
+        else:
+            return 'other'
+
+    case_results = case_results.apply(classify_result)
+    df_event = df_event.merge(case_results.rename('case_result'), on='processID', how='left')
+    df_event['pitch_type'] = df_event['pitch_type'] + '_' + df_event['case_result']
+    return df_event
+
+
+def add_node_and_preprocess(df_event, start_name, end_name, case_type=None):
+    acept_data = deleteNullPitchType(df_event)
+    acept_data = descriptionToGroups(acept_data)
+
+    if case_type == 'reach' or case_type == 'out':
+        acept_data = attach_case_result_to_pitch_type(acept_data)
+        acept_data['concept:name'] = acept_data['pitch_type'].astype(str)
+        if case_type == 'reach+discription' or case_type == 'out+discription':
+            acept_data['concept:name'] = acept_data['pitch_type'].astype(str) + "_" + acept_data['grouped_description'].astype(str)
+
+    acept_data['time:timestamp'] = acept_data['game_date'] + pd.to_timedelta(acept_data['pitchOrder'], unit='s')
+    acept_data['case:concept:name'] = acept_data['processID']
+    if case_type == None:
+        acept_data['concept:name'] = acept_data['pitch_type'].astype(str)
+    elif case_type == 'discription':
+        acept_data['concept:name'] = acept_data['pitch_type'].astype(str) + "_" + acept_data['grouped_description'].astype(str)
+
+    add_node_list = []
+    for process in acept_data['processID'].unique():
+        case_df = acept_data[acept_data['processID'] == process]
+        if len(case_df) > 0:
+            first_row = case_df.iloc[-1].copy()
+            first_row['time:timestamp'] = first_row['time:timestamp'] - timedelta(seconds=1)
+            first_row['case:concept:name'] = first_row['processID']
+            first_row['concept:name'] = start_name
+            first_row['pitch_type'] = start_name
+            first_row['pitchOrder'] = -1
+
+            last_row = case_df.iloc[0].copy()
+            last_row['time:timestamp'] = last_row['time:timestamp'] + timedelta(seconds=1)
+            last_row['case:concept:name'] = last_row['processID']
+            last_row['concept:name'] = end_name
+            last_row['pitch_type'] = end_name
+            last_row['pitchOrder'] = len(case_df)
+
+            add_node_list.extend([first_row, last_row])
+
+    node_df = pd.DataFrame(add_node_list)
+    acept_data = pd.concat([acept_data, node_df], ignore_index=True)
+    return acept_data.sort_values(by=['processID', 'pitchOrder'], ascending=[True, True]).reset_index(drop=True)
@@ -0,0 +1,45 @@
+"""run_pitchers : 투수별 일괄 분석 워커"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.synthetic import make_statcast
+from clustering.distance import ClusteredTraces
+from mining.pipeline import preprocessing_df
+from mining.preprocessing import one_way_filter
+
+
+def test_call_without_traces():
+    df = one_way_filter(preprocessing_df(make_statcast(2_000, seed=3)), 'events', ['strikeout'])
+    clustered = ClusteredTraces(df)
+    without = clustered(n_clusters=3, traces=False)
+    full = clustered(n_clusters=3)
+
+    assert 'traces' not in without
+    assert len(full['traces']) == len(without['sequences'])
+    assert without['sequences'] == full['sequences']
+    np.testing.assert_array_equal(without['clusters'], full['clusters'])
+
+
+def test_worker_does_not_import_pm4py(tmp_path):
+    code = (
+        "import sys\n"
+        "import pyarrow as pa\n"
+        "from benchmarks.synthetic import make_statcast\n"
+        "from mining import batch\n"
+        "df = make_statcast(2_000, seed=3)\n"
+        "path = sys.argv[1]\n"
+        "table = pa.Table.from_pandas(df, preserve_index=False)\n"
+        "with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:\n"
+        "    writer.write_table(table)\n"
+        "options = {'n_clusters': 3, 'events': ['strikeout'], 'start_name': 'start', 'end_name': 'end',\n"
+        "           'case_type': None, 'case_keys': 'date_batter'}\n"
+        "_, output, report = batch._run_pitcher(path, df['pitcher'].iloc[0], 0, len(df), options)\n"
+        "assert report['status'] == 'ok', report.get('traceback')\n"
+        "assert 'traces' not in output['clusters']\n"
+        "assert 'pm4py' not in sys.modules, 'pm4py imported'\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code, str(tmp_path / 'pitches.arrow')], cwd=root, check=True)
@@ -0,0 +1,130 @@
+"""QueryCache : 캐시 적중/만료/LRU 삭제/원자적 저장 확인 (BigQuery 대신 query 호출 수를 세는 대체 client 사용)"""
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_statcast
+from mining.cache import QueryCache
+from mining.utils import load_data_from_bigquery
+
+
+class FakeClient:
+    """query(...).to_dataframe()을 제공하는 BigQuery Client 대체 객체"""
+
+    def __init__(self, df):
+        self.df = df
+        self.queries = []
+
+    def query(self, query):
+        self.queries.append(query)
+        return self
+
+    def to_dataframe(self):
+        return self.df.copy()
+
+
+@pytest.fixture(scope='module')
+def pitches():
+    return make_statcast(500, seed=2)
+
+
+@pytest.fixture
+def client(pitches):
+    return FakeClient(pitches)
+
+
+def _files(cache):
+    return sorted(os.listdir(cache.cache_dir)) if os.path.isdir(cache.cache_dir) else []
+
+
+def test_hit_and_miss(client, pitches, tmp_path):
+    cache = QueryCache(tmp_path / 'cache')
+
+    first = load_data_from_bigquery(cache=cache, client=client)
+    second = load_data_from_bigquery(cache=cache, client=client)
+    assert len(client.queries) == 1
+    pd.testing.assert_frame_equal(second, first)
+
+    # 쿼리가 다르면 (LIMIT) 다른 키
+    load_data_from_bigquery(limit=10, cache=cache, client=client)
+    assert len(client.queries) == 2
+    assert len(_files(cache)) == 2
+
+
+def test_ttl_expiry(client, tmp_path):
+    cache = QueryCache(tmp_path / 'cache', ttl=60)
+    load_data_from_bigquery(cache=cache, client=client)
+    load_data_from_bigquery(cache=cache, client=client)
+    assert len(client.queries) == 1
+
+    # 저장 시각(mtime)을 ttl 이전으로 되돌리면 만료 → 다시 조회
+    [name] = _files(cache)
+    path = os.path.join(cache.cache_dir, name)
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    load_data_from_bigquery(cache=cache, client=client)
+    assert len(client.queries) == 2
+    assert time.time() - os.path.getmtime(path) < 60
+
+
+def test_lru_eviction(pitches, tmp_path):
+    cache = QueryCache(tmp_path / 'cache', ttl=None, max_bytes=None)
+    cache.put('a', pitches)
+    size = os.path.getsize(cache._path('a'))
+    cache.max_bytes = int(size * 2.5)
+
+    cache.put('b', pitches)
+    now = time.time()
+    for key, used in (('a', now - 30), ('b', now - 60)):
+        os.utime(cache._path(key), (used, os.path.getmtime(cache._path(key))))
+
+    # a를 읽으면 접근 시각 갱신 → 크기를 넘을 때 가장 오래 사용하지 않은 b부터 삭제
+    assert cache.get('a') is not None
+    cache.put('c', pitches)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert sum(os.path.getsize(os.path.join(cache.cache_dir, name)) for name in _files(cache)) <= cache.max_bytes
+
+
+def test_failed_write_leaves_no_partial_file(pitches, tmp_path, monkeypatch):
+    cache = QueryCache(tmp_path / 'cache')
+    cache.put('key', pitches)
+    before = _files(cache)
+
+    def interrupted(df, path, **kwargs):
+        """일부만 쓰고 실패 (디스크 부족, 중단 등)"""
+        with open(path, 'wb') as f:
+            f.write(b'PAR1 partial')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(pd.DataFrame, 'to_parquet', interrupted)
+    with pytest.raises(OSError):
+        cache.put('key', pitches.head(10))
+    monkeypatch.undo()
+
+    assert _files(cache) == before
+    pd.testing.assert_frame_equal(cache.get('key'), pitches)
+
+
+@pytest.mark.parametrize('ttl', [60, None])
+def test_evict_removes_stale_tmp_files(pitches, tmp_path, ttl):
+    cache = QueryCache(tmp_path / 'cache', ttl=ttl)
+    cache.put('key', pitches)
+
+    # 저장 중 프로세스가 종료되어 남은 임시 파일 : 오래된 것만 삭제 (쓰는 중일 수 있는 최근 파일은 유지)
+    stale = tmp_path / 'cache' / 'old.parquet.0123.tmp'
+    fresh = tmp_path / 'cache' / 'new.parquet.4567.tmp'
+    for path in (stale, fresh):
+        path.write_bytes(b'PAR1 partial')
+    old = time.time() - max(ttl or 0, QueryCache.tmp_ttl) - 10
+    os.utime(stale, (old, old))
+
+    cache.evict()
+
+    assert _files(cache) == ['key.parquet', 'new.parquet.4567.tmp']
+    pd.testing.assert_frame_equal(cache.get('key'), pitches)
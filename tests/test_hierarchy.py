@@ -0,0 +1,35 @@
+"""cut_linkage / silhouette_scores : sklearn 군집(precomputed, complete linkage)과 같은 결과인지 확인"""
+import numpy as np
+import pytest
+from scipy.spatial.distance import pdist, squareform
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.metrics import silhouette_score
+
+from clustering.hierarchy import linkage_tree, cut_linkage, silhouette_scores
+
+
+@pytest.fixture(scope='module')
+def condensed():
+    points = np.random.default_rng(3).normal(size=(60, 4))
+    return pdist(points)
+
+
+@pytest.mark.parametrize('n_clusters', [1, 2, 3, 5, 10, 60])
+def test_cut_linkage_matches_sklearn(condensed, n_clusters):
+    expected = AgglomerativeClustering(n_clusters=n_clusters, metric='precomputed', linkage='complete').fit_predict(squareform(condensed))
+    labels = cut_linkage(linkage_tree(condensed), n_clusters)
+
+    np.testing.assert_array_equal(labels, expected)
+
+
+def test_cut_linkage_rejects_too_many_clusters(condensed):
+    with pytest.raises(ValueError):
+        cut_linkage(linkage_tree(condensed), 61)
+
+
+def test_silhouette_scores_match_sklearn(condensed):
+    linked = linkage_tree(condensed)
+    labelings = [cut_linkage(linked, k) for k in (2, 4, 8)]
+    expected = [silhouette_score(squareform(condensed), labels, metric='precomputed') for labels in labelings]
+
+    assert silhouette_scores(condensed, labelings, block_bytes=1024) == pytest.approx(expected)
@@ -0,0 +1,49 @@
+"""SequenceIndex : 모든 variant와의 편집 거리(brute force)로 구한 결과와 같은지 확인"""
+import numpy as np
+import pytest
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from clustering.index import SequenceIndex, _encode
+from benchmarks.bench_index import make_variants
+
+
+@pytest.fixture(scope='module')
+def index():
+    activities, variants = make_variants(3_000, seed=7)
+    return SequenceIndex(activities, variants)
+
+
+def _queries(index, n_queries=40, seed=0):
+    """색인에 있는 variant와 구종을 끼워 넣거나 바꾼 variant (색인에 없는 시퀀스)"""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in rng.integers(0, len(index), n_queries):
+        sequence = list(index.sequences[i])
+        queries.append(sequence)
+        queries.append(sequence[:2] + [5, 5, 5] + sequence[2:])
+        queries.append([sequence[0]] + [3] * len(sequence[1:-1]) + [sequence[-1]])
+    return queries
+
+
+def _brute_force(index, query):
+    return process.cdist([_encode(query)], index._keys, scorer=Levenshtein.distance, dtype=np.int32, workers=1)[0]
+
+
+@pytest.mark.parametrize('r', [0, 1, 2, 3])
+def test_radius_matches_brute_force(index, r):
+    for query in _queries(index):
+        distances = _brute_force(index, query)
+        within = np.flatnonzero(distances <= r)
+        expected = sorted(zip(within.tolist(), distances[within].tolist()), key=lambda item: (item[1], item[0]))
+
+        assert index.radius(query, r) == expected
+
+
+@pytest.mark.parametrize('k', [1, 5, 50])
+def test_knn_matches_brute_force(index, k):
+    for query in _queries(index):
+        distances = _brute_force(index, query)
+        order = np.lexsort((np.arange(len(distances)), distances))[:k]
+
+        assert index.knn(query, k) == [(int(i), int(distances[i])) for i in order]
@@ -0,0 +1,35 @@
+"""clara : 표본이 전체일 때 모든 medoid 조합을 확인한(exhaustive) 가중 k-medoids와 같은 비용인지 확인"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from clustering.medoids import clara
+
+
+@pytest.fixture(scope='module')
+def variants():
+    rng = np.random.default_rng(4)
+    sequences = [rng.integers(0, 5, rng.integers(2, 7)).tolist() for _ in range(14)]
+    weights = rng.integers(1, 200, len(sequences))
+    return sequences, weights
+
+
+def _exhaustive(sequences, weights, n_clusters):
+    distances = process.cdist(sequences, sequences, scorer=Levenshtein.distance, dtype=np.int32)
+    costs = {medoids: float(weights @ distances[:, list(medoids)].min(axis=1))
+             for medoids in combinations(range(len(sequences)), n_clusters)}
+    return min(costs.values())
+
+
+@pytest.mark.parametrize('n_clusters', [1, 2, 3, 4])
+def test_full_sample_matches_exhaustive(variants, n_clusters):
+    sequences, weights = variants
+    result = clara(sequences, n_clusters, weights=weights, n_samples=20, sample_size=len(sequences))
+
+    assert result['cost'] == _exhaustive(sequences, weights, n_clusters)
+    assert len(set(result['medoids'].tolist())) == n_clusters
+    np.testing.assert_array_equal(result['clusters'][result['medoids']], np.arange(n_clusters))
+
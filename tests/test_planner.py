@@ -0,0 +1,113 @@
+"""PipelinePlan pushdown : 쿼리/CSV에서 조건을 적용해도 전체를 읽은 뒤 적용한 결과와 같은지 확인"""
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_statcast
+from mining.pipeline import one_step_EDA_from_bigquery, one_step_EDA_from_csv
+from mining.planner import PipelinePlan, CASE_RUN
+from mining.utils import load_data_from_bigquery
+
+from .reference import assert_same_result
+
+TABLE = 'pitches'
+
+
+class SqliteClient:
+    """
+    BigQuery Client 대체 객체 (sqlite 메모리 DB)
+    sqlite에 없는 DATE 타입만 문자열 비교로 바꿔 실행 (game_date는 'YYYY-MM-DD' 문자열로 저장)
+    """
+
+    def __init__(self, df):
+        self.connection = sqlite3.connect(':memory:')
+        df.assign(game_date=df['game_date'].dt.strftime('%Y-%m-%d')).to_sql(TABLE, self.connection, index=False)
+        self.queries = []
+
+    def query(self, query):
+        self.queries.append(query)
+        query = re.sub(r"CAST\((\w+\.game_date) AS DATE\)", r"\1", query)
+        query = re.sub(r"DATE ('\d{4}-\d{2}-\d{2}')", r"\1", query)
+        self._result = pd.read_sql_query(query, self.connection)
+        return self
+
+    def to_dataframe(self):
+        return self._result
+
+
+@pytest.fixture(scope='module')
+def pitches():
+    return make_statcast(3_000, n_pitchers=3, seed=21)
+
+
+@pytest.fixture(scope='module')
+def client(pitches):
+    # 테이블 저장 순서와 무관하게 ORDER BY로 Statcast 순서를 복원하는지 확인하기 위해 행을 섞어서 저장
+    shuffled = pitches.sample(frac=1, random_state=0).reset_index(drop=True)
+    return SqliteClient(shuffled)
+
+
+@pytest.fixture(scope='module')
+def csv_path(pitches, tmp_path_factory):
+    path = tmp_path_factory.mktemp('statcast') / 'pitches.csv'
+    pitches.to_csv(path, index=False)
+    return path
+
+
+def test_default_query_restores_statcast_order(client, pitches):
+    df = load_data_from_bigquery(client=client, table=TABLE)
+    pd.testing.assert_frame_equal(df, pitches, check_dtype=False)
+
+
+FILTERS = [{}, {'start_date': '2022-01-01', 'end_date': '2024-06-30'}, {'pitchers': [500000, 500002]}]
+
+
+@pytest.mark.parametrize('case_keys', ['date_batter', 'at_bat', 'inning'])
+@pytest.mark.parametrize('filters', FILTERS)
+def test_sql_pushdown_matches_full_load(client, csv_path, case_keys, filters):
+    pushed = one_step_EDA_from_bigquery(client=client, table=TABLE, case_keys=case_keys, pushdown=True, **filters)
+    loaded = one_step_EDA_from_bigquery(client=client, table=TABLE, case_keys=case_keys, pushdown=False, **filters)
+    from_csv = one_step_EDA_from_csv(csv_path, case_keys=case_keys, pushdown=False, **filters)
+
+    assert_same_result(pushed.result, loaded.result)
+    assert_same_result(pushed.result, from_csv.result)
+
+
+@pytest.mark.parametrize('case_keys', ['date_batter', 'at_bat'])
+@pytest.mark.parametrize('filters', FILTERS)
+def test_csv_pushdown_matches_full_load(csv_path, case_keys, filters):
+    pushed = one_step_EDA_from_csv(csv_path, case_keys=case_keys, pushdown=True, **filters)
+    loaded = one_step_EDA_from_csv(csv_path, case_keys=case_keys, pushdown=False, **filters)
+
+    assert_same_result(pushed.result, loaded.result)
+
+
+def test_sql_matches_csv_plan(client, csv_path):
+    plan = PipelinePlan(case_keys='date_batter', start_date='2022-01-01')
+    df = load_data_from_bigquery(client=client, table=TABLE, plan=plan)
+    expected = plan.read_csv(csv_path, optimize=False)[plan.columns + [CASE_RUN]]
+
+    assert list(df.columns) == plan.columns + [CASE_RUN]
+    assert df.groupby(CASE_RUN)['events'].apply(lambda events: (events == 'strikeout').any()).all()
+    # 케이스 번호의 시작값만 다를 수 있음 (같은 구간 → 같은 번호)
+    # 결측 표현만 다름 (sqlite NULL → None, CSV → NaN)
+    pd.testing.assert_frame_equal(df.drop(columns=CASE_RUN).fillna(np.nan), expected.drop(columns=CASE_RUN), check_dtype=False)
+    np.testing.assert_array_equal(pd.factorize(df[CASE_RUN])[0], pd.factorize(expected[CASE_RUN])[0])
+
+
+@pytest.mark.parametrize('limit', [1_237, 2_400])
+@pytest.mark.parametrize('filters', FILTERS)
+def test_limit_counts_source_rows(client, csv_path, pitches, limit, filters):
+    """limit은 조건 적용 전 원본의 앞 limit행 : pushdown 여부, BigQuery/CSV와 관계없이 같은 결과"""
+    pushed = one_step_EDA_from_bigquery(client=client, table=TABLE, limit=limit, pushdown=True, **filters)
+    loaded = one_step_EDA_from_bigquery(client=client, table=TABLE, limit=limit, pushdown=False, **filters)
+    csv_pushed = one_step_EDA_from_csv(csv_path, limit=limit, pushdown=True, **filters)
+    csv_loaded = one_step_EDA_from_csv(csv_path, limit=limit, pushdown=False, **filters)
+
+    assert_same_result(pushed.result, loaded.result)
+    assert_same_result(pushed.result, csv_pushed.result)
+    assert_same_result(pushed.result, csv_loaded.result)
+
@@ -0,0 +1,45 @@
+"""add_node_and_preprocess : 모든 case_type에서 기존 구현(케이스별 loop)과 같은 DataFrame인지 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_statcast
+from mining.preprocessing import define_at_bat_cases, add_node_and_preprocess
+from mining.schema import optimize_dtypes
+
+from . import reference
+
+CASE_TYPES = [None, 'discription', 'reach', 'out', 'reach+discription', 'out+discription']
+
+
+@pytest.fixture(scope='module')
+def pitches():
+    # 결측 pitch_type이 있는 케이스, 여러 타석이 이어진 케이스(date_batter) 포함
+    return make_statcast(2_000, null_rate=0.02, seed=3)
+
+
+@pytest.fixture(scope='module')
+def baseline(pitches):
+    """case_type별 기존 구현 결과 (loop 구현이 느리므로 한 번씩만 계산)"""
+    df_event = define_at_bat_cases(pitches)
+    return {case_type: reference.add_node_and_preprocess(df_event.copy(), 'start', 'end', case_type=case_type)
+            for case_type in CASE_TYPES}
+
+
+def _values(df):
+    """dtype 차이 무시 (기존 구현은 행 단위 concat으로 nullable 정수가 float가 됨, 결측은 NaN으로 통일)"""
+    df = df.astype(object)
+    return df.where(df.notna(), np.nan)
+
+
+@pytest.mark.parametrize('optimize', [False, True])
+@pytest.mark.parametrize('case_type', CASE_TYPES)
+def test_add_node_matches_baseline(pitches, baseline, case_type, optimize):
+    df_event = define_at_bat_cases(pitches)
+    expected = baseline[case_type]
+
+    source = define_at_bat_cases(optimize_dtypes(pitches)) if optimize else df_event
+    result = add_node_and_preprocess(source.copy(), 'start', 'end', case_type=case_type)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(_values(result), _values(expected))
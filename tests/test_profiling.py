@@ -0,0 +1,40 @@
+"""StageProfiler : 단계별 RSS 증가량과 프로세스 최대 RSS 기록 확인"""
+import numpy as np
+import pytest
+
+from mining.profiling import StageProfiler, REPORT_COLUMNS, _rss_peak_mb
+
+pytestmark = pytest.mark.skipif(_rss_peak_mb() is None, reason='최대 RSS를 제공하지 않는 플랫폼')
+
+
+def test_rss_growth_is_per_stage():
+    profiler = StageProfiler()
+    before = _rss_peak_mb()
+
+    # 현재 최대 RSS보다 확실히 큰 배열을 만들어 최대값 갱신
+    with profiler.stage('allocate'):
+        buffer = np.ones(int((before + 64) * 1024 ** 2 / 8))
+        buffer.sum()
+    del buffer
+    with profiler.stage('idle'):
+        pass
+
+    allocate, idle = profiler.records
+    assert allocate['rss_growth_mb'] > 32
+    assert idle['rss_growth_mb'] == 0
+    # 프로세스 최대 RSS는 이전 단계 값을 그대로 가짐 (단계별 값이 아님)
+    assert idle['process_rss_peak_mb'] == allocate['process_rss_peak_mb'] == before + allocate['rss_growth_mb']
+
+
+def test_report_sums_growth_and_keeps_process_peak():
+    profiler = StageProfiler()
+    for _ in range(3):
+        with profiler.stage('chunk'):
+            pass
+
+    report = profiler.report()
+    assert list(report.columns) == REPORT_COLUMNS
+    row = report.iloc[0]
+    assert row['calls'] == 3
+    assert row['rss_growth_mb'] == sum(record['rss_growth_mb'] for record in profiler.records)
+    assert row['process_rss_peak_mb'] == max(record['process_rss_peak_mb'] for record in profiler.records)
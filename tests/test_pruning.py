@@ -0,0 +1,61 @@
+"""prune_transitions : 노드를 합쳐도 단계별 흐름의 합이 보존되는지 확인"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mining.pruning import prune_transitions
+from mining.traces import TraceStore
+from mining.transitions import count_transitions
+from mining.utils import extract_stage_number
+from mining.visualizer import sankey_links
+
+from . import reference
+
+
+@pytest.fixture(scope='module')
+def layered():
+    """ProcessEDA의 layered 전이 확률과 같은 형태 (Source 단계 순 정렬)"""
+    cases = reference.random_cases(2_000, activities=('FF', 'SL', 'CH', 'CU', 'SI', 'FC', 'KC'), max_length=5, seed=5)
+    _, probs = count_transitions(TraceStore.from_dataframe(reference.cases_frame(cases))).view(layered=True)
+
+    data = pd.DataFrame([{'Source': source, 'Target': target, 'Variable': value}
+                         for source, targets in probs.items() for target, value in targets.items()])
+    data['Source_Num'] = data['Source'].map(extract_stage_number)
+    data['Target_Num'] = data['Target'].map(extract_stage_number)
+    return data.sort_values(by=['Source_Num', 'Target_Num']).drop(columns=['Source_Num', 'Target_Num'])
+
+
+def _stage_inflow(data):
+    """target 단계별 유입 흐름의 합"""
+    nodes, _, targets, flows = sankey_links(data)
+    stages = np.array([extract_stage_number(node) for node in nodes])[targets]
+    return pd.Series(flows).groupby(stages).sum()
+
+
+@pytest.mark.parametrize('options', [{'top_k': 1}, {'top_k': 2}, {'min_flow': 0.05}, {'top_k': 2, 'min_flow': 0.02}])
+def test_prune_conserves_flow(layered, options):
+    pruned = prune_transitions(layered, **options)
+
+    pd.testing.assert_series_equal(_stage_inflow(pruned), _stage_inflow(layered))
+    assert _stage_inflow(pruned)[999] == pytest.approx(1.0)
+    # 합쳐진 노드의 전이 확률도 합이 1
+    assert pruned.groupby('Source')['Variable'].sum().to_numpy() == pytest.approx(1.0)
+
+
+def test_prune_limits_nodes(layered):
+    pruned = prune_transitions(layered, top_k=1)
+    nodes = pd.unique(pruned[['Source', 'Target']].values.ravel('K'))
+    stages = pd.Series([extract_stage_number(node) for node in nodes]).value_counts()
+
+    # 단계별 노드 수 ≤ 이전 단계 노드 수 × k + 1
+    assert stages[1] <= 2
+    assert stages[2] <= stages[1] + 1
+
+
+def test_prune_max_layer(layered):
+    pruned = prune_transitions(layered, max_layer=2)
+    stages = pruned['Target'].map(extract_stage_number)
+
+    assert stages[stages != 999].max() == 3
+    assert (pruned['Target'] == 'other_3').any()
+    assert not (pruned['Source'] == 'other_3').any()
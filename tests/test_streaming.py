@@ -0,0 +1,83 @@
+"""stream_transitions_from_csv / refresh_transitions : 청크로 나누어 계산해도 한 번에 계산한 결과와 같은지 확인"""
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_statcast
+from mining.pipeline import preprocessing_df, stream_transitions_from_csv, refresh_transitions
+from mining.preprocessing import one_way_filter, segment_runs
+from mining.probability import BasedTraces
+from mining.transitions import TransitionResult
+
+from .reference import assert_same_result
+
+
+@pytest.fixture(scope='module')
+def pitches():
+    return make_statcast(3_000, seed=11)
+
+
+@pytest.fixture(scope='module')
+def csv_path(pitches, tmp_path_factory):
+    path = tmp_path_factory.mktemp('statcast') / 'pitches.csv'
+    pitches.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope='module')
+def expected(pitches):
+    """한 번에 계산한 결과"""
+    df_filtered = one_way_filter(preprocessing_df(pitches), 'events', ['strikeout'])
+    return BasedTraces(df_filtered)()
+
+
+@pytest.mark.parametrize('pushdown', [True, False])
+@pytest.mark.parametrize('optimize', [True, False])
+def test_chunk_boundary_inside_case(pitches, csv_path, expected, pushdown, optimize):
+    # 케이스 중간에서 청크가 나뉘도록 chunksize 선택
+    runs = segment_runs(pitches['game_date'], pitches['batter'])
+    chunksize = next(size for size in range(500, 1000) if runs[size - 1] == runs[size])
+
+    result = stream_transitions_from_csv(csv_path, chunksize=chunksize, pushdown=pushdown, optimize=optimize)
+    assert_same_result(result, expected)
+
+
+def test_tiny_chunks(pitches, csv_path):
+    # 청크가 케이스 하나보다 작음 → 보류 타석이 여러 청크에 걸쳐 이어짐
+    head = pitches.iloc[:300]
+    expected = BasedTraces(one_way_filter(preprocessing_df(head), 'events', ['strikeout']))()
+
+    assert_same_result(stream_transitions_from_csv(csv_path, chunksize=3, limit=len(head)), expected)
+
+
+def test_single_chunk(csv_path, expected):
+    assert_same_result(stream_transitions_from_csv(csv_path, chunksize=100_000), expected)
+
+
+@pytest.mark.parametrize('options', [{'pitchers': [-1]}, {'start_date': '2099-01-01'}])
+def test_no_matching_cases(csv_path, options):
+    with pytest.raises(ValueError, match='no cases matched'):
+        stream_transitions_from_csv(csv_path, chunksize=500, **options)
+
+
+def test_refresh_transitions(pitches, expected, tmp_path):
+    state_path = tmp_path / 'state.npz'
+    runs = segment_runs(pitches['game_date'], pitches['batter'])
+    split = int(np.flatnonzero(runs == runs[1_500])[0])
+
+    refresh_transitions(pitches.iloc[:split], state_path)
+    result = refresh_transitions(pitches.iloc[split:], state_path)
+
+    assert_same_result(result, expected)
+    assert_same_result(TransitionResult.load(state_path), expected)
+
+
+def test_refresh_transitions_without_matches(pitches, tmp_path):
+    state_path = tmp_path / 'state.npz'
+    no_strikeout = pitches[pitches['events'] != 'strikeout']
+
+    with pytest.raises(ValueError, match='no cases matched'):
+        refresh_transitions(no_strikeout, state_path)
+    assert not state_path.exists()
+
+    saved = refresh_transitions(pitches, state_path)
+    assert_same_result(refresh_transitions(no_strikeout, state_path), saved)
@@ -0,0 +1,113 @@
+"""count_transitions / TransitionResult : 기존 BasedTraces 계산과 같은 결과인지 확인"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from mining.traces import TraceStore
+from mining.transitions import count_transitions, TransitionResult
+
+from . import reference
+
+
+def _result(cases, first_case=0):
+    return count_transitions(TraceStore.from_dataframe(reference.cases_frame(cases, first_case)))
+
+
+@pytest.fixture(scope='module')
+def cases():
+    return reference.random_cases(400, seed=1)
+
+
+@pytest.mark.parametrize('layered', [False, True])
+@pytest.mark.parametrize('by_length', [False, True])
+def test_view_matches_baseline(cases, layered, by_length):
+    counts, probs = _result(cases).view(layered=layered, by_length=by_length)
+    expected_counts, expected_probs = reference.transition_view(cases, layered=layered, by_length=by_length)
+
+    assert reference.plain(counts) == expected_counts
+    assert reference.flatten(probs) == pytest.approx(reference.flatten(expected_probs))
+
+
+def test_data_matches_baseline(cases):
+    assert _result(cases).data == reference.achieve_rawdata(cases)
+
+
+def test_merge_equals_single_pass(cases):
+    whole = _result(cases)
+    merged = _result(cases[:150]).merge(_result(cases[150:], first_case=150))
+
+    assert merged.activities.tolist() == whole.activities.tolist()
+    assert merged.variants == whole.variants
+    np.testing.assert_array_equal(merged.variant_counts, whole.variant_counts)
+    np.testing.assert_array_equal(merged.cells, whole.cells)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_array_equal(merged.distinct_counts, whole.distinct_counts)
+
+
+def test_update_refreshes_computed_views(cases):
+    result = _result(cases[:150])
+    for layered in (False, True):
+        for by_length in (False, True):
+            result.view(layered=layered, by_length=by_length)
+
+    result.update(_result(cases[150:], first_case=150))
+
+    for layered in (False, True):
+        for by_length in (False, True):
+            counts, probs = result.view(layered=layered, by_length=by_length)
+            expected_counts, expected_probs = reference.transition_view(cases, layered=layered, by_length=by_length)
+            assert reference.plain(counts) == expected_counts
+            assert reference.flatten(probs) == pytest.approx(reference.flatten(expected_probs))
+
+
+def test_save_load_roundtrip(cases, tmp_path):
+    result = _result(cases)
+    result.save(tmp_path / 'state.npz')
+    loaded = TransitionResult.load(tmp_path / 'state.npz')
+
+    assert loaded.activities.tolist() == result.activities.tolist()
+    assert loaded.variants == result.variants
+    np.testing.assert_array_equal(loaded.variant_counts, result.variant_counts)
+    np.testing.assert_array_equal(loaded.cells, result.cells)
+    np.testing.assert_array_equal(loaded.counts, result.counts)
+    np.testing.assert_array_equal(loaded.distinct_counts, result.distinct_counts)
+    assert reference.plain(loaded.view(layered=True, by_length=True)) == reference.plain(result.view(layered=True, by_length=True))
+
+
+def test_legacy_lookup_does_not_convert_event_log(cases, monkeypatch):
+    from mining.probability import BasedTraces
+
+    def fail(self):
+        raise AssertionError('pm4py EventLog 변환')
+
+    monkeypatch.setattr(BasedTraces, 'preprocessing', fail)
+    monkeypatch.setattr(BasedTraces, 'grouped_preprocessing', fail)
+    result = BasedTraces(reference.cases_frame(cases))()
+
+    expected_counts, _ = reference.transition_view(cases)
+    assert reference.plain(result['counts']) == expected_counts
+    assert reference.plain(result['length']['counts']) == reference.transition_view(cases, by_length=True)[0]
+    assert result['data'] == reference.achieve_rawdata(cases)
+    assert 'event_log' in result['length']
+
+    # EventLog는 조회할 때만 변환
+    with pytest.raises(AssertionError, match='pm4py'):
+        result['event_log']
+    with pytest.raises(AssertionError, match='pm4py'):
+        result['length']['event_log']
+
+
+def test_legacy_lookup_does_not_import_pm4py():
+    code = (
+        "import sys\n"
+        "from mining.probability import BasedTraces\n"
+        "from tests import reference\n"
+        "result = BasedTraces(reference.cases_frame(reference.random_cases(50)))()\n"
+        "result['counts'], result['probs'], result['length']['probs'], result['layer_length']['counts']\n"
+        "assert 'pm4py' not in sys.modules, 'pm4py imported'\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
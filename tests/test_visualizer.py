@@ -0,0 +1,50 @@
+"""sankey_visualizer 파일 출력 (html / json / png)"""
+import importlib.util
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('plotly')
+
+from mining import visualizer
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'Source': ['start', 'start', 'FF_1', 'SL_1'],
+        'Target': ['FF_1', 'SL_1', 'end', 'end'],
+        'Variable': [0.6, 0.4, 1.0, 1.0],
+    })
+
+
+def test_html_and_json(data, tmp_path):
+    paths = visualizer.sankey_visualizer(data, 2, output=[str(tmp_path / 'sankey.html'), str(tmp_path / 'sankey.json')])
+
+    assert [p.rsplit('.', 1)[1] for p in paths] == ['html', 'json']
+    assert (tmp_path / 'sankey.html').stat().st_size > 0
+    links = json.loads((tmp_path / 'sankey.json').read_text())['links']
+    assert [link['value'] for link in links] == pytest.approx([0.6, 0.4, 0.6, 0.4])
+
+
+def test_png_requires_kaleido(data, tmp_path, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *args: None if name == 'kaleido' else find_spec(name, *args))
+
+    with pytest.raises(ImportError, match='kaleido'):
+        visualizer.sankey_visualizer(data, 2, output=[str(tmp_path / 'sankey.html'), str(tmp_path / 'sankey.png')])
+    # 형식 하나라도 저장할 수 없으면 아무 파일도 쓰지 않음
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_png(data, tmp_path):
+    pytest.importorskip('kaleido')
+    path = tmp_path / 'sankey.png'
+    try:
+        visualizer.sankey_visualizer(data, 2, output=str(path))
+    except RuntimeError as error:
+        # kaleido 1.x는 Chrome이 필요 (plotly_get_chrome)
+        pytest.skip(f"kaleido를 실행할 수 없습니다 : {error}")
+
+    assert path.read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'